@@ -0,0 +1,101 @@
+"""
+Async data fetcher
+Page fetches on worker threads under process-wide per-host concurrency limits
+"""
+
+import asyncio
+import threading
+
+from cache import shared_resource
+
+
+def host_semaphore(host, limit):
+    """Process-wide semaphore capping concurrent upstream calls to one host"""
+    return shared_resource(f"host_semaphore_{host}", lambda: threading.BoundedSemaphore(limit))
+
+
+class AsyncDataFetcher:
+    """Async fetch layer over the analyzers with a synchronous facade for Streamlit"""
+
+    def __init__(self, config, stock_analyzer, crypto_analyzer):
+        """Initialize fetcher with configuration and analyzers"""
+        self.config = config
+        self.stock_analyzer = stock_analyzer
+        self.crypto_analyzer = crypto_analyzer
+        # Shared by every session, so the limits hold across the whole process
+        self.host_limits = {
+            'yahoo': host_semaphore('yahoo', config.fetch_settings['yahoo_concurrency']),
+            'coinmarketcap': host_semaphore(
+                'coinmarketcap', config.fetch_settings['coinmarketcap_concurrency']),
+        }
+
+    async def fetch_stock_page_async(self, symbol, period="1y"):
+        """Validate a stock symbol and load its history and info"""
+        # Validation and history coalesce into one download through get_history's cache;
+        # .info is a separate request that runs alongside it
+        is_valid, hist, info = await asyncio.gather(
+            self._run('yahoo', self.stock_analyzer.validate_stock_symbol, symbol),
+            self._run('yahoo', self.stock_analyzer.get_history, symbol, period),
+            self._run('yahoo', self.stock_analyzer.get_stock_info, symbol),
+            return_exceptions=True)
+
+        if is_valid is not True:
+            return False, None, None
+        if isinstance(hist, Exception):
+            hist = None
+        if isinstance(info, Exception):
+            info = None
+        return True, hist, info
+
+    async def fetch_crypto_page_async(self, symbol, days=365):
+        """Fetch a crypto quote, which also validates the symbol"""
+        # Sequential: one quotes/latest call, then history derived from the cached quote
+        if not self.crypto_analyzer.api_key:
+            return False, None, None
+        crypto_data = await self._run(
+            'coinmarketcap', self.crypto_analyzer.get_crypto_data, symbol)
+        if not crypto_data:
+            return False, None, None
+        hist_data = await asyncio.to_thread(
+            self.crypto_analyzer.get_crypto_historical_data, symbol, days)
+        return True, crypto_data, hist_data
+
+    def fetch_stock_page(self, symbol, period="1y"):
+        """Fetch (is_valid, hist_data, stock_info) for a stock page"""
+        return self.run(self.fetch_stock_page_async(symbol, period))
+
+    def fetch_crypto_page(self, symbol, days=365):
+        """Fetch (is_valid, crypto_data, hist_data) for a crypto page"""
+        return self.run(self.fetch_crypto_page_async(symbol, days))
+
+    def run(self, coroutine):
+        """Run a coroutine to completion from synchronous code"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+
+        # Already inside an event loop: run on a helper thread with its own loop
+        result = {}
+
+        def runner():
+            try:
+                result['value'] = asyncio.run(coroutine)
+            except Exception as e:
+                result['error'] = e
+
+        thread = threading.Thread(target=runner)
+        thread.start()
+        thread.join()
+        if 'error' in result:
+            raise result['error']
+        return result['value']
+
+    async def _run(self, host, func, *args):
+        """Run a blocking call on a worker thread under its host's limit"""
+        return await asyncio.to_thread(self._call_limited, host, func, *args)
+
+    def _call_limited(self, host, func, *args):
+        """Hold the host's process-wide slot for the duration of a call"""
+        with self.host_limits[host]:
+            return func(*args)
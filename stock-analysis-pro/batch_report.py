@@ -0,0 +1,143 @@
+"""
+Batch report runner
+Headless CLI that computes the dashboard metrics for many symbols across a process pool
+
+Usage:
+    python batch_report.py AAPL MSFT NVDA --output report.parquet
+    python batch_report.py --file symbols.txt --period 2y --output report.csv --workers 4
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import config
+import stock_analyzer
+from rate_limiter import SharedRateLimiter
+
+
+# One analyzer per worker process, created by the pool initializer
+_analyzer = None
+
+
+def _init_worker(rate_limiter):
+    """Create the worker's analyzer (its cache lives for the whole run)"""
+    global _analyzer
+    _analyzer = stock_analyzer.StockAnalyzer(config.Config())
+    _analyzer.rate_limiter = rate_limiter
+
+
+def build_rows(analyzer, symbols, period="1y"):
+    """Compute one report row per symbol, returning (rows, failed symbols)"""
+    # Warm the cache with one batched download (beta's benchmark included) and a threaded .info pass
+    benchmark = analyzer.config.portfolio_settings['benchmark']
+    analyzer.get_many(symbols + [benchmark], period, include_info=True)
+
+    rows = []
+    failed = []
+    for symbol in symbols:
+        try:
+            hist_data, stock_info = analyzer.get_stock_data(symbol, period)
+            if hist_data is None or hist_data.empty or not stock_info:
+                failed.append(symbol)
+                continue
+            row = {"Symbol": symbol,
+                   "Name": stock_info.get('longName', symbol),
+                   "Price": float(hist_data['Close'].iloc[-1])}
+            # 52W range and beta come from the full cached history, as on the dashboard
+            row.update(analyzer.get_financial_metrics(
+                stock_info, hist_data, analyzer.get_history_stats(symbol)))
+            # Drop the 🟢/🔴 markers so columns are the same for every symbol
+            row.update({name.split(" ", 1)[1]: value for name, value in
+                        analyzer.calculate_performance_metrics(hist_data).items()})
+            row.update(analyzer.get_company_info(stock_info))
+            rows.append(row)
+        except Exception as e:
+            print(f"Error processing {symbol}: {e}")
+            failed.append(symbol)
+    return rows, failed
+
+
+def _report_chunk(symbols, period):
+    """Worker entry point"""
+    return build_rows(_analyzer, symbols, period)
+
+
+def run_report(symbols, period="1y", workers=None, chunk_size=None):
+    """Build the report for many symbols, returning (report frame, failed symbols)"""
+    app_config = config.Config()
+    symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+    chunk_size = chunk_size or app_config.fetch_settings['batch_size']
+    workers = app_config.fetch_settings['report_workers'] if workers is None else workers
+    # One request schedule for every worker, so more workers never means more Yahoo traffic
+    rate_limiter = SharedRateLimiter(app_config.fetch_settings['yahoo_rate_per_minute'])
+
+    if workers <= 1:
+        analyzer = stock_analyzer.StockAnalyzer(app_config)
+        analyzer.rate_limiter = rate_limiter
+        rows, failed = build_rows(analyzer, symbols, period)
+    else:
+        # Small chunks keep every worker busy; each still batches its own download
+        chunk_size = min(chunk_size, max(1, -(-len(symbols) // workers)))
+        chunks = [symbols[i:i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+        rows, failed = [], []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(rate_limiter,)) as pool:
+            for chunk_rows, chunk_failed in pool.map(_report_chunk, chunks, [period] * len(chunks)):
+                rows.extend(chunk_rows)
+                failed.extend(chunk_failed)
+
+    return pd.DataFrame(rows), failed
+
+
+def write_report(report, output):
+    """Write the report as Parquet or CSV depending on the file extension"""
+    if output.lower().endswith(".parquet"):
+        report.to_parquet(output, index=False)
+    else:
+        report.to_csv(output, index=False)
+
+
+def read_symbols(args):
+    """Collect symbols from the command line and an optional file"""
+    symbols = list(args.symbols)
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            symbols.extend(token for line in f for token in line.replace(",", " ").split())
+    return symbols
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Stock Analysis Pro batch report")
+    parser.add_argument("symbols", nargs="*", help="ticker symbols")
+    parser.add_argument("--file", help="file with symbols (whitespace or comma separated)")
+    parser.add_argument("--period", default="1y", help="history period (default: 1y)")
+    parser.add_argument("--output", default="report.parquet", help=".parquet or .csv path")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: REPORT_WORKERS, 1 runs in-process)")
+    args = parser.parse_args(argv)
+
+    symbols = read_symbols(args)
+    if not symbols:
+        parser.error("no symbols given")
+
+    started = time.perf_counter()
+    report, failed = run_report(symbols, args.period, args.workers)
+    elapsed = time.perf_counter() - started
+
+    write_report(report, args.output)
+    print(f"Wrote {len(report)} rows to {args.output}")
+    if failed:
+        print(f"No data for {len(failed)} symbols: {', '.join(failed)}")
+    processed = len(report) + len(failed)
+    print(f"Processed {processed} symbols in {elapsed:.1f}s "
+          f"({processed / elapsed:.1f} symbols/sec)")
+    return 0 if not report.empty else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
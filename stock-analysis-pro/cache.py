@@ -0,0 +1,221 @@
+"""
+Data cache
+Size-bounded LRU cache with expiry and memory accounting for analyzer data
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+
+_shared_lock = threading.RLock()
+_shared_resources = {}
+
+
+def shared_resource(name, factory):
+    """Get a process-wide singleton, creating it with factory() on first use"""
+    with _shared_lock:
+        if name not in _shared_resources:
+            _shared_resources[name] = factory()
+        return _shared_resources[name]
+
+
+def estimate_size(value):
+    """Estimate the memory footprint of a cached value in bytes"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            sys.getsizeof(key) + estimate_size(item) for key, item in value.items())
+    return sys.getsizeof(value)
+
+
+class DataCache:
+    """LRU cache bounded by total memory size with per-entry expiry"""
+
+    def __init__(self, max_size_mb=100, expiry_minutes=5, purge_interval_seconds=60):
+        """Initialize cache with a memory budget and default expiry"""
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.expiry = timedelta(minutes=expiry_minutes)
+        self.purge_interval = timedelta(seconds=purge_interval_seconds)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced_fetches = 0
+        self.coalesced_waits = 0
+        # key -> (value, size_bytes, expires_at), least recently used first
+        self._entries = OrderedDict()
+        self._last_purge = datetime.now()
+        self._lock = threading.RLock()
+        self._in_flight = {}
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a cache from the application cache settings"""
+        return cls(max_size_mb=config.cache_settings['max_size_mb'],
+                   expiry_minutes=config.cache_settings['expiry_minutes'])
+
+    @classmethod
+    def shared(cls, config):
+        """Get the process-wide cache shared by every session and analyzer"""
+        return shared_resource("data_cache", lambda: cls.from_config(config))
+
+    def get(self, key, default=None):
+        """Return a cached value and mark it as recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, _, expires_at = entry
+            if datetime.now() >= expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, expiry_minutes=None):
+        """Store a value, evicting least recently used entries over budget"""
+        with self._lock:
+            self._maybe_purge()
+
+            size = estimate_size(value)
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                # Storing it would flush the whole cache for a single entry
+                return False
+
+            expiry = self.expiry if expiry_minutes is None else timedelta(
+                minutes=expiry_minutes)
+            self._entries[key] = (value, size, datetime.now() + expiry)
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+            return True
+
+    def get_or_fetch(self, key, fetch, expiry_minutes=None):
+        """Return a cached value, or fetch it once even if many threads miss together"""
+        value = self.get(key)
+        if value is not None:
+            return value
+        return self.coalesce(key, fetch, expiry_minutes)
+
+    def coalesce(self, key, fetch, expiry_minutes=None, flight_key=None):
+        """Run fetch() for a key, letting concurrent callers wait on the in-flight call"""
+        flight_key = key if flight_key is None else flight_key
+        with self._lock:
+            if flight_key == key:
+                value = self._peek(key)
+                if value is not None:
+                    return value
+            future = self._in_flight.get(flight_key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[flight_key] = future
+                self.coalesced_fetches += 1
+            else:
+                self.coalesced_waits += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = fetch()
+            if value is not None:
+                self.set(key, value, expiry_minutes)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(flight_key, None)
+
+    def purge_expired(self):
+        """Remove all expired entries and return how many were dropped"""
+        with self._lock:
+            now = datetime.now()
+            expired = [key for key, (_, _, expires_at) in self._entries.items()
+                       if now >= expires_at]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+            self._last_purge = now
+            return len(expired)
+
+    def invalidate(self, key):
+        """Drop a single entry if present"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                return True
+            return False
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def get_stats(self):
+        """Get cache counters and memory usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_mb": self.current_bytes / (1024 * 1024),
+                "max_size_mb": self.max_bytes / (1024 * 1024),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "coalesced_fetches": self.coalesced_fetches,
+                "coalesced_waits": self.coalesced_waits,
+            }
+
+    def __contains__(self, key):
+        """Check for a live entry without touching LRU order or counters"""
+        entry = self._entries.get(key)
+        return entry is not None and datetime.now() < entry[2]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _peek(self, key):
+        """Return a live value without touching LRU order or counters"""
+        entry = self._entries.get(key)
+        if entry is None or datetime.now() >= entry[2]:
+            return None
+        return entry[0]
+
+    def _remove(self, key):
+        """Remove an entry and release its accounted size"""
+        _, size, _ = self._entries.pop(key)
+        self.current_bytes -= size
+
+    def _maybe_purge(self):
+        """Purge expired entries at most once per purge interval"""
+        if datetime.now() - self._last_purge >= self.purge_interval:
+            self.purge_expired()
@@ -0,0 +1,88 @@
+"""
+Chart builders
+Plotly candlestick and volume builders shared by the stock and crypto analyzers
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+
+GRID_COLOR = 'rgba(128,128,128,0.2)'
+
+
+def volume_colors(data, positive, negative):
+    """Color each volume bar by whether the bar closed up or down"""
+    return np.where(data['Close'].to_numpy() >= data['Open'].to_numpy(), positive, negative)
+
+
+def candlestick_trace(data, symbol, colors):
+    """Build the candlestick trace"""
+    return go.Candlestick(
+        x=data.index,
+        open=data['Open'],
+        high=data['High'],
+        low=data['Low'],
+        close=data['Close'],
+        name=symbol,
+        increasing_line_color=colors['positive'],
+        decreasing_line_color=colors['negative'],
+        increasing_fillcolor="rgba(16, 185, 129, 0.3)",
+        decreasing_fillcolor="rgba(239, 68, 68, 0.3)",
+        increasing_line_width=1,
+        decreasing_line_width=1,
+    )
+
+
+def volume_trace(data, colors):
+    """Build the volume bar trace"""
+    return go.Bar(
+        x=data.index,
+        y=data['Volume'],
+        marker_color=volume_colors(data, colors['positive'], colors['negative']),
+        marker_line_width=0,
+        name='Volume',
+        opacity=0.7,
+    )
+
+
+def overlay_traces(indicators, overlays):
+    """Build line traces for indicator overlays on the price axis"""
+    if indicators is None:
+        return []
+    return [go.Scatter(
+        x=indicators.index,
+        y=indicators[name],
+        name=name.replace("_", " "),
+        mode='lines',
+        line=dict(width=1, dash='dot' if name.startswith('BB_') else 'solid'),
+    ) for name in overlays if name in indicators.columns]
+
+
+def create_price_volume_chart(data, symbol, title, colors, template='plotly_white',
+                              indicators=None, overlays=()):
+    """Create one figure with price and volume panels on a shared x-axis"""
+    if data is None or data.empty:
+        return None
+
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True,
+                        vertical_spacing=0.03, row_heights=[0.75, 0.25])
+    fig.add_trace(candlestick_trace(data, symbol, colors), row=1, col=1)
+    lines = overlay_traces(indicators, overlays)
+    for trace in lines:
+        fig.add_trace(trace, row=1, col=1)
+    fig.add_trace(volume_trace(data, colors), row=2, col=1)
+
+    fig.update_layout(
+        title=title,
+        template=template,
+        height=650,
+        showlegend=bool(lines),
+        margin=dict(l=50, r=50, t=50, b=50),
+    )
+    fig.update_xaxes(rangeslider_visible=False, showgrid=True, gridwidth=1, gridcolor=GRID_COLOR)
+    fig.update_xaxes(title_text='Date', row=2, col=1)
+    fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor=GRID_COLOR)
+    fig.update_yaxes(title_text='Price (USD)', row=1, col=1)
+    fig.update_yaxes(title_text='Volume', row=2, col=1)
+    return fig
@@ -0,0 +1,68 @@
+"""
+Compact histories
+Columnar float32/uint32 representation of OHLCV histories for the in-memory cache
+"""
+
+import numpy as np
+import pandas as pd
+
+from history_store import period_start
+
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+
+
+class CompactHistory:
+    """OHLCV history stored as float32 prices, uint32 volume and an int64 epoch index"""
+
+    def __init__(self, index, columns, tz=None, attrs=None):
+        """Initialize from an int64 ns index and a dict of column arrays"""
+        self.index = index
+        self.columns = columns
+        self.tz = tz
+        self.attrs = attrs or {}
+
+    @classmethod
+    def from_frame(cls, data):
+        """Pack a yfinance history frame, dropping columns the app doesn't use"""
+        columns = {}
+        for name in PRICE_COLUMNS:
+            if name in data.columns:
+                columns[name] = data[name].to_numpy(dtype="float32", na_value=np.nan)
+        if "Volume" in data.columns:
+            volume = data["Volume"].to_numpy(dtype="float64", na_value=0.0)
+            # Split-adjusted volumes of a few large caps overflow uint32
+            fits = volume.max(initial=0) <= np.iinfo(np.uint32).max
+            columns["Volume"] = volume.astype("uint32" if fits else "uint64")
+        return cls(data.index.as_unit("ns").asi8.copy(), columns,
+                   tz=data.index.tz, attrs=dict(data.attrs))
+
+    def __len__(self):
+        return len(self.index)
+
+    def __sizeof__(self):
+        return self.index.nbytes + sum(values.nbytes for values in self.columns.values())
+
+    @property
+    def empty(self):
+        return len(self.index) == 0
+
+    def to_frame(self, start=None):
+        """Convert back to a pandas frame, only materializing rows from start onward"""
+        position = 0
+        if start is not None:
+            position = int(np.searchsorted(self.index, pd.Timestamp(start).as_unit("ns").value))
+
+        index = pd.DatetimeIndex(self.index[position:].view("datetime64[ns]"))
+        if self.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self.tz)
+        frame = pd.DataFrame({
+            name: values[position:].astype("int64" if name == "Volume" else "float64")
+            for name, values in self.columns.items()
+        }, index=index)
+        frame.attrs.update(self.attrs)
+        return frame
+
+    def slice_period(self, period):
+        """Convert only the rows inside a period to a pandas frame"""
+        return self.to_frame(period_start(period, tz=self.tz))
@@ -16,6 +16,12 @@ class Config:
         self.app_settings = {}
         self.chart_settings = {}
         self.cache_settings = {}
+        self.storage_settings = {}
+        self.symbol_settings = {}
+        self.fetch_settings = {}
+        self.profiling_settings = {}
+        self.portfolio_settings = {}
+        self.watchlist_settings = {}
 
         # Auto-load environment on initialization
         self.load_environment()
@@ -35,6 +41,8 @@ class Config:
                 'title': os.getenv("APP_TITLE", "Stock Analysis Pro"),
                 'author': os.getenv("APP_AUTHOR", "Jesus Torres"),
                 'default_refresh_interval': int(os.getenv("DEFAULT_REFRESH_INTERVAL", 10)),
+                # Every crypto refresh costs a CoinMarketCap credit, so it runs far less often
+                'crypto_refresh_interval': max(int(os.getenv("CRYPTO_REFRESH_INTERVAL", 300)), 60),
                 'default_stock_symbol': os.getenv("DEFAULT_STOCK_SYMBOL", "TSLA"),
             }
 
@@ -42,6 +50,17 @@ class Config:
             self.chart_settings = {
                 'theme': os.getenv("DEFAULT_CHART_THEME", "plotly_white"),
                 'default_period': os.getenv("DEFAULT_TIME_PERIOD", "1y"),
+                'history_period': os.getenv("HISTORY_BASE_PERIOD", "max"),
+                'target_width_px': int(os.getenv("CHART_TARGET_WIDTH_PX", 1200)),
+                'min_px_per_bar': int(os.getenv("CHART_MIN_PX_PER_BAR", 3)),
+                'figure_cache_entries': int(os.getenv("FIGURE_CACHE_ENTRIES", 200)),
+                # Bar interval used for intraday periods (1m, 5m or 15m)
+                'intraday_intervals': {
+                    "1d": os.getenv("INTRADAY_INTERVAL_1D", "5m"),
+                    "5d": os.getenv("INTRADAY_INTERVAL_5D", "15m"),
+                },
+                'overlays': [name.strip() for name in os.getenv(
+                    "CHART_OVERLAYS", "SMA_20,SMA_50").split(",") if name.strip()],
                 'colors': {
                     'positive': '#10b981',
                     'negative': '#ef4444',
@@ -58,7 +77,64 @@ class Config:
             # Cache Settings
             self.cache_settings = {
                 'expiry_minutes': int(os.getenv("CACHE_EXPIRY_MINUTES", 5)),
-                'max_size_mb': int(os.getenv("MAX_CACHE_SIZE_MB", 100))
+                'max_size_mb': int(os.getenv("MAX_CACHE_SIZE_MB", 100)),
+                # Memory budget for cached indicator series (least recently used dropped)
+                'indicator_max_size_mb': int(os.getenv("INDICATOR_CACHE_SIZE_MB", 50)),
+                # Store cached histories as float32/uint32 columns (opt-in, lossy below ~7 digits)
+                'compact_histories': os.getenv("CACHE_COMPACT_HISTORIES", "false").lower() == "true",
+            }
+
+            # Storage Settings
+            self.storage_settings = {
+                'persist_history': os.getenv("PERSIST_HISTORY", "true").lower() == "true",
+                # Relative paths are resolved next to this file, not the launch directory
+                'history_dir': os.path.join(
+                    os.path.dirname(os.path.abspath(__file__)),
+                    os.getenv("HISTORY_STORE_DIR", os.path.join("data", "history"))),
+            }
+
+            # Symbol Validation Settings
+            self.symbol_settings = {
+                'valid_ttl_minutes': int(os.getenv("SYMBOL_VALID_TTL_MINUTES", 1440)),
+                'invalid_ttl_minutes': int(os.getenv("SYMBOL_INVALID_TTL_MINUTES", 60)),
+                'ticker_list_path': os.getenv("TICKER_LIST_PATH"),
+                'offline_only': os.getenv("OFFLINE_SYMBOL_VALIDATION", "false").lower() == "true",
+            }
+
+            # Fetch Settings
+            self.fetch_settings = {
+                'max_workers': int(os.getenv("FETCH_MAX_WORKERS", 8)),
+                'batch_size': int(os.getenv("FETCH_BATCH_SIZE", 100)),
+                'yahoo_concurrency': int(os.getenv("YAHOO_CONCURRENCY", 4)),
+                # Batch report: worker processes and Yahoo requests per minute shared by all of them
+                'report_workers': int(os.getenv("REPORT_WORKERS", 2)),
+                'yahoo_rate_per_minute': int(os.getenv("YAHOO_RATE_PER_MINUTE", 60)),
+                'coinmarketcap_concurrency': int(os.getenv("COINMARKETCAP_CONCURRENCY", 2)),
+                # CoinMarketCap Basic plan allows 30 calls per minute
+                'coinmarketcap_rate_per_minute': int(os.getenv("COINMARKETCAP_RATE_PER_MINUTE", 30)),
+                'coinmarketcap_burst': int(os.getenv("COINMARKETCAP_BURST", 5)),
+                # Symbols per quotes/latest call (one credit covers up to 100)
+                'coinmarketcap_batch_size': int(os.getenv("COINMARKETCAP_BATCH_SIZE", 100)),
+                'max_backoff_seconds': int(os.getenv("REFRESH_MAX_BACKOFF_SECONDS", 300)),
+                'intraday_capacity': int(os.getenv("INTRADAY_BUFFER_BARS", 5000)),
+                'intraday_expiry_minutes': int(os.getenv("INTRADAY_EXPIRY_MINUTES", 24 * 60)),
+            }
+
+            # Profiling Settings ("off", "summary" or "spans")
+            self.profiling_settings = {
+                'level': os.getenv("PROFILING_LEVEL", "summary").lower(),
+            }
+
+            # Portfolio Settings
+            self.portfolio_settings = {
+                'benchmark': os.getenv("PORTFOLIO_BENCHMARK", "SPY").upper(),
+                'sharpe_window': int(os.getenv("PORTFOLIO_SHARPE_WINDOW", 63)),
+                'risk_free_rate': float(os.getenv("PORTFOLIO_RISK_FREE_RATE", 0.0)),
+            }
+
+            # Crypto Watchlist Settings
+            self.watchlist_settings = {
+                'symbols': os.getenv("CRYPTO_WATCHLIST", "BTC,ETH,SOL,XRP,ADA,DOGE").upper(),
             }
 
             return True, "Environment loaded successfully"
@@ -5,20 +5,38 @@ Handles cryptocurrency analysis logic and data processing using CoinMarketCap AP
 
 import requests
 import pandas as pd
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+
+import charts
+from downsampling import downsample_chart_data, max_bars_for_width
+from profiling import Profiler, timed
+from cache import DataCache, shared_resource
+from figure_cache import FigureCache, data_fingerprint
+from quote_snapshot import QuoteSnapshot, flatten_quotes
+from rate_limiter import TokenBucket
+from synthetic_history import generate_ohlcv
 
 
 class CryptoAnalyzer:
     """Crypto analyzer for data processing and analysis logic"""
 
-    def __init__(self, config):
+    def __init__(self, config, profiler=None, cache=None):
         """Initialize analyzer with configuration"""
         self.config = config
-        self.cache = {}
-        self.cache_expiry = {}
+        self.profiler = profiler or Profiler(level="off")
+        # Process-wide by default, shared with StockAnalyzer and other sessions
+        self.cache = cache if cache is not None else DataCache.shared(config)
+        self.figure_cache = FigureCache.shared(config)
         self.api_key = config.api_keys.get('coinmarketcap')
         self.base_url = "https://pro-api.coinmarketcap.com/v1"
+        # One keep-alive session and one credit budget for the whole process
+        self.session = shared_resource("coinmarketcap_session", self._create_session)
+        self.rate_limiter = shared_resource("coinmarketcap_limiter", lambda: TokenBucket(
+            config.fetch_settings['coinmarketcap_rate_per_minute'],
+            config.fetch_settings['coinmarketcap_burst']))
+        # Latest quote of every coin seen, as one typed row per coin
+        self.snapshot = shared_resource("crypto_quote_snapshot", QuoteSnapshot)
 
     def validate_crypto_symbol(self, symbol):
         """Validate if a crypto symbol exists"""
@@ -26,19 +44,8 @@ class CryptoAnalyzer:
             if not symbol or len(symbol.strip()) == 0:
                 return False
 
-            if not self.api_key:
-                return False
-
-            url = f"{self.base_url}/cryptocurrency/quotes/latest"
-            headers = {"X-CMC_PRO_API_KEY": self.api_key}
-            params = {"symbol": symbol.upper()}
-
-            response = requests.get(
-                url, headers=headers, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                return symbol.upper() in data.get("data", {})
-            return False
+            # Same cached quote get_crypto_data returns, so a search costs one API call
+            return self.get_crypto_data(symbol.strip()) is not None
         except Exception:
             return False
 
@@ -46,104 +53,135 @@ class CryptoAnalyzer:
         """Fetch crypto data with caching"""
         try:
             cache_key = f"crypto_{symbol.upper()}"
-            if self._is_cache_valid(cache_key):
-                return self.cache[cache_key]
+            crypto_data = self._cache_get(cache_key)
+            if crypto_data is not None:
+                return crypto_data
 
-            if not self.api_key:
+            if not self.api_key or self._is_missing(symbol):
                 return None
 
-            url = f"{self.base_url}/cryptocurrency/quotes/latest"
-            headers = {"X-CMC_PRO_API_KEY": self.api_key}
-            params = {"symbol": symbol.upper()}
-
-            response = requests.get(
-                url, headers=headers, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                crypto_data = data["data"][symbol.upper()]
-
-                self._cache_data(cache_key, crypto_data)
-                print(
-                    f"Fetched crypto data for {symbol.upper()}: {crypto_data}")
-                return crypto_data
-            return None
+            # Concurrent misses for the same coin wait on a single request
+            return self.cache.coalesce(cache_key, lambda: self._fetch_quote(symbol))
         except Exception:
             return None
 
+    def get_many_quotes(self, symbols):
+        """Get quotes for many symbols, fetching cache misses in batched requests"""
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+        quotes = {}
+        missing = []
+        for symbol in symbols:
+            crypto_data = self._cache_get(f"crypto_{symbol}")
+            if crypto_data is not None:
+                quotes[symbol] = crypto_data
+            elif not self._is_missing(symbol):
+                missing.append(symbol)
+
+        if missing and self.api_key:
+            quotes.update(self._fetch_quotes(missing))
+        return quotes
+
+    def refresh_quotes(self, symbols):
+        """Fetch the latest quotes for many symbols in batched requests and update the cache"""
+        if not self.api_key or not symbols:
+            return []
+        return list(self._fetch_quotes([s.upper() for s in symbols], raise_errors=True))
+
+    def _fetch_quotes(self, symbols, raise_errors=False):
+        """Fetch quotes in requests of up to batch_size symbols and split them into the cache"""
+        quotes = {}
+        batch_size = self.config.fetch_settings['coinmarketcap_batch_size']
+        for i in range(0, len(symbols), batch_size):
+            batch = symbols[i:i + batch_size]
+            params = {"symbol": ",".join(batch), "skip_invalid": "true"}
+            try:
+                response = self._get("cryptocurrency/quotes/latest", params)
+                response.raise_for_status()
+                data = response.json().get("data", {})
+            except Exception as e:
+                if raise_errors:
+                    raise
+                print(f"Error fetching quotes starting with {batch[0]}: {e}")
+                continue
+            for symbol, crypto_data in data.items():
+                self.cache.set(f"crypto_{symbol.upper()}", crypto_data)
+                quotes[symbol.upper()] = crypto_data
+            self.snapshot.update(data)
+            # skip_invalid drops unknown coins; remember them so reruns don't pay again
+            returned = {symbol.upper() for symbol in data}
+            for symbol in batch:
+                if symbol.upper() not in returned:
+                    self._mark_missing(symbol)
+        return quotes
+
+    def _fetch_quote(self, symbol):
+        """Fetch the latest quote for a symbol from CoinMarketCap"""
+        response = self._get("cryptocurrency/quotes/latest", {"symbol": symbol.upper()})
+        if response.status_code == 200:
+            data = response.json()
+            crypto_data = data.get("data", {}).get(symbol.upper())
+            if crypto_data:
+                self.snapshot.update({symbol.upper(): crypto_data})
+            else:
+                self._mark_missing(symbol)
+            return crypto_data
+        if response.status_code == 400:
+            # CoinMarketCap answers 400 for a symbol it doesn't list
+            self._mark_missing(symbol)
+        return None
+
+    def _is_missing(self, symbol):
+        """Check whether CoinMarketCap recently returned nothing for a symbol"""
+        return self._cache_get(f"crypto_{symbol.upper()}_missing") is not None
+
+    def _mark_missing(self, symbol):
+        """Remember a symbol CoinMarketCap didn't return for the invalid-symbol TTL"""
+        self.cache.set(f"crypto_{symbol.upper()}_missing", True,
+                       expiry_minutes=self.config.symbol_settings['invalid_ttl_minutes'])
+
+    def get_watchlist(self, symbols, sort_by="market_cap", ascending=False, **filters):
+        """Watchlist table for many coins, sorted and filtered over the quote snapshot"""
+        quotes = self.get_many_quotes(symbols)
+        # Cached quotes from before this process's snapshot existed are added in one pass
+        missing = {symbol: quote for symbol, quote in quotes.items()
+                   if self.snapshot.row(symbol) is None}
+        if missing:
+            self.snapshot.update(missing)
+        return self.snapshot.sort(by=sort_by, ascending=ascending,
+                                  symbols=list(quotes), **filters)
+
+    def _get(self, endpoint, params):
+        """GET a CoinMarketCap endpoint on the pooled session, paced by the rate limiter"""
+        self.rate_limiter.acquire()
+        with self.profiler.span("fetch"):
+            return self.session.get(f"{self.base_url}/{endpoint}", params=params, timeout=10)
+
+    def _create_session(self):
+        """Create a keep-alive session with the API key header set once"""
+        session = requests.Session()
+        session.headers.update({"X-CMC_PRO_API_KEY": self.api_key or "",
+                                "Accept": "application/json"})
+        pool_size = self.config.fetch_settings['coinmarketcap_concurrency']
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        return session
+
     def get_crypto_historical_data(self, symbol, days=365):
         """Get historical crypto data (Note: CoinMarketCap free tier has limited historical data)"""
-        # For now, return mock historical data since CoinMarketCap historical requires paid tier
+        # For now, return synthetic historical data since CoinMarketCap historical requires paid tier
         # In a real implementation, you might use other APIs like CoinGecko for free historical data
         try:
+            cache_key = f"crypto_{symbol.upper()}_history_{days}"
+            hist_data = self._cache_get(cache_key)
+            if hist_data is not None:
+                return hist_data
+
             current_data = self.get_crypto_data(symbol)
             if not current_data:
                 return None
 
             current_price = current_data["quote"]["USD"]["price"]
-
-            # Generate more realistic historical data for demonstration
-            dates = pd.date_range(end=datetime.now(), periods=days, freq='D')
-
-            # Create realistic price movements
-            base_prices = []
-            current_price_working = current_price
-
-            # Work backwards from current price to create realistic historical trend
-            for i in range(days):
-                # Create daily volatility (crypto is more volatile than stocks)
-                daily_change = (hash(f"{symbol}_{i}_daily") %
-                                200 - 100) / 100  # -100% to +100%
-                daily_volatility = daily_change * 0.05  # Scale to 5% max daily change
-
-                # Add weekly trend
-                weekly_trend = (hash(f"{symbol}_{i//7}_weekly") %
-                                100 - 50) / 1000  # Weekly trend
-
-                # Calculate price for this day
-                price_change = daily_volatility + weekly_trend
-                current_price_working *= (1 + price_change)
-                current_price_working = max(
-                    current_price_working, 0.001)  # Ensure positive
-
-                base_prices.append(current_price_working)
-
-            # Reverse to get chronological order
-            base_prices.reverse()
-
-            # Generate OHLC data from base prices
-            ohlc_data = []
-            for i, base_price in enumerate(base_prices):
-                # Generate realistic OHLC from base price
-                # 0-10% intraday range
-                daily_volatility = (
-                    hash(f"{symbol}_{i}_intraday") % 100) / 1000
-
-                # Create open, high, low, close
-                open_price = base_price * \
-                    (1 + (hash(f"{symbol}_{i}_open") % 40 - 20) / 1000)
-                close_price = base_price * \
-                    (1 + (hash(f"{symbol}_{i}_close") % 40 - 20) / 1000)
-
-                high_price = max(open_price, close_price) * \
-                    (1 + daily_volatility)
-                low_price = min(open_price, close_price) * \
-                    (1 - daily_volatility)
-
-                # Ensure logical OHLC relationship
-                high_price = max(high_price, open_price, close_price)
-                low_price = min(low_price, open_price, close_price)
-
-                ohlc_data.append({
-                    'Open': max(open_price, 0.001),
-                    'High': max(high_price, 0.001),
-                    'Low': max(low_price, 0.001),
-                    'Close': max(close_price, 0.001),
-                    # 1M-11M volume
-                    'Volume': 1000000 + (hash(f"{symbol}_{i}_vol") % 10000000)
-                })
-
-            data = pd.DataFrame(ohlc_data, index=dates)
-            return data
+            return self.cache.coalesce(
+                cache_key, lambda: generate_ohlcv(symbol, current_price, days))
 
         except Exception as e:
             print(f"Error generating crypto historical data: {e}")
@@ -157,103 +195,30 @@ class CryptoAnalyzer:
         pct_change = (change / previous_price) * 100
         return change, pct_change
 
-    def create_crypto_price_chart(self, data, symbol):
-        """Create interactive crypto price chart"""
-        if data is None or data.empty:
-            return None
+    def prepare_chart_data(self, hist_data, indicators=None):
+        """Downsample history to the chart's pixel budget, returning (data, indicators, bar label)"""
+        max_bars = max_bars_for_width(self.config.chart_settings['target_width_px'],
+                                      self.config.chart_settings['min_px_per_bar'])
+        return downsample_chart_data(hist_data, max_bars, indicators)
 
-        fig = go.Figure()
-
-        # Create candlestick chart with proper colors
-        fig.add_trace(go.Candlestick(
-            x=data.index,
-            open=data['Open'],
-            high=data['High'],
-            low=data['Low'],
-            close=data['Close'],
-            name=symbol,
-            increasing_line_color=self.config.chart_settings['colors']['positive'],
-            decreasing_line_color=self.config.chart_settings['colors']['negative'],
-            increasing_fillcolor="rgba(16, 185, 129, 0.3)",
-            decreasing_fillcolor="rgba(239, 68, 68, 0.3)",
-            line=dict(width=1),
-            increasing_line_width=1,
-            decreasing_line_width=1
-        ))
-
-        fig.update_layout(
-            title=f'{symbol} Crypto Price',
-            yaxis_title='Price (USD)',
-            xaxis_title='Date',
-            template='plotly_white',
-            height=500,
-            showlegend=False,
-            margin=dict(l=50, r=50, t=50, b=50),
-        )
-
-        # Remove range slider and configure x-axis
-        fig.update_xaxes(
-            rangeslider_visible=False,
-            showgrid=True,
-            gridwidth=1,
-            gridcolor='rgba(128,128,128,0.2)'
-        )
-
-        # Configure y-axis
-        fig.update_yaxes(
-            showgrid=True,
-            gridwidth=1,
-            gridcolor='rgba(128,128,128,0.2)'
-        )
-
-        return fig
-
-    def create_crypto_volume_chart(self, data, symbol):
-        """Create crypto volume chart"""
-        if data is None or data.empty:
-            return None
+    def get_chart_figures(self, symbol, hist_data):
+        """Get (price/volume chart, bar label), reusing the figure while the data is unchanged"""
+        settings = self.config.chart_settings
+        key = ("crypto", symbol, len(hist_data), data_fingerprint(hist_data), settings['theme'],
+               settings['target_width_px'], settings['min_px_per_bar'])
 
-        fig = go.Figure()
-
-        # Create volume bars with colors based on price movement
-        colors = [self.config.chart_settings['colors']['positive'] if close >= open_price
-                  else self.config.chart_settings['colors']['negative']
-                  for close, open_price in zip(data['Close'], data['Open'])]
-
-        fig.add_trace(go.Bar(
-            x=data.index,
-            y=data['Volume'],
-            marker_color=colors,
-            name='Volume',
-            opacity=0.7,
-            marker_line_width=0
-        ))
-
-        fig.update_layout(
-            title=f'{symbol} Trading Volume',
-            yaxis_title='Volume',
-            xaxis_title='Date',
-            template='plotly_white',
-            height=200,
-            showlegend=False,
-            margin=dict(l=50, r=50, t=30, b=30),
-
-        )
-
-        # Configure axes
-        fig.update_xaxes(
-            showgrid=True,
-            gridwidth=1,
-            gridcolor='rgba(128,128,128,0.2)'
-        )
-
-        fig.update_yaxes(
-            showgrid=True,
-            gridwidth=1,
-            gridcolor='rgba(128,128,128,0.2)'
-        )
-
-        return fig
+        def build():
+            chart_data, _, bar_label = self.prepare_chart_data(hist_data)
+            return self.create_crypto_chart(chart_data, symbol), bar_label
+
+        return self.figure_cache.get_or_build(key, build)
+
+    @timed("figure_build")
+    def create_crypto_chart(self, data, symbol):
+        """Create a single crypto price and volume chart on a shared x-axis"""
+        return charts.create_price_volume_chart(
+            data, symbol, f'{symbol} Crypto Price', self.config.chart_settings['colors'],
+            self.config.chart_settings['theme'])
 
     def format_large_number(self, num):
         """Format large numbers for crypto (similar to stock analyzer)"""
@@ -271,18 +236,18 @@ class CryptoAnalyzer:
     def get_crypto_metrics(self, crypto_data):
         """Get formatted crypto metrics"""
         try:
-            quote_data = crypto_data["quote"]["USD"]
+            row = self._quote_row(crypto_data).fillna(0)
 
             return {
-                "Market Cap": self.format_large_number(quote_data.get("market_cap", 0)),
-                "Market Dominance": f"{quote_data.get('market_cap_dominance', 0):.2f}%",
-                "Volume (24h)": self.format_large_number(quote_data.get("volume_24h", 0)),
-                "Volume Change (24h)": f"{quote_data.get('volume_change_24h', 0):.2f}%",
-                "Price Change (1h)": f"{quote_data.get('percent_change_1h', 0):.2f}%",
-                "Price Change (24h)": f"{quote_data.get('percent_change_24h', 0):.2f}%",
-                "Price Change (7d)": f"{quote_data.get('percent_change_7d', 0):.2f}%",
-                "Price Change (30d)": f"{quote_data.get('percent_change_30d', 0):.2f}%",
-                "Circulating Supply": f"{crypto_data.get('circulating_supply', 0):,.0f}",
+                "Market Cap": self.format_large_number(row["market_cap"]),
+                "Market Dominance": f"{row['market_cap_dominance']:.2f}%",
+                "Volume (24h)": self.format_large_number(row["volume_24h"]),
+                "Volume Change (24h)": f"{row['volume_change_24h']:.2f}%",
+                "Price Change (1h)": f"{row['percent_change_1h']:.2f}%",
+                "Price Change (24h)": f"{row['percent_change_24h']:.2f}%",
+                "Price Change (7d)": f"{row['percent_change_7d']:.2f}%",
+                "Price Change (30d)": f"{row['percent_change_30d']:.2f}%",
+                "Circulating Supply": f"{row['circulating_supply']:,.0f}",
             }
         except Exception:
             return {"Error": "Unable to fetch crypto metrics"}
@@ -290,14 +255,18 @@ class CryptoAnalyzer:
     def get_crypto_info(self, crypto_data):
         """Get formatted crypto information"""
         try:
+            row = self._quote_row(crypto_data)
+            rank = row["cmc_rank"]
+            max_supply, total_supply = row["max_supply"], row["total_supply"]
+            date_added = row["date_added"]
             return {
-                "Name": crypto_data.get("name", "N/A"),
-                "Symbol": crypto_data.get("symbol", "N/A"),
-                "Rank": crypto_data.get("cmc_rank", "N/A"),
-                "Max Supply": f"{crypto_data.get('max_supply', 0):,.0f}" if crypto_data.get('max_supply') else "N/A",
-                "Total Supply": f"{crypto_data.get('total_supply', 0):,.0f}" if crypto_data.get('total_supply') else "N/A",
-                "Date Added": crypto_data.get("date_added", "N/A")[:10] if crypto_data.get("date_added") else "N/A",
-                "Tags": ", ".join(crypto_data.get("tags", [])[:3]) if crypto_data.get("tags") else "N/A"
+                "Name": row["name"] or "N/A",
+                "Symbol": row.name,
+                "Rank": int(rank) if pd.notna(rank) else "N/A",
+                "Max Supply": f"{max_supply:,.0f}" if max_supply > 0 else "N/A",
+                "Total Supply": f"{total_supply:,.0f}" if total_supply > 0 else "N/A",
+                "Date Added": date_added.strftime("%Y-%m-%d") if pd.notna(date_added) else "N/A",
+                "Tags": row["tags"] or "N/A"
             }
         except Exception:
             return {"Error": "Unable to fetch crypto info"}
@@ -305,21 +274,21 @@ class CryptoAnalyzer:
     def calculate_crypto_performance(self, crypto_data):
         """Calculate crypto performance metrics from API data"""
         try:
-            quote_data = crypto_data["quote"]["USD"]
+            row = self._quote_row(crypto_data)
             performance = {}
 
             # Get performance data directly from API
             periods = {
-                "🔴 1 Hour": quote_data.get("percent_change_1h", 0),
-                "🔴 24 Hours": quote_data.get("percent_change_24h", 0),
-                "🔴 7 Days": quote_data.get("percent_change_7d", 0),
-                "🔴 30 Days": quote_data.get("percent_change_30d", 0),
-                "🔴 60 Days": quote_data.get("percent_change_60d", 0),
-                "🔴 90 Days": quote_data.get("percent_change_90d", 0)
+                "🔴 1 Hour": row["percent_change_1h"],
+                "🔴 24 Hours": row["percent_change_24h"],
+                "🔴 7 Days": row["percent_change_7d"],
+                "🔴 30 Days": row["percent_change_30d"],
+                "🔴 60 Days": row["percent_change_60d"],
+                "🔴 90 Days": row["percent_change_90d"]
             }
 
             for period_name, change in periods.items():
-                if change is not None:
+                if pd.notna(change):
                     color = "🟢" if change > 0 else "🔴" if change < 0 else "🟡"
                     clean_period = period_name.replace("🔴 ", "")
                     performance[f"{color} {clean_period}"] = f"{change:+.2f}%"
@@ -328,14 +297,22 @@ class CryptoAnalyzer:
         except Exception:
             return {"Error": "Unable to calculate performance"}
 
-    def _is_cache_valid(self, cache_key):
-        """Check if cached data is valid"""
-        if cache_key not in self.cache or cache_key not in self.cache_expiry:
-            return False
-        return datetime.now() < self.cache_expiry[cache_key]
-
-    def _cache_data(self, cache_key, data):
-        """Cache data with expiry"""
-        self.cache[cache_key] = data
-        self.cache_expiry[cache_key] = datetime.now(
-        ) + timedelta(minutes=self.config.cache_settings['expiry_minutes'])
+    def _quote_row(self, crypto_data):
+        """Typed row for a quote: the snapshot's when it is at least as new, else the quote's own"""
+        symbol = crypto_data["symbol"].upper()
+        row = self.snapshot.row(symbol)
+        if row is not None and row["last_updated"] >= self._last_updated(crypto_data):
+            return row
+        row = flatten_quotes({symbol: crypto_data}).iloc[0]
+        self.snapshot.update({symbol: crypto_data})
+        return row
+
+    def _last_updated(self, crypto_data):
+        """Quote timestamp as a UTC Timestamp (NaT when missing)"""
+        return pd.to_datetime(crypto_data.get("quote", {}).get("USD", {}).get("last_updated"),
+                              utc=True, errors="coerce")
+
+    @timed("cache_lookup")
+    def _cache_get(self, cache_key):
+        """Look up a cache entry"""
+        return self.cache.get(cache_key)
@@ -0,0 +1,59 @@
+"""
+Chart downsampling
+Resamples long OHLCV histories to coarser bars so charts stay within a pixel budget
+"""
+
+
+# (pandas rule, label, approximate days per bar), finest first
+BAR_INTERVALS = [
+    (None, "Daily", 1),
+    ("W-FRI", "Weekly", 7),
+    ("ME", "Monthly", 30.44),
+    ("QE", "Quarterly", 91.31),
+    ("YE", "Yearly", 365.25),
+]
+
+OHLCV_AGGREGATION = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Volume": "sum",
+}
+
+
+def max_bars_for_width(width_px, min_px_per_bar):
+    """Number of bars that fit in a chart width"""
+    return max(int(width_px // max(min_px_per_bar, 1)), 1)
+
+
+def choose_interval(data, max_bars):
+    """Pick the finest bar interval that keeps the bar count within max_bars"""
+    if data is None or len(data) <= max_bars:
+        return BAR_INTERVALS[0]
+    span_days = max((data.index[-1] - data.index[0]).days, 1)
+    for interval in BAR_INTERVALS[1:]:
+        if span_days / interval[2] <= max_bars:
+            return interval
+    return BAR_INTERVALS[-1]
+
+
+def resample_ohlcv(data, rule):
+    """Aggregate an OHLCV frame into coarser bars"""
+    aggregation = {column: how for column, how in OHLCV_AGGREGATION.items()
+                   if column in data.columns}
+    resampled = data.resample(rule).agg(aggregation)
+    return resampled.dropna(subset=["Close"])
+
+
+def downsample_chart_data(data, max_bars, indicators=None):
+    """Downsample history (and aligned indicators) for display, returning (data, indicators, label)"""
+    rule, label, _ = choose_interval(data, max_bars)
+    if rule is None:
+        return data, indicators, label
+
+    resampled = resample_ohlcv(data, rule)
+    if indicators is not None:
+        # Indicator value at the close of each coarser bar
+        indicators = indicators.resample(rule).last().reindex(resampled.index)
+    return resampled, indicators, label
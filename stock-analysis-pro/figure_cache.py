@@ -0,0 +1,57 @@
+"""
+Figure cache
+Reuses built Plotly figures while the underlying data hasn't changed
+"""
+
+import threading
+from collections import OrderedDict
+
+from cache import shared_resource
+
+
+def data_fingerprint(data):
+    """Cheap fingerprint of a history frame: length, date range and the last bar"""
+    if data is None or data.empty:
+        return None
+    last_bar = tuple(float(value) for value in data.iloc[-1].to_numpy(dtype="float64", na_value=0.0))
+    return (len(data), data.index[0].value, data.index[-1].value, hash(last_bar))
+
+
+class FigureCache:
+    """Thread-safe LRU of built figures keyed by (chart, symbol, period, fingerprint, theme, ...)"""
+
+    def __init__(self, max_entries=200):
+        """Initialize cache with a maximum number of entries"""
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, config):
+        """Get the process-wide figure cache"""
+        return shared_resource("figure_cache", lambda: cls(
+            max_entries=config.chart_settings['figure_cache_entries']))
+
+    def get_or_build(self, key, build):
+        """Return cached figures for a key, building and storing them on a miss"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        figures = build()
+        with self._lock:
+            self._entries[key] = figures
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return figures
+
+    def get_stats(self):
+        """Get cache counters"""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
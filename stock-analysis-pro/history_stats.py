@@ -0,0 +1,70 @@
+"""
+History statistics
+Price, 52-week range, volume averages, realized volatility and beta derived from daily OHLCV
+"""
+
+import numpy as np
+import pandas as pd
+
+from screener import TRADING_DAYS
+
+
+VOLUME_WINDOWS = {"avg_volume_10d": 10, "avg_volume_20d": 20, "avg_volume_3m": 63}
+
+VOLATILITY_WINDOWS = {"volatility_30d": 21, "volatility_1y": TRADING_DAYS}
+
+
+def _annualized_volatility(log_returns):
+    """Annualized standard deviation of daily log returns (None with fewer than 2)"""
+    log_returns = log_returns[np.isfinite(log_returns)]
+    if len(log_returns) < 2:
+        return None
+    return float(np.std(log_returns, ddof=1) * np.sqrt(TRADING_DAYS))
+
+
+def compute_beta(hist, benchmark, window=TRADING_DAYS):
+    """Beta of daily returns against a benchmark history over the shared dates"""
+    if benchmark is None or benchmark.empty:
+        return None
+    closes = pd.concat([hist['Close'], benchmark['Close']], axis=1, join="inner")
+    prices = closes.to_numpy(dtype="float64")[-(window + 1):]
+    if len(prices) < 3:
+        return None
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = prices[1:] / prices[:-1] - 1
+    returns = returns[np.isfinite(returns).all(axis=1)]
+    if len(returns) < 2:
+        return None
+    covariance = np.cov(returns, rowvar=False)
+    if covariance[1, 1] <= 0:
+        return None
+    return float(covariance[0, 1] / covariance[1, 1])
+
+
+def compute_history_stats(hist, benchmark=None):
+    """Derive the quote statistics the dashboard shows from a daily history"""
+    if hist is None or hist.empty:
+        return {}
+
+    close = hist['Close'].to_numpy(dtype="float64")
+    high = hist['High'].to_numpy(dtype="float64")[-TRADING_DAYS:]
+    low = hist['Low'].to_numpy(dtype="float64")[-TRADING_DAYS:]
+    volume = hist['Volume'].to_numpy(dtype="float64")
+
+    stats = {
+        "last_close": float(close[-1]),
+        "previous_close": float(close[-2] if len(close) > 1 else close[-1]),
+        "high_52w": float(np.nanmax(high)),
+        "low_52w": float(np.nanmin(low)),
+        "volume": float(volume[-1]),
+    }
+    for name, days in VOLUME_WINDOWS.items():
+        stats[name] = float(np.nanmean(volume[-days:]))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_returns = np.diff(np.log(close[-(TRADING_DAYS + 1):]))
+    for name, days in VOLATILITY_WINDOWS.items():
+        stats[name] = _annualized_volatility(log_returns[-days:])
+
+    stats["beta"] = compute_beta(hist, benchmark)
+    return stats
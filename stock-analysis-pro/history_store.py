@@ -0,0 +1,167 @@
+"""
+History store
+Persistent on-disk OHLCV store (Parquet files keyed by symbol and interval)
+"""
+
+import os
+import threading
+import time
+
+import pandas as pd
+
+
+PERIOD_OFFSETS = {
+    "1d": pd.DateOffset(days=1),
+    "5d": pd.DateOffset(days=7),
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+
+def period_start(period, now=None, tz=None):
+    """Get the first timestamp covered by a yfinance period string (None for max)"""
+    period = period.lower()
+    now = now if now is not None else pd.Timestamp.now(tz=tz)
+    if period == "max":
+        return None
+    if period == "ytd":
+        return now.normalize().replace(month=1, day=1)
+    offset = PERIOD_OFFSETS.get(period)
+    if offset is None:
+        raise ValueError(f"Unsupported period: {period}")
+    return (now - offset).normalize()
+
+
+# Relative Close difference on an overlapping bar that means the history was re-adjusted
+ADJUSTMENT_TOLERANCE = 5e-4
+
+
+def adjustment_changed(stored, tail, tolerance=ADJUSTMENT_TOLERANCE):
+    """Check whether a fetched tail is on a different split/dividend basis than stored bars"""
+    if stored is None or stored.empty or tail is None or tail.empty:
+        return False
+    if stored.index.tz is not None and tail.index.tz is not None:
+        tail = tail.tz_convert(stored.index.tz)
+
+    # A new split or dividend re-adjusts every earlier auto-adjusted bar
+    new_bars = tail[tail.index > stored.index[-1]]
+    for column in ("Stock Splits", "Dividends"):
+        if column in new_bars and (new_bars[column].fillna(0) != 0).any():
+            return True
+
+    # The last stored bar may have been partial, earlier bars are final
+    overlap = stored.index[:-1].intersection(tail.index)
+    if overlap.empty:
+        return False
+    old = stored.loc[overlap, 'Close'].to_numpy(dtype="float64")
+    new = tail.loc[overlap, 'Close'].to_numpy(dtype="float64")
+    return bool((abs(new - old) > tolerance * abs(old)).any())
+
+
+def tail_start(stored):
+    """Date to refetch from: the last two stored bars, so one final bar overlaps"""
+    return stored.index[-min(2, len(stored))].date()
+
+
+def slice_period(data, period, now=None):
+    """Return the rows of a history frame inside a period as a zero-copy view"""
+    if data is None or data.empty:
+        return data
+    start = period_start(period, now=now, tz=data.index.tz)
+    if start is None:
+        return data
+    # Positional slicing of a sorted index returns a view, not a copy
+    return data.iloc[data.index.searchsorted(start):]
+
+
+class HistoryStore:
+    """Columnar OHLCV store that persists yfinance histories between restarts"""
+
+    def __init__(self, base_dir):
+        """Initialize store rooted at a directory"""
+        self.base_dir = base_dir
+        self._lock = threading.Lock()
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a store from the application storage settings, or None when disabled"""
+        if not config.storage_settings.get('persist_history'):
+            return None
+        return cls(config.storage_settings['history_dir'])
+
+    def load(self, symbol, interval="1d"):
+        """Load a stored history frame, or None if nothing is stored"""
+        path = self._path(symbol, interval)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            print(f"Error reading stored history for {symbol}: {e}")
+            return None
+
+    def save(self, symbol, interval, data, full_history=False):
+        """Write a history frame atomically"""
+        data = data.copy(deep=False)
+        data.attrs = {"full_history": bool(full_history)}
+        path = self._path(symbol, interval)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            data.to_parquet(tmp_path)
+            os.replace(tmp_path, path)
+        return data
+
+    def append(self, symbol, interval, new_data, full_history=False):
+        """Merge new bars into the stored history, newer bars replacing older ones"""
+        stored = self.load(symbol, interval)
+        if stored is None or stored.empty:
+            if new_data is None or new_data.empty:
+                return stored
+            return self.save(symbol, interval, new_data, full_history)
+        if new_data is None or new_data.empty:
+            return stored
+
+        full_history = full_history or self.is_full_history(stored)
+        new_data = self._align_timezone(new_data, stored.index.tz)
+        merged = pd.concat([stored, new_data])
+        merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+        return self.save(symbol, interval, merged, full_history)
+
+    def covers(self, data, start):
+        """Check whether a stored frame reaches back to a start timestamp"""
+        if data is None or data.empty:
+            return False
+        if self.is_full_history(data):
+            return True
+        if start is None:
+            return False
+        return data.index[0] <= start + pd.Timedelta(days=5)
+
+    def is_full_history(self, data):
+        """Check whether a stored frame holds the complete ("max") history"""
+        return bool(data.attrs.get("full_history", False))
+
+    def age_seconds(self, symbol, interval="1d"):
+        """Seconds since the stored history was last written (None if missing)"""
+        path = self._path(symbol, interval)
+        if not os.path.exists(path):
+            return None
+        return time.time() - os.path.getmtime(path)
+
+    def _align_timezone(self, data, tz):
+        """Convert a frame's index to the stored timezone"""
+        if data.index.tz is None or tz is None or data.index.tz == tz:
+            return data
+        return data.tz_convert(tz)
+
+    def _path(self, symbol, interval):
+        """Build the file path for a symbol/interval pair"""
+        safe_symbol = "".join(c if c.isalnum() or c in "-_." else "_"
+                              for c in symbol.upper())
+        return os.path.join(self.base_dir, f"{safe_symbol}_{interval}.parquet")
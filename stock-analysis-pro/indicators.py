@@ -0,0 +1,337 @@
+"""
+Technical indicators
+Vectorized indicator computation over OHLCV frames with O(1) incremental updates
+"""
+
+import math
+import threading
+from collections import OrderedDict, deque
+
+import numpy as np
+import pandas as pd
+
+
+INDICATOR_COLUMNS = [
+    "SMA_20", "SMA_50", "EMA_12", "EMA_26", "RSI_14",
+    "MACD", "MACD_Signal", "MACD_Hist",
+    "BB_Upper", "BB_Middle", "BB_Lower", "ATR_14", "VWAP",
+]
+
+# Indicators drawn on the price axis (the rest need their own panel)
+PRICE_OVERLAYS = ["SMA_20", "SMA_50", "EMA_12", "EMA_26",
+                  "BB_Upper", "BB_Middle", "BB_Lower", "VWAP"]
+
+
+def compute_indicators(data):
+    """Compute all indicators for an OHLCV frame in one vectorized pass"""
+    close = data["Close"].astype("float64")
+    high = data["High"].astype("float64")
+    low = data["Low"].astype("float64")
+    volume = data["Volume"].astype("float64")
+    out = pd.DataFrame(index=data.index)
+
+    out["SMA_20"] = close.rolling(20).mean()
+    out["SMA_50"] = close.rolling(50).mean()
+    out["EMA_12"] = close.ewm(span=12, adjust=False).mean()
+    out["EMA_26"] = close.ewm(span=26, adjust=False).mean()
+
+    # Wilder's RSI
+    delta = close.diff()
+    avg_gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    avg_loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    out["RSI_14"] = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+    out.loc[avg_gain.isna(), "RSI_14"] = np.nan
+
+    out["MACD"] = out["EMA_12"] - out["EMA_26"]
+    out["MACD_Signal"] = out["MACD"].ewm(span=9, adjust=False).mean()
+    out["MACD_Hist"] = out["MACD"] - out["MACD_Signal"]
+
+    # Bollinger bands use the population standard deviation
+    std = close.rolling(20).std(ddof=0)
+    out["BB_Middle"] = out["SMA_20"]
+    out["BB_Upper"] = out["SMA_20"] + 2 * std
+    out["BB_Lower"] = out["SMA_20"] - 2 * std
+
+    prev_close = close.shift(1)
+    true_range = pd.concat([high - low, (high - prev_close).abs(),
+                            (low - prev_close).abs()], axis=1).max(axis=1)
+    out["ATR_14"] = true_range.ewm(alpha=1 / 14, adjust=False).mean()
+
+    # VWAP anchored at the first bar of the frame
+    typical_price = (high + low + close) / 3
+    cum_volume = volume.cumsum()
+    out["VWAP"] = (typical_price * volume).cumsum() / cum_volume.where(cum_volume != 0)
+
+    return out[INDICATOR_COLUMNS]
+
+
+class IndicatorState:
+    """Running state needed to extend every indicator by one bar"""
+
+    def __init__(self):
+        """Initialize empty state"""
+        self.sma_20 = deque(maxlen=20)
+        self.sma_50 = deque(maxlen=50)
+        self.sum_20 = 0.0
+        self.sum_sq_20 = 0.0
+        self.sum_50 = 0.0
+        self.ema_12 = math.nan
+        self.ema_26 = math.nan
+        self.macd_signal = math.nan
+        self.avg_gain = math.nan
+        self.avg_loss = math.nan
+        self.atr = math.nan
+        self.prev_close = math.nan
+        self.cum_pv = 0.0
+        self.cum_volume = 0.0
+
+    @classmethod
+    def from_frame(cls, data, indicators):
+        """Rebuild the running state from a frame and its computed indicators"""
+        state = cls()
+        if data.empty:
+            return state
+        close = data["Close"].to_numpy(dtype="float64")
+        state.sma_20.extend(close[-20:])
+        state.sma_50.extend(close[-50:])
+        state.sum_20 = float(np.sum(close[-20:]))
+        state.sum_sq_20 = float(np.sum(close[-20:] ** 2))
+        state.sum_50 = float(np.sum(close[-50:]))
+
+        last = indicators.iloc[-1]
+        state.ema_12 = float(last["EMA_12"])
+        state.ema_26 = float(last["EMA_26"])
+        state.macd_signal = float(last["MACD_Signal"])
+        state.atr = float(last["ATR_14"])
+        state.prev_close = float(close[-1])
+
+        delta = np.diff(close)
+        if len(delta):
+            state.avg_gain = float(pd.Series(np.clip(delta, 0, None)).ewm(
+                alpha=1 / 14, adjust=False).mean().iloc[-1])
+            state.avg_loss = float(pd.Series(np.clip(-delta, 0, None)).ewm(
+                alpha=1 / 14, adjust=False).mean().iloc[-1])
+
+        high = data["High"].to_numpy(dtype="float64")
+        low = data["Low"].to_numpy(dtype="float64")
+        volume = data["Volume"].to_numpy(dtype="float64")
+        state.cum_pv = float(np.sum((high + low + close) / 3 * volume))
+        state.cum_volume = float(np.sum(volume))
+        return state
+
+    def copy(self):
+        """Copy the state (deques included)"""
+        clone = IndicatorState()
+        clone.__dict__.update(self.__dict__)
+        clone.sma_20 = deque(self.sma_20, maxlen=20)
+        clone.sma_50 = deque(self.sma_50, maxlen=50)
+        return clone
+
+    def update(self, open_price, high, low, close, volume):
+        """Advance the state by one bar and return that bar's indicator values"""
+        if len(self.sma_20) == 20:
+            oldest = self.sma_20[0]
+            self.sum_20 -= oldest
+            self.sum_sq_20 -= oldest * oldest
+        if len(self.sma_50) == 50:
+            self.sum_50 -= self.sma_50[0]
+        self.sma_20.append(close)
+        self.sma_50.append(close)
+        self.sum_20 += close
+        self.sum_sq_20 += close * close
+        self.sum_50 += close
+
+        self.ema_12 = _ema_step(self.ema_12, close, 2 / 13)
+        self.ema_26 = _ema_step(self.ema_26, close, 2 / 27)
+        macd = self.ema_12 - self.ema_26
+        self.macd_signal = _ema_step(self.macd_signal, macd, 2 / 10)
+
+        if math.isnan(self.prev_close):
+            rsi = math.nan
+            true_range = high - low
+        else:
+            delta = close - self.prev_close
+            self.avg_gain = _ema_step(self.avg_gain, max(delta, 0.0), 1 / 14)
+            self.avg_loss = _ema_step(self.avg_loss, max(-delta, 0.0), 1 / 14)
+            rsi = 100.0 if self.avg_loss == 0 else 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+            true_range = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.atr = _ema_step(self.atr, true_range, 1 / 14)
+        self.prev_close = close
+
+        self.cum_pv += (high + low + close) / 3 * volume
+        self.cum_volume += volume
+
+        sma_20 = self.sum_20 / 20 if len(self.sma_20) == 20 else math.nan
+        sma_50 = self.sum_50 / 50 if len(self.sma_50) == 50 else math.nan
+        std_20 = math.sqrt(max(self.sum_sq_20 / 20 - sma_20 * sma_20, 0.0)) \
+            if len(self.sma_20) == 20 else math.nan
+
+        return {
+            "SMA_20": sma_20,
+            "SMA_50": sma_50,
+            "EMA_12": self.ema_12,
+            "EMA_26": self.ema_26,
+            "RSI_14": rsi,
+            "MACD": macd,
+            "MACD_Signal": self.macd_signal,
+            "MACD_Hist": macd - self.macd_signal,
+            "BB_Upper": sma_20 + 2 * std_20,
+            "BB_Middle": sma_20,
+            "BB_Lower": sma_20 - 2 * std_20,
+            "ATR_14": self.atr,
+            "VWAP": self.cum_pv / self.cum_volume if self.cum_volume else math.nan,
+        }
+
+
+class IndicatorSeries:
+    """Growable column store of indicator values for one symbol"""
+
+    def __init__(self, data):
+        """Compute indicators for a full frame and keep the running state"""
+        indicators = compute_indicators(data)
+        self.first_timestamp = data.index[0]
+        self.length = len(data)
+        capacity = self.length + max(self.length // 4, 64)
+        self._index = np.empty(capacity, dtype="int64")
+        self._index[:self.length] = data.index.as_unit("ns").asi8
+        self._tz = data.index.tz
+        self._unit = data.index.unit
+        self._values = np.empty((capacity, len(INDICATOR_COLUMNS)), dtype="float64")
+        self._values[:self.length] = indicators.to_numpy(dtype="float64")
+
+        # State before the last bar, so a revised last bar can be replaced
+        self.state = IndicatorState.from_frame(data.iloc[:-1], indicators.iloc[:-1]) \
+            if self.length > 1 else IndicatorState()
+        self._last_bar = tuple(data.iloc[-1][["Open", "High", "Low", "Close", "Volume"]])
+        self._state_after_last = self.state.copy()
+        self._state_after_last.update(*map(float, self._last_bar))
+
+    @property
+    def last_timestamp(self):
+        """Timestamp of the newest bar"""
+        timestamp = pd.Timestamp(self._index[self.length - 1], unit="ns")
+        return timestamp.tz_localize("UTC").tz_convert(self._tz) if self._tz else timestamp
+
+    @property
+    def nbytes(self):
+        """Memory held by the index and value buffers"""
+        return self._index.nbytes + self._values.nbytes
+
+    def extends(self, data, position):
+        """Whether data still has the close before the newest bar (a re-adjusted history doesn't)"""
+        if position == 0 or math.isnan(self.state.prev_close):
+            return True
+        return math.isclose(float(data["Close"].iat[position - 1]), self.state.prev_close,
+                            rel_tol=1e-9)
+
+    def append(self, timestamp, bar):
+        """Append a new bar, or replace the newest one if the timestamp matches"""
+        timestamp = pd.Timestamp(timestamp)
+        if timestamp == self.last_timestamp:
+            if bar == self._last_bar:
+                return
+            self.length -= 1
+        else:
+            self.state = self._state_after_last
+
+        if self.length == len(self._index):
+            self._grow()
+        state = self.state.copy()
+        row = state.update(*map(float, bar))
+        self._index[self.length] = timestamp.value
+        self._values[self.length] = [row[column] for column in INDICATOR_COLUMNS]
+        self.length += 1
+        self._last_bar = bar
+        self._state_after_last = state
+
+    def to_frame(self):
+        """Return the indicator values as a DataFrame"""
+        index = pd.DatetimeIndex(self._index[:self.length].view("datetime64[ns]"))
+        if self._tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self._tz)
+        index = index.as_unit(self._unit)
+        # Copied, appends replace the newest bar in place
+        return pd.DataFrame(self._values[:self.length], index=index,
+                            columns=INDICATOR_COLUMNS, copy=True)
+
+    def _grow(self):
+        """Grow the capacity by a quarter so appends stay amortized O(1)"""
+        capacity = len(self._index) + max(len(self._index) // 4, 64)
+        index = np.empty(capacity, dtype="int64")
+        index[:self.length] = self._index[:self.length]
+        values = np.empty((capacity, len(INDICATOR_COLUMNS)), dtype="float64")
+        values[:self.length] = self._values[:self.length]
+        self._index = index
+        self._values = values
+
+
+class IndicatorEngine:
+    """Indicator cache keyed by symbol that extends incrementally as bars are appended"""
+
+    def __init__(self, max_symbols=500, max_size_mb=50):
+        """Initialize engine keeping at most max_symbols series within max_size_mb (LRU dropped)"""
+        self.max_symbols = max_symbols
+        self.max_bytes = max_size_mb * 1024 * 1024
+        self._series = OrderedDict()
+        self._lock = threading.Lock()
+        self.full_computes = 0
+        self.incremental_updates = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """Create an engine sized by the application cache settings"""
+        return cls(max_size_mb=config.cache_settings['indicator_max_size_mb'])
+
+    @property
+    def nbytes(self):
+        """Memory held by every cached series"""
+        return sum(series.nbytes for series in self._series.values())
+
+    def get(self, key, data):
+        """Get indicators aligned to a history frame, updating only the new tail"""
+        if data is None or data.empty:
+            return None
+        with self._lock:
+            return self._get(key, data)
+
+    def _get(self, key, data):
+        """Update or rebuild the series for a key (caller holds the lock)"""
+        series = self._series.get(key)
+        if series is not None:
+            self._series.move_to_end(key)
+        if series is not None and series.first_timestamp == data.index[0]:
+            position = data.index.searchsorted(series.last_timestamp)
+            if position < len(data) and data.index[position] == series.last_timestamp \
+                    and len(data) - position <= 1 + len(data) // 2 \
+                    and series.extends(data, position):
+                bars = data[["Open", "High", "Low", "Close", "Volume"]].iloc[position:]
+                for timestamp, bar in zip(bars.index, bars.itertuples(index=False, name=None)):
+                    series.append(timestamp, bar)
+                self.incremental_updates += len(bars) - 1
+                self._evict()
+                return series.to_frame()
+
+        series = IndicatorSeries(data)
+        self._series[key] = series
+        self._series.move_to_end(key)
+        self._evict()
+        self.full_computes += 1
+        return series.to_frame()
+
+    def _evict(self):
+        """Drop least recently used series over the symbol or size limit (keeps the newest)"""
+        while len(self._series) > self.max_symbols or \
+                (len(self._series) > 1 and self.nbytes > self.max_bytes):
+            self._series.popitem(last=False)
+
+    def invalidate(self, key):
+        """Drop cached indicators for a key"""
+        with self._lock:
+            self._series.pop(key, None)
+
+
+def _ema_step(previous, value, alpha):
+    """One exponential moving average step (seeded with the first value)"""
+    if math.isnan(previous):
+        return value
+    return previous + alpha * (value - previous)
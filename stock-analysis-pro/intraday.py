@@ -0,0 +1,144 @@
+"""
+Intraday bars
+Fixed-capacity ring buffer for streaming OHLCV bars that appends in place
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+INTERVAL_SECONDS = {
+    "1m": 60, "2m": 120, "5m": 300, "15m": 900,
+    "30m": 1800, "60m": 3600, "90m": 5400, "1h": 3600,
+}
+
+
+class BarRingBuffer:
+    """Ring buffer of OHLCV bars; every window of bars is one contiguous slice"""
+
+    def __init__(self, capacity, columns=OHLCV_COLUMNS):
+        """Initialize an empty buffer holding at most capacity bars"""
+        self.capacity = capacity
+        self.columns = list(columns)
+        # Every bar is written twice (at i and i + capacity) so the newest
+        # `length` bars are always contiguous and copy out as one slice
+        self._index = np.zeros(capacity * 2, dtype="int64")
+        self._values = np.zeros((capacity * 2, len(self.columns)), dtype="float64")
+        self._start = 0
+        self.length = 0
+        self.tz = None
+        self.version = 0
+        self.period = None
+        self.fetched_at = None
+        # The buffer is shared through the process-wide cache and written in place
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return self.length
+
+    def __sizeof__(self):
+        return self._index.nbytes + self._values.nbytes
+
+    @property
+    def last_timestamp(self):
+        """Timestamp of the newest bar (None when empty)"""
+        if not self.length:
+            return None
+        return self._to_timestamp(self._index[self._start + self.length - 1])
+
+    def load(self, data):
+        """Replace the buffer contents with the newest bars of a frame"""
+        with self._lock:
+            self._load(data)
+
+    def _load(self, data):
+        """Replace the buffer contents (caller holds the lock)"""
+        data = data.iloc[-self.capacity:]
+        count = len(data)
+        self.tz = data.index.tz
+        index = data.index.as_unit("ns").asi8
+        values = data[self.columns].to_numpy(dtype="float64")
+        self._index[:count] = index
+        self._index[self.capacity:self.capacity + count] = index
+        self._values[:count] = values
+        self._values[self.capacity:self.capacity + count] = values
+        self._start = 0
+        self.length = count
+        self.version += 1
+
+    def extend(self, data):
+        """Append bars from a frame, replacing the newest bar if it was revised"""
+        if data is None or data.empty:
+            return 0
+        with self._lock:
+            if not self.length:
+                self._load(data)
+                return len(data)
+            if self.tz is not None and data.index.tz is not None:
+                data = data.tz_convert(self.tz)
+
+            appended = 0
+            index = data.index.as_unit("ns").asi8
+            values = data[self.columns].to_numpy(dtype="float64")
+            for timestamp, row in zip(index, values):
+                appended += self.append(timestamp, row)
+            return appended
+
+    def append(self, timestamp, row):
+        """Write one bar in place (timestamp in ns); returns 1 if a new bar was added"""
+        with self._lock:
+            return self._append(timestamp, row)
+
+    def _append(self, timestamp, row):
+        """Write one bar (caller holds the lock)"""
+        last_position = self._start + self.length - 1
+        if self.length and timestamp < self._index[last_position]:
+            return 0
+        if self.length and timestamp == self._index[last_position]:
+            self._write(last_position % self.capacity, timestamp, row)
+            self.version += 1
+            return 0
+
+        if self.length < self.capacity:
+            position = (self._start + self.length) % self.capacity
+            self.length += 1
+        else:
+            # Full: overwrite the oldest bar and advance the window
+            position = self._start
+            self._start = (self._start + 1) % self.capacity
+        self._write(position, timestamp, row)
+        self.version += 1
+        return 1
+
+    def to_frame(self):
+        """All buffered bars as a DataFrame"""
+        return self.tail(self.length)
+
+    def tail(self, count):
+        """The newest `count` bars as a DataFrame"""
+        with self._lock:
+            count = min(count, self.length)
+            stop = self._start + self.length
+            start = stop - count
+            # Copied out: later writes must not change frames other sessions are charting
+            index = pd.DatetimeIndex(self._index[start:stop].copy().view("datetime64[ns]"))
+            values = self._values[start:stop].copy()
+        if self.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self.tz)
+        return pd.DataFrame(values, index=index, columns=self.columns, copy=False)
+
+    def _write(self, position, timestamp, row):
+        """Write a bar to both mirrored slots"""
+        self._index[position] = timestamp
+        self._index[position + self.capacity] = timestamp
+        self._values[position] = row
+        self._values[position + self.capacity] = row
+
+    def _to_timestamp(self, value):
+        """Convert a stored ns value back to a Timestamp"""
+        timestamp = pd.Timestamp(int(value), unit="ns")
+        return timestamp.tz_localize("UTC").tz_convert(self.tz) if self.tz is not None else timestamp
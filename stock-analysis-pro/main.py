@@ -6,6 +6,9 @@ Entry point that orchestrates the application with Stock and Crypto support
 import config
 import stock_analyzer
 import crypto_analyzer
+import async_fetcher
+import profiling
+import refresh_scheduler
 import ui
 
 
@@ -13,10 +16,17 @@ def main():
     """Main application function"""
     # Initialize components
     config_manager = config.Config()
-    stock_analyzer_instance = stock_analyzer.StockAnalyzer(config_manager)
-    crypto_analyzer_instance = crypto_analyzer.CryptoAnalyzer(config_manager)
+    profiler = profiling.Profiler.from_config(config_manager)
+    profiler.start_render()
+    stock_analyzer_instance = stock_analyzer.StockAnalyzer(
+        config_manager, profiler)
+    crypto_analyzer_instance = crypto_analyzer.CryptoAnalyzer(
+        config_manager, profiler)
+    data_fetcher = async_fetcher.AsyncDataFetcher(
+        config_manager, stock_analyzer_instance, crypto_analyzer_instance)
     user_interface = ui.UI(
         config_manager, stock_analyzer_instance, crypto_analyzer_instance)
+    scheduler = refresh_scheduler.RefreshScheduler.shared(config_manager)
 
     # Setup UI with Streamlit
     user_interface.setup_page()
@@ -33,66 +43,93 @@ def main():
 
         # Handle new stock search
         if symbol and search_clicked:
-            if stock_analyzer_instance.validate_stock_symbol(symbol):
-                with user_interface.show_loading(f"📊 Analyzing {symbol}..."):
-                    hist_data, stock_info = stock_analyzer_instance.get_stock_data(
-                        symbol, period="1y")
-
-                    if hist_data is not None and stock_info:
-                        # Store in session state
-                        user_interface.store_stock_data(
-                            hist_data, stock_info, symbol)
-                    else:
-                        user_interface.show_error(
-                            "❌ Unable to fetch stock data. Please try again.")
-            else:
+            with user_interface.show_loading(f"📊 Analyzing {symbol}..."):
+                # Validation, history and .info share one concurrent fetch
+                is_valid, hist_data, stock_info = data_fetcher.fetch_stock_page(
+                    symbol, period="1y")
+
+            if not is_valid:
                 user_interface.show_validation_error(symbol)
+            elif hist_data is not None:
+                # Store in session state
+                user_interface.store_stock_data(
+                    hist_data, stock_info, symbol)
+            else:
+                user_interface.show_error(
+                    "❌ Unable to fetch stock data. Please try again.")
 
         # Stock Data Container - Contains all stock analysis components
         if user_interface.has_stock_data():
             hist_data, stock_info, current_symbol = user_interface.get_stored_stock_data()
+            # Quote numbers come from history; .info only feeds descriptive fields
+            # (refetched from the cache if the page fetch didn't get it)
+            stock_info = stock_info or stock_analyzer_instance.get_stock_info(
+                current_symbol) or {}
+
+            # Pick up quotes the background scheduler pushed into the cache
+            scheduler.watch("stock", current_symbol)
+            last_refreshed = scheduler.last_refreshed("stock", current_symbol)
+            if last_refreshed is not None:
+                latest_hist, latest_info = stock_analyzer_instance.get_stock_data(
+                    current_symbol, period="1y")
+                if latest_hist is not None:
+                    hist_data, stock_info = latest_hist, latest_info or stock_info
 
             with user_interface.create_data_container():
                 # Display all stock analysis components
-                user_interface.display_real_time_indicator()
+                user_interface.display_real_time_indicator(last_refreshed)
+                user_interface.enable_live_updates(
+                    lambda: scheduler.last_refreshed("stock", current_symbol),
+                    lambda: scheduler.watch("stock", current_symbol))
                 user_interface.display_stock_overview(
                     current_symbol, stock_info, hist_data)
                 user_interface.display_stock_charts(
                     current_symbol, hist_data, "1y")
-                user_interface.display_financial_metrics(stock_info, hist_data)
+                user_interface.display_financial_metrics(
+                    stock_info, hist_data, current_symbol)
                 user_interface.display_performance_metrics(hist_data)
                 user_interface.display_company_info(stock_info)
                 user_interface.display_description(stock_info)
 
+        user_interface.display_portfolio_analysis()
+
     else:  # Crypto mode
         symbol, search_clicked = user_interface.show_crypto_search()
 
         # Handle new crypto search
         if symbol and search_clicked:
-            if crypto_analyzer_instance.validate_crypto_symbol(symbol):
-                with user_interface.show_loading(f"💹 Analyzing {symbol}..."):
-                    crypto_data = crypto_analyzer_instance.get_crypto_data(
-                        symbol)
-                    hist_data = crypto_analyzer_instance.get_crypto_historical_data(
-                        symbol)
-
-                    if crypto_data:
-                        # Store in session state
-                        user_interface.store_crypto_data(
-                            crypto_data, hist_data, symbol)
-                    else:
-                        user_interface.show_error(
-                            "❌ Unable to fetch crypto data. Please try again.")
-            else:
+            with user_interface.show_loading(f"💹 Analyzing {symbol}..."):
+                # One quote request validates the symbol; history derives from it
+                is_valid, crypto_data, hist_data = data_fetcher.fetch_crypto_page(
+                    symbol)
+
+            if not is_valid:
                 user_interface.show_validation_error(symbol)
+            elif crypto_data:
+                # Store in session state
+                user_interface.store_crypto_data(
+                    crypto_data, hist_data, symbol)
+            else:
+                user_interface.show_error(
+                    "❌ Unable to fetch crypto data. Please try again.")
 
         # Crypto Data Container - Contains all crypto analysis components
         if user_interface.has_crypto_data():
             crypto_data, hist_data, current_symbol = user_interface.get_stored_crypto_data()
 
+            # Pick up quotes the background scheduler pushed into the cache
+            scheduler.watch("crypto", current_symbol)
+            last_refreshed = scheduler.last_refreshed("crypto", current_symbol)
+            if last_refreshed is not None:
+                crypto_data = crypto_analyzer_instance.get_crypto_data(
+                    current_symbol) or crypto_data
+
             with user_interface.create_data_container():
                 # Display all crypto analysis components
-                user_interface.display_real_time_indicator()
+                user_interface.display_real_time_indicator(last_refreshed, "crypto")
+                user_interface.enable_live_updates(
+                    lambda: scheduler.last_refreshed("crypto", current_symbol),
+                    lambda: scheduler.watch("crypto", current_symbol))
                 user_interface.display_crypto_overview(
                     current_symbol, crypto_data)
                 user_interface.display_crypto_charts(current_symbol, hist_data)
@@ -100,6 +137,11 @@ def main():
                 user_interface.display_crypto_performance(crypto_data)
                 user_interface.display_crypto_info(crypto_data)
 
+        user_interface.display_crypto_watchlist()
+
+    # One summary line per render (spans are only logged at level "spans")
+    profiler.end_render(f"render {mode.lower()}")
+
 
 # Run the app
 if __name__ == "__main__":
@@ -0,0 +1,105 @@
+"""
+Portfolio analytics
+Value, risk and benchmark metrics for many holdings over a Close-price panel (dates x symbols)
+"""
+
+import numpy as np
+import pandas as pd
+
+from screener import TRADING_DAYS
+
+
+def parse_holdings(text):
+    """Parse "AAPL:10, MSFT 5" style input into a symbol -> shares dict"""
+    holdings = {}
+    for item in text.replace("\n", ",").split(","):
+        parts = item.replace(":", " ").split()
+        if not parts:
+            continue
+        try:
+            shares = float(parts[1]) if len(parts) > 1 else 1.0
+        except ValueError:
+            continue
+        symbol = parts[0].upper()
+        holdings[symbol] = holdings.get(symbol, 0.0) + shares
+    return holdings
+
+
+def align_holdings(panel, holdings):
+    """Align holdings to a price panel, returning (prices matrix, shares vector, symbols)"""
+    symbols = [symbol for symbol in holdings if symbol in panel.columns]
+    # Before a symbol's first trade it is valued at its first known price
+    prices = panel[symbols].ffill().bfill().to_numpy(dtype="float64")
+    shares = np.array([holdings[symbol] for symbol in symbols], dtype="float64")
+    return prices, shares, symbols
+
+
+def rolling_sharpe(returns, window, risk_free_rate=0.0):
+    """Annualized rolling Sharpe ratio from cumulative sums (no per-window loop)"""
+    returns = np.asarray(returns, dtype="float64")
+    result = np.full(len(returns), np.nan)
+    if len(returns) < window or window < 2:
+        return result
+
+    excess = returns - risk_free_rate / TRADING_DAYS
+    sums = np.concatenate(([0.0], np.cumsum(excess)))
+    squares = np.concatenate(([0.0], np.cumsum(excess ** 2)))
+    window_sum = sums[window:] - sums[:-window]
+    window_squares = squares[window:] - squares[:-window]
+    mean = window_sum / window
+    variance = np.maximum(window_squares - window * mean ** 2, 0.0) / (window - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result[window - 1:] = np.where(variance > 0, mean / np.sqrt(variance), np.nan) \
+            * np.sqrt(TRADING_DAYS)
+    return result
+
+
+def compute_portfolio(panel, holdings, benchmark=None, window=63, risk_free_rate=0.0):
+    """Compute value series, covariance/correlation, betas and rolling Sharpe for holdings"""
+    if panel is None or panel.empty:
+        return None
+    prices, shares, symbols = align_holdings(panel, holdings)
+    if not symbols or len(prices) < 2:
+        return None
+    index = panel.index
+
+    positions = prices * shares
+    value = positions.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        asset_returns = np.nan_to_num(prices[1:] / prices[:-1] - 1)
+        portfolio_returns = np.nan_to_num(value[1:] / value[:-1] - 1)
+
+    covariance = np.atleast_2d(np.cov(asset_returns, rowvar=False)) * TRADING_DAYS
+    volatility = np.sqrt(np.diag(covariance))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        correlation = covariance / np.outer(volatility, volatility)
+
+    results = {
+        "symbols": symbols,
+        "missing": [symbol for symbol in holdings if symbol not in panel.columns],
+        "value": pd.Series(value, index=index, name="Value"),
+        "returns": pd.Series(portfolio_returns, index=index[1:], name="Return"),
+        "weights": pd.Series(positions[-1] / value[-1], index=symbols, name="Weight"),
+        "covariance": pd.DataFrame(covariance, index=symbols, columns=symbols),
+        "correlation": pd.DataFrame(correlation, index=symbols, columns=symbols),
+        "volatility": float(np.std(portfolio_returns, ddof=1) * np.sqrt(TRADING_DAYS)),
+        "total_return": float(value[-1] / value[0] - 1),
+        "rolling_sharpe": pd.Series(rolling_sharpe(portfolio_returns, window, risk_free_rate),
+                                    index=index[1:], name="Sharpe"),
+        "betas": None,
+        "beta": None,
+    }
+
+    if benchmark is not None and benchmark in panel.columns:
+        bench = panel[benchmark].ffill().bfill().to_numpy(dtype="float64")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bench_returns = np.nan_to_num(bench[1:] / bench[:-1] - 1)
+        centered = bench_returns - bench_returns.mean()
+        variance = centered @ centered
+        if variance > 0:
+            # One matrix-vector product gives every holding's beta
+            betas = (asset_returns - asset_returns.mean(axis=0)).T @ centered / variance
+            results["betas"] = pd.Series(betas, index=symbols, name="Beta")
+            results["beta"] = float((portfolio_returns - portfolio_returns.mean()) @ centered / variance)
+
+    return results
@@ -0,0 +1,106 @@
+"""
+Profiling
+Lightweight timed spans for fetch, cache, indicator and chart work, summarized per render
+"""
+
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+
+LEVELS = ("off", "summary", "spans")
+
+
+def get_logger():
+    """Get the application logger, attaching a stream handler on first use"""
+    logger = logging.getLogger("stock_analysis_pro")
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(
+            "%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def timed(name):
+    """Decorator that records a method call as a span on self.profiler"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.profiler.span(name):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class Profiler:
+    """Collects span timings for one render and logs them at the configured level"""
+
+    def __init__(self, level="summary"):
+        """Initialize profiler ("off", "summary" or "spans")"""
+        if level not in LEVELS:
+            raise ValueError(f"Unknown profiling level: {level}")
+        self.level = level
+        self.enabled = level != "off"
+        self.logger = get_logger() if self.enabled else None
+        self._lock = threading.Lock()
+        self._spans = {}
+        self._render_start = None
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a profiler from the application profiling settings"""
+        level = config.profiling_settings.get('level', "summary")
+        if level not in LEVELS:
+            # A typo in PROFILING_LEVEL shouldn't take the app down
+            get_logger().warning(f"Unknown PROFILING_LEVEL {level!r}, using 'summary'")
+            level = "summary"
+        return cls(level=level)
+
+    def span(self, name):
+        """Context manager timing a block under a span name (no-op when disabled)"""
+        if not self.enabled:
+            return nullcontext()
+        return self._timed_span(name)
+
+    def record(self, name, seconds):
+        """Add a span duration"""
+        with self._lock:
+            count, total = self._spans.get(name, (0, 0.0))
+            self._spans[name] = (count + 1, total + seconds)
+        if self.level == "spans":
+            self.logger.info("span %s %.1fms", name, seconds * 1000)
+
+    def start_render(self):
+        """Reset spans at the start of a render"""
+        with self._lock:
+            self._spans = {}
+        self._render_start = time.perf_counter()
+
+    def end_render(self, label="render"):
+        """Log a one-line summary of the render and return the span totals"""
+        summary = self.get_summary()
+        if self.enabled and self._render_start is not None:
+            elapsed = (time.perf_counter() - self._render_start) * 1000
+            parts = [f"{name} {count}x {total:.1f}ms"
+                     for name, (count, total) in summary.items()]
+            self.logger.info("%s %.1fms | %s", label, elapsed, " | ".join(parts) or "no spans")
+        self._render_start = None
+        return summary
+
+    def get_summary(self):
+        """Get {span name: (count, total milliseconds)}"""
+        with self._lock:
+            return {name: (count, total * 1000) for name, (count, total) in self._spans.items()}
+
+    @contextmanager
+    def _timed_span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
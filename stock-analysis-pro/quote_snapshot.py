@@ -0,0 +1,118 @@
+"""
+Quote snapshot
+Columnar table of the latest CoinMarketCap quotes (one typed row per coin)
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+COIN_FIELDS = ["cmc_rank", "circulating_supply", "total_supply", "max_supply"]
+
+QUOTE_FIELDS = [
+    "price", "volume_24h", "volume_change_24h", "market_cap", "market_cap_dominance",
+    "percent_change_1h", "percent_change_24h", "percent_change_7d",
+    "percent_change_30d", "percent_change_60d", "percent_change_90d",
+]
+
+
+def _number(value):
+    """Convert an API number to float (NaN when missing)"""
+    try:
+        return np.nan if value is None else float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _tags(tags):
+    """First three tags as text (v1 returns strings, v2 returns dicts)"""
+    names = [tag if isinstance(tag, str) else tag.get("name", "") for tag in (tags or [])[:3]]
+    return ", ".join(names)
+
+
+def flatten_quotes(quotes, currency="USD"):
+    """Flatten raw quotes (symbol -> CoinMarketCap dict) into one row per coin"""
+    symbols = [symbol.upper() for symbol in quotes]
+    coins = [coin or {} for coin in quotes.values()]
+    prices = [(coin.get("quote") or {}).get(currency) or {} for coin in coins]
+
+    columns = {"name": [coin.get("name") for coin in coins]}
+    for field in COIN_FIELDS:
+        columns[field] = np.array([_number(coin.get(field)) for coin in coins], dtype="float64")
+    for field in QUOTE_FIELDS:
+        columns[field] = np.array([_number(price.get(field)) for price in prices], dtype="float64")
+    columns["tags"] = [_tags(coin.get("tags")) for coin in coins]
+    columns["date_added"] = pd.to_datetime(
+        [coin.get("date_added") for coin in coins], utc=True, errors="coerce")
+    columns["last_updated"] = pd.to_datetime(
+        [price.get("last_updated") for price in prices], utc=True, errors="coerce")
+    return pd.DataFrame(columns, index=pd.Index(symbols, name="symbol"))
+
+
+class QuoteSnapshot:
+    """Latest quote per coin, updated in bulk and queried with vectorized operations"""
+
+    def __init__(self):
+        """Initialize an empty snapshot"""
+        self.table = flatten_quotes({})
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.table)
+
+    def update(self, quotes):
+        """Replace the rows for every coin in a quotes dict in one operation"""
+        rows = flatten_quotes(quotes)
+        if rows.empty:
+            return 0
+        with self._lock:
+            if self.table.empty:
+                table = rows
+            else:
+                table = pd.concat([self.table.drop(rows.index, errors="ignore"), rows])
+            # Readers keep whichever table they already hold, there is no in-place mutation
+            self.table = table
+            self.version += 1
+        return len(rows)
+
+    def row(self, symbol):
+        """The typed row for one coin (None if it isn't in the snapshot)"""
+        table = self.table
+        symbol = symbol.upper()
+        return table.loc[symbol] if symbol in table.index else None
+
+    def select(self, symbols=None):
+        """Rows for some coins (all coins when symbols is None)"""
+        table = self.table
+        if symbols is None:
+            return table
+        return table[table.index.isin([symbol.upper() for symbol in symbols])]
+
+    def rank(self, by="market_cap", ascending=False, symbols=None):
+        """Rank coins by a column (1 = best), ties share the lower rank"""
+        return self.select(symbols)[by].rank(ascending=ascending, method="min", na_option="bottom")
+
+    def filter(self, symbols=None, min_market_cap=None, min_volume=None,
+               min_change_24h=None, max_change_24h=None, tag=None):
+        """Rows matching every given condition, evaluated as whole-column masks"""
+        table = self.select(symbols)
+        mask = np.ones(len(table), dtype=bool)
+        if min_market_cap is not None:
+            mask &= table["market_cap"].to_numpy() >= min_market_cap
+        if min_volume is not None:
+            mask &= table["volume_24h"].to_numpy() >= min_volume
+        if min_change_24h is not None:
+            mask &= table["percent_change_24h"].to_numpy() >= min_change_24h
+        if max_change_24h is not None:
+            mask &= table["percent_change_24h"].to_numpy() <= max_change_24h
+        if tag:
+            mask &= table["tags"].str.contains(tag, case=False, regex=False).to_numpy()
+        return table[mask]
+
+    def sort(self, by="market_cap", ascending=False, limit=None, **filters):
+        """Filtered rows sorted by a column (missing values last)"""
+        table = self.filter(**filters).sort_values(by, ascending=ascending, na_position="last")
+        return table if limit is None else table.head(limit)
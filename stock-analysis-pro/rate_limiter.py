@@ -0,0 +1,68 @@
+"""
+Rate limiter
+Token bucket that paces API calls to a provider's per-minute limit
+"""
+
+import multiprocessing
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate_per_minute` tokens refill continuously up to `burst`"""
+
+    def __init__(self, rate_per_minute, burst=1, clock=time.monotonic, sleep=time.sleep):
+        """Initialize a full bucket"""
+        self.rate = rate_per_minute / 60.0
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.waits = 0
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1, timeout=None):
+        """Take tokens, blocking until they are available; returns False on timeout"""
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            with self._lock:
+                now = self._clock()
+                self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return True
+                wait = (tokens - self.tokens) / self.rate
+                self.waits += 1
+
+            if deadline is not None and now + wait > deadline:
+                return False
+            self._sleep(wait)
+
+    def get_stats(self):
+        """Get the available tokens and how often callers had to wait"""
+        with self._lock:
+            return {"tokens": self.tokens, "burst": self.burst,
+                    "rate_per_minute": self.rate * 60, "waits": self.waits}
+
+
+class SharedRateLimiter:
+    """Evenly spaced calls across processes; the schedule lives in shared memory"""
+
+    def __init__(self, rate_per_minute, clock=time.time, sleep=time.sleep):
+        """Initialize a limiter (create it before starting worker processes)"""
+        self.interval = 60.0 / rate_per_minute
+        self._clock = clock
+        self._sleep = sleep
+        self._next_slot = multiprocessing.Value("d", 0.0)
+
+    def acquire(self):
+        """Reserve the next free slot and wait for it"""
+        with self._next_slot.get_lock():
+            now = self._clock()
+            slot = max(self._next_slot.value, now)
+            self._next_slot.value = slot + self.interval
+        if slot > now:
+            self._sleep(slot - now)
+        return True
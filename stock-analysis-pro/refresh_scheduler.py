@@ -0,0 +1,141 @@
+"""
+Refresh scheduler
+Background thread that keeps quotes for watched symbols fresh in the shared cache
+"""
+
+import threading
+import time
+from datetime import datetime
+
+import crypto_analyzer
+import stock_analyzer
+from cache import shared_resource
+from profiling import get_logger
+
+
+def is_rate_limited(error):
+    """Check whether an upstream error is a rate limit response"""
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    return "RateLimit" in type(error).__name__
+
+
+class RefreshScheduler:
+    """Refreshes watched stock and crypto symbols on the configured interval"""
+
+    KINDS = ("stock", "crypto")
+
+    def __init__(self, config, stock_analyzer_instance, crypto_analyzer_instance):
+        """Initialize scheduler with configuration and the analyzers used for refreshing"""
+        self.intervals = {
+            "stock": config.app_settings['default_refresh_interval'],
+            "crypto": config.app_settings['crypto_refresh_interval'],
+        }
+        self.max_backoff = config.fetch_settings['max_backoff_seconds']
+        # Open sessions re-register every poll, so only closed sessions' symbols expire
+        self.watch_ttl = max(config.app_settings['default_refresh_interval'] * 6, 60)
+        self.refreshers = {
+            "stock": stock_analyzer_instance.refresh_quotes,
+            "crypto": crypto_analyzer_instance.refresh_quotes,
+        }
+        self.logger = get_logger()
+        self._lock = threading.Lock()
+        self._watched = {kind: {} for kind in self.KINDS}
+        self._last_refresh = {}
+        self._failures = {kind: 0 for kind in self.KINDS}
+        self._next_run = {kind: 0.0 for kind in self.KINDS}
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def shared(cls, config):
+        """Get the process-wide scheduler (one background thread for all sessions)"""
+        return shared_resource("refresh_scheduler", lambda: cls(
+            config, stock_analyzer.StockAnalyzer(config), crypto_analyzer.CryptoAnalyzer(config)))
+
+    def watch(self, kind, symbol):
+        """Register a symbol as currently viewed and make sure the thread is running"""
+        with self._lock:
+            self._watched[kind][symbol.upper()] = time.monotonic()
+        self.start()
+
+    def last_refreshed(self, kind, symbol):
+        """When the scheduler last pushed data for a symbol (None if never)"""
+        with self._lock:
+            return self._last_refresh.get((kind, symbol.upper()))
+
+    def start(self):
+        """Start the background thread if it isn't running"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="refresh-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def tick(self, now=None):
+        """Refresh every kind whose next run is due"""
+        now = time.monotonic() if now is None else now
+        for kind in self.KINDS:
+            if now < self._next_run[kind]:
+                continue
+            symbols = self._active_symbols(kind, now)
+            if not symbols:
+                self._next_run[kind] = now + self.intervals[kind]
+                continue
+            self._next_run[kind] = now + self._refresh(kind, symbols)
+
+    def _refresh(self, kind, symbols):
+        """Refresh one kind in a single batched call and return the delay until the next run"""
+        interval = self.intervals[kind]
+        try:
+            refreshed = self.refreshers[kind](symbols)
+        except Exception as e:
+            if not is_rate_limited(e):
+                self.logger.warning("refresh %s failed: %s", kind, e)
+                return interval
+            return self._back_off(kind, "rate limited")
+
+        refreshed_at = datetime.now()
+        with self._lock:
+            for symbol in refreshed:
+                self._last_refresh[(kind, symbol.upper())] = refreshed_at
+
+        # yf.download swallows per-ticker errors (rate limits included), so watched
+        # symbols missing from the result are the only sign of throttling
+        missing = {s.upper() for s in symbols} - {s.upper() for s in refreshed}
+        if missing:
+            return self._back_off(kind, f"missing {len(missing)} of {len(symbols)} symbols")
+        self._failures[kind] = 0
+        return interval
+
+    def _back_off(self, kind, reason):
+        """Record a failed refresh and return the exponential backoff delay"""
+        self._failures[kind] += 1
+        delay = min(self.intervals[kind] * 2 ** self._failures[kind], self.max_backoff)
+        self.logger.warning("refresh %s %s, backing off %ss", kind, reason, delay)
+        return delay
+
+    def _active_symbols(self, kind, now):
+        """Symbols viewed within the watch TTL (expired ones are dropped)"""
+        with self._lock:
+            watched = self._watched[kind]
+            for symbol in [s for s, seen in watched.items() if now - seen > self.watch_ttl]:
+                del watched[symbol]
+            return sorted(watched)
+
+    def _run(self):
+        """Background loop"""
+        while not self._stop.wait(1.0):
+            try:
+                self.tick()
+            except Exception as e:
+                self.logger.warning("refresh scheduler error: %s", e)
@@ -0,0 +1,275 @@
+"""
+Offline replay
+Recorded yfinance and CoinMarketCap responses served locally, with configurable latency
+
+Usage:
+    python replay.py record --stocks AAPL MSFT --crypto BTC ETH
+    python replay.py generate --stocks AAPL MSFT --crypto BTC ETH
+"""
+
+import argparse
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import requests
+import yfinance as yf
+from yfinance.exceptions import YFTickerMissingError
+
+from history_store import slice_period
+from rate_limiter import TokenBucket
+from synthetic_history import generate_ohlcv
+
+
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class FixtureStore:
+    """Recorded responses on disk: stock histories (Parquet), .info and CMC quotes (JSON)"""
+
+    def __init__(self, base_dir=DEFAULT_FIXTURE_DIR):
+        """Initialize store rooted at a directory"""
+        self.base_dir = base_dir
+        self._histories = {}
+
+    def has_recordings(self):
+        """Check whether any stock fixture has been recorded"""
+        return bool(self.stock_symbols())
+
+    def stock_symbols(self):
+        """Symbols with a recorded history"""
+        stock_dir = os.path.join(self.base_dir, "stocks")
+        if not os.path.isdir(stock_dir):
+            return []
+        return sorted(name[:-len("_history.parquet")] for name in os.listdir(stock_dir)
+                      if name.endswith("_history.parquet"))
+
+    def load_history(self, symbol):
+        """Recorded daily history, shifted so its last bar falls in the current week"""
+        symbol = symbol.upper()
+        if symbol not in self._histories:
+            path = self._path("stocks", f"{symbol}_history.parquet")
+            data = pd.read_parquet(path) if os.path.exists(path) else None
+            if data is not None and not data.empty:
+                # Whole weeks keep bars on the weekdays they were recorded on
+                now = pd.Timestamp.now(tz=data.index.tz)
+                weeks = (now.normalize() - data.index[-1].normalize()).days // 7
+                data.index = data.index + pd.Timedelta(weeks=weeks)
+            self._histories[symbol] = data
+        return self._histories[symbol]
+
+    def load_info(self, symbol):
+        """Recorded .info payload (empty dict if none)"""
+        return self._read_json(self._path("stocks", f"{symbol.upper()}_info.json"), {})
+
+    def load_quotes(self):
+        """Recorded CoinMarketCap quotes keyed by symbol"""
+        return self._read_json(self._path("crypto", "quotes.json"), {})
+
+    def save_history(self, symbol, data):
+        """Store a daily history"""
+        self._histories.pop(symbol.upper(), None)
+        data.to_parquet(self._path("stocks", f"{symbol.upper()}_history.parquet", create=True))
+
+    def save_info(self, symbol, info):
+        """Store a .info payload"""
+        self._write_json(self._path("stocks", f"{symbol.upper()}_info.json", create=True), info)
+
+    def save_quotes(self, quotes):
+        """Merge quotes into the recorded quote set"""
+        recorded = self.load_quotes()
+        recorded.update({symbol.upper(): quote for symbol, quote in quotes.items()})
+        self._write_json(self._path("crypto", "quotes.json", create=True), recorded)
+
+    def _path(self, kind, name, create=False):
+        """Path of a fixture file"""
+        directory = os.path.join(self.base_dir, kind)
+        if create:
+            os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, name)
+
+    def _read_json(self, path, default):
+        """Read a JSON fixture"""
+        if not os.path.exists(path):
+            return default
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_json(self, path, value):
+        """Write a JSON fixture"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(value, f, indent=1, default=str)
+
+
+class ReplayTicker:
+    """Stand-in for yf.Ticker serving recorded daily histories and .info"""
+
+    def __init__(self, store, symbol, latency=0.0):
+        """Initialize for one symbol"""
+        self.store = store
+        self.ticker = symbol.upper()
+        self.latency = latency
+
+    @property
+    def info(self):
+        time.sleep(self.latency)
+        return dict(self.store.load_info(self.ticker))
+
+    def history(self, period="1mo", interval="1d", start=None, end=None,
+                raise_errors=False, **kwargs):
+        """Recorded history for a period or from a start date (daily bars only)"""
+        time.sleep(self.latency)
+        data = self.store.load_history(self.ticker)
+        if data is None and raise_errors:
+            raise YFTickerMissingError(self.ticker, "no recorded history")
+        if data is None or interval != "1d":
+            return pd.DataFrame()
+        if start is not None:
+            start = pd.Timestamp(start)
+            if start.tz is None and data.index.tz is not None:
+                start = start.tz_localize(data.index.tz)
+            return data.iloc[data.index.searchsorted(start):].copy()
+        return slice_period(data, period).copy()
+
+
+def replay_download(store, latency=0.0):
+    """Stand-in for yf.download returning a ticker-grouped frame"""
+    def download(tickers, period="1mo", interval="1d", start=None, **kwargs):
+        time.sleep(latency)
+        symbols = tickers.split() if isinstance(tickers, str) else list(tickers)
+        frames = {symbol: ReplayTicker(store, symbol).history(period, interval, start)
+                  for symbol in symbols}
+        frames = {symbol: frame for symbol, frame in frames.items() if not frame.empty}
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
+    return download
+
+
+class ReplayResponse:
+    """Minimal requests.Response stand-in"""
+
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} replay error", response=self)
+
+
+class ReplaySession:
+    """Stand-in for the CoinMarketCap requests.Session serving recorded quotes"""
+
+    def __init__(self, store, latency=0.0):
+        """Initialize with a fixture store"""
+        self.store = store
+        self.latency = latency
+        self.headers = {}
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        """Answer quotes/latest from the recorded quotes"""
+        time.sleep(self.latency)
+        self.calls += 1
+        quotes = self.store.load_quotes()
+        symbols = [s.upper() for s in (params or {}).get("symbol", "").split(",") if s]
+        data = {symbol: quotes[symbol] for symbol in symbols if symbol in quotes}
+        if len(data) < len(symbols) and (params or {}).get("skip_invalid") != "true":
+            return ReplayResponse(400, {"status": {"error_code": 400,
+                                                   "error_message": "Invalid value for \"symbol\""}})
+        return ReplayResponse(200, {"data": data})
+
+
+@contextmanager
+def replay(store=None, latency=0.0, crypto_analyzers=()):
+    """Serve yfinance and CoinMarketCap from fixtures inside the block"""
+    store = store or FixtureStore()
+    original_ticker, original_download = yf.Ticker, yf.download
+    original_crypto = [(analyzer, analyzer.session, analyzer.rate_limiter)
+                       for analyzer in crypto_analyzers]
+    yf.Ticker = lambda symbol, *args, **kwargs: ReplayTicker(store, symbol, latency)
+    yf.download = replay_download(store, latency)
+    for analyzer in crypto_analyzers:
+        analyzer.session = ReplaySession(store, latency)
+        # Replayed calls cost no credits
+        analyzer.rate_limiter = TokenBucket(rate_per_minute=1e9, burst=1e6)
+    try:
+        yield store
+    finally:
+        yf.Ticker, yf.download = original_ticker, original_download
+        for analyzer, session, rate_limiter in original_crypto:
+            analyzer.session, analyzer.rate_limiter = session, rate_limiter
+
+
+def record(store, stocks=(), crypto=(), api_key=None):
+    """Capture live yfinance and CoinMarketCap responses into the fixture store"""
+    for symbol in stocks:
+        ticker = yf.Ticker(symbol)
+        store.save_history(symbol, ticker.history(period="max", actions=True))
+        store.save_info(symbol, ticker.info)
+    if crypto:
+        response = requests.get(
+            "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest",
+            headers={"X-CMC_PRO_API_KEY": api_key or ""},
+            params={"symbol": ",".join(s.upper() for s in crypto), "skip_invalid": "true"},
+            timeout=10)
+        response.raise_for_status()
+        store.save_quotes(response.json().get("data", {}))
+
+
+def generate(store, stocks=(), crypto=(), days=10000):
+    """Write seeded synthetic fixtures in the recorded format (for offline benchmarks)"""
+    for symbol in stocks:
+        data = generate_ohlcv(symbol, 150.0, days)
+        data.index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=days,
+                                    tz="America/New_York", name="Date")
+        data["Dividends"] = 0.0
+        data["Stock Splits"] = 0.0
+        store.save_history(symbol, data)
+        close = data["Close"]
+        store.save_info(symbol, {
+            "symbol": symbol, "longName": f"{symbol} Holdings", "currentPrice": float(close.iloc[-1]),
+            "regularMarketPrice": float(close.iloc[-1]), "previousClose": float(close.iloc[-2]),
+            "marketCap": float(close.iloc[-1]) * 1e9, "trailingPE": 25.0, "beta": 1.1,
+            "fiftyTwoWeekHigh": float(close.iloc[-252:].max()),
+            "fiftyTwoWeekLow": float(close.iloc[-252:].min()),
+            "sector": "Technology", "industry": "Software", "city": "Austin", "country": "USA",
+            "longBusinessSummary": f"{symbol} is a synthetic fixture company."})
+    store.save_quotes({symbol.upper(): {
+        "symbol": symbol.upper(), "name": symbol.title(), "cmc_rank": rank + 1,
+        "circulating_supply": 1e7, "total_supply": 2e7, "max_supply": None,
+        "date_added": "2013-04-28T00:00:00.000Z", "tags": ["mineable"],
+        "quote": {"USD": {"price": 1000.0 / (rank + 1), "volume_24h": 1e9 / (rank + 1),
+                          "market_cap": 1e11 / (rank + 1), "percent_change_1h": 0.1,
+                          "percent_change_24h": 1.5, "percent_change_7d": -2.0,
+                          "percent_change_30d": 5.0,
+                          "last_updated": "2024-01-01T00:00:00.000Z"}},
+    } for rank, symbol in enumerate(crypto)})
+
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Record or generate replay fixtures")
+    parser.add_argument("action", choices=["record", "generate"])
+    parser.add_argument("--stocks", nargs="*", default=[], help="stock symbols")
+    parser.add_argument("--crypto", nargs="*", default=[], help="crypto symbols")
+    parser.add_argument("--dir", default=DEFAULT_FIXTURE_DIR, help="fixture directory")
+    args = parser.parse_args(argv)
+
+    store = FixtureStore(args.dir)
+    if args.action == "record":
+        import config
+        record(store, args.stocks, args.crypto, config.Config().api_keys.get('coinmarketcap'))
+    else:
+        generate(store, args.stocks, args.crypto)
+    print(f"Fixtures written to {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
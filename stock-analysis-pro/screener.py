@@ -0,0 +1,60 @@
+"""
+Screener
+Cross-sectional performance metrics over a wide Close-price panel (dates x symbols)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+PERFORMANCE_PERIODS = {"1 Day": 1, "1 Week": 5,
+                       "1 Month": 20, "3 Months": 60, "1 Year": 252}
+
+TRADING_DAYS = 252
+
+
+def build_close_panel(histories):
+    """Align a dict of symbol -> history frame into one Close-price panel"""
+    closes = {symbol: hist['Close'] for symbol, hist in (histories or {}).items()
+              if hist is not None and not hist.empty}
+    if not closes:
+        return pd.DataFrame()
+    return pd.concat(closes, axis=1).sort_index()
+
+
+def compute_performance_panel(panel, window=TRADING_DAYS):
+    """Compute period returns, volatility and drawdown for every symbol in one NumPy pass"""
+    if panel is None or panel.empty:
+        return pd.DataFrame()
+
+    # Carry the last traded price over days a symbol didn't trade
+    prices = panel.ffill().to_numpy(dtype="float64")
+    rows = len(prices)
+    last = prices[-1]
+    results = {}
+
+    for period_name, days in PERFORMANCE_PERIODS.items():
+        if rows > days:
+            start = prices[-days - 1]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                results[period_name] = (last - start) / start * 100
+        else:
+            results[period_name] = np.full(prices.shape[1], np.nan)
+
+    recent = prices[-(window + 1):]
+    has_data = np.isfinite(recent).sum(axis=0) > 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_returns = np.diff(np.log(recent), axis=0)
+        counts = np.isfinite(log_returns).sum(axis=0)
+        mean = np.nansum(log_returns, axis=0) / counts
+        variance = np.nansum((log_returns - mean) ** 2, axis=0) / (counts - 1)
+        volatility = np.sqrt(variance * TRADING_DAYS) * 100
+
+        running_max = np.fmax.accumulate(recent, axis=0)
+        drawdown = np.nan_to_num(recent / running_max - 1, nan=0.0)
+    max_drawdown = drawdown.min(axis=0) * 100
+
+    results["Volatility"] = np.where(counts > 1, volatility, np.nan)
+    results["Max Drawdown"] = np.where(has_data, max_drawdown, np.nan)
+
+    return pd.DataFrame(results, index=panel.columns)
@@ -4,52 +4,259 @@ Handles stock analysis logic and data processing
 
 """
 
+import time
+import warnings
 import yfinance as yf
+from yfinance.exceptions import YFTickerMissingError
 import pandas as pd
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import requests
 
+import charts
+from cache import DataCache, shared_resource
+from history_store import HistoryStore, adjustment_changed, period_start, slice_period, tail_start
+from symbol_registry import SymbolRegistry
+from indicators import IndicatorEngine, PRICE_OVERLAYS
+from screener import PERFORMANCE_PERIODS, build_close_panel, compute_performance_panel
+from portfolio import compute_portfolio
+from history_stats import compute_history_stats
+from downsampling import downsample_chart_data, max_bars_for_width
+from profiling import Profiler, timed
+from figure_cache import FigureCache, data_fingerprint
+from intraday import BarRingBuffer, INTERVAL_SECONDS
+from compact_history import CompactHistory
+
 
 class StockAnalyzer:
     """Stock analyzer for data processing and analysis logic"""
 
-    def __init__(self, config):
+    def __init__(self, config, profiler=None, cache=None):
         """Initialize analyzer with configuration"""
         self.config = config
-        self.cache = {}
-        self.cache_expiry = {}
+        self.profiler = profiler or Profiler(level="off")
+        # Process-wide by default, so every Streamlit session shares fetched data
+        self.cache = cache if cache is not None else DataCache.shared(config)
+        self.history_store = shared_resource(
+            "history_store", lambda: HistoryStore.from_config(config))
+        self.symbol_registry = shared_resource(
+            "symbol_registry", lambda: SymbolRegistry.from_config(config))
+        self.indicator_engine = shared_resource(
+            "indicator_engine", lambda: IndicatorEngine.from_config(config))
+        self.figure_cache = FigureCache.shared(config)
+        # Optional pacing for upstream requests (the batch report shares one across workers)
+        self.rate_limiter = None
 
     def validate_stock_symbol(self, symbol):
         """Validate if a stock symbol exists"""
         try:
             if not symbol or len(symbol.strip()) == 0:
                 return False
-            stock = yf.Ticker(symbol)
-            info = stock.info
-            if info and (info.get('regularMarketPrice') or info.get('currentPrice') or
-                         info.get('previousClose') or info.get('longName')):
+            symbol = symbol.strip().upper()
+            known = self.symbol_registry.lookup(symbol)
+            if known is not None:
+                return known
+
+            # History is needed for the page anyway and is more reliable than .info;
+            # this coalesces with the page's own history fetch
+            hist = self.get_history(symbol, "1y")
+            if hist is not None and not hist.empty:
+                self.symbol_registry.record(symbol, True)
                 return True
+
+            # Empty may also mean throttling or a network error, which must not
+            # reject a real ticker for every session until the negative TTL runs out
+            if self._is_missing_upstream(symbol):
+                self.symbol_registry.record(symbol, False)
             return False
-        except:
+        except Exception:
             return False
 
-    def get_stock_data(self, symbol, period="1y"):
-        """Fetch stock data with caching"""
+    def _is_missing_upstream(self, symbol):
+        """Check whether yfinance definitively reports a symbol as not found"""
         try:
-            cache_key = f"{symbol}_{period}"
-            if self._is_cache_valid(cache_key):
-                return self.cache[cache_key]
-
-            stock = yf.Ticker(symbol)
-            hist = stock.history(period=period)
-            info = stock.info
+            with warnings.catch_warnings():
+                # raise_errors is deprecated in newer yfinance but still honoured
+                warnings.simplefilter("ignore", DeprecationWarning)
+                yf.Ticker(symbol).history(period="1y", raise_errors=True)
+        except YFTickerMissingError:
+            return True
+        except Exception:
+            return False
+        return False
 
-            self._cache_data(cache_key, (hist, info))
+    def get_stock_data(self, symbol, period="1y", interval="1d"):
+        """Fetch stock data with caching"""
+        try:
+            if interval == "1d":
+                hist = self.get_history(symbol, period)
+            else:
+                hist = self.get_intraday(symbol, interval, period)
+            info = self.get_stock_info(symbol)
             return hist, info
         except Exception:
             return None, None
 
+    def get_history(self, symbol, period="1y"):
+        """Get price history for a period as a slice of the cached base history"""
+        cache_key = f"{symbol}_history"
+        base_period = self.config.chart_settings['history_period']
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            cached_period, hist = cached
+            if self._period_covers(cached_period, period):
+                return self._slice_history(hist, period)
+
+        # Fetch the longest history needed once, shorter periods are views of it
+        if not self._period_covers(base_period, period):
+            base_period = period
+        def fetch():
+            hist = self._load_history(yf.Ticker(symbol), symbol, base_period)
+            return None if hist is None else (base_period, self._pack_history(hist))
+
+        # Concurrent misses for the same symbol wait on a single upstream fetch
+        fetched = self.cache.coalesce(cache_key, fetch,
+                                      flight_key=f"{cache_key}:{base_period}")
+        if fetched is None:
+            return None
+        return self._slice_history(fetched[1], period)
+
+    def get_intraday(self, symbol, interval="5m", period="1d"):
+        """Get intraday bars from a ring buffer that only fetches bars newer than its last one"""
+        if interval not in INTERVAL_SECONDS:
+            raise ValueError(f"Unsupported intraday interval: {interval}")
+        cache_key = f"{symbol}_intraday_{interval}"
+        expiry = self.config.fetch_settings['intraday_expiry_minutes']
+        buffer = self._cache_get(cache_key)
+
+        if buffer is None or not self._period_covers(buffer.period, period):
+            def fetch():
+                hist = yf.Ticker(symbol).history(period=period, interval=interval)
+                if hist is None or hist.empty:
+                    return None
+                buffer = BarRingBuffer(self.config.fetch_settings['intraday_capacity'])
+                buffer.load(hist)
+                buffer.period = period
+                buffer.fetched_at = time.monotonic()
+                return buffer
+
+            buffer = self.cache.coalesce(cache_key, fetch, expiry_minutes=expiry,
+                                         flight_key=f"{cache_key}:{period}")
+        elif time.monotonic() - buffer.fetched_at >= INTERVAL_SECONDS[interval]:
+            def fetch_tail():
+                # Refetch from the last bar, it may have been partial
+                tail = yf.Ticker(symbol).history(start=buffer.last_timestamp, interval=interval)
+                buffer.extend(tail)
+                buffer.fetched_at = time.monotonic()
+                return buffer
+
+            buffer = self.cache.coalesce(cache_key, fetch_tail, expiry_minutes=expiry,
+                                         flight_key=f"{cache_key}:tail")
+
+        if buffer is None:
+            return None
+        # Windows end at the newest bar's session, so a closed market still shows its last day
+        bars = buffer.to_frame()
+        return slice_period(bars, period, now=bars.index[-1].normalize() + pd.Timedelta(days=1))
+
+    def get_stock_info(self, symbol):
+        """Get company/quote info with caching"""
+        cache_key = f"{symbol}_info"
+        info = self._cache_get(cache_key)
+        if info is None:
+            if self._info_missing(symbol):
+                return None
+            try:
+                info = self.cache.coalesce(cache_key, lambda: self._fetch_info(symbol) or None)
+            except Exception as e:
+                print(f"Error fetching info for {symbol}: {e}")
+                info = None
+            if not info:
+                # Not retried on every rerun (or live tick) until the cache expiry passes
+                self._mark_info_missing(symbol)
+                return None
+        return info
+
+    def get_history_stats(self, symbol):
+        """Get price, 52W range, volume averages, volatility and beta derived from cached history"""
+        try:
+            hist = self.get_history(symbol, "1y")
+        except Exception:
+            return {}
+        if hist is None or hist.empty:
+            return {}
+
+        # Recomputed only when the history changes (e.g. the scheduler merged new bars)
+        cache_key = f"{symbol}_stats"
+        fingerprint = data_fingerprint(hist)
+        cached = self._cache_get(cache_key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        benchmark = None
+        benchmark_symbol = self.config.portfolio_settings['benchmark']
+        if symbol != benchmark_symbol:
+            try:
+                benchmark = self.get_history(benchmark_symbol, "1y")
+            except Exception:
+                benchmark = None
+        stats = compute_history_stats(hist, benchmark)
+        self.cache.set(cache_key, (fingerprint, stats))
+        return stats
+
+    def get_many(self, symbols, period="1y", include_info=False):
+        """Fetch histories for many symbols with one multi-ticker download per batch"""
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+        base_period = self.config.chart_settings['history_period']
+        if not self._period_covers(base_period, period):
+            base_period = period
+
+        results = {}
+        missing = []
+        for symbol in symbols:
+            cached = self._cache_get(f"{symbol}_history")
+            if cached is not None and self._period_covers(cached[0], period):
+                results[symbol] = self._slice_history(cached[1], period)
+            else:
+                missing.append(symbol)
+
+        for symbol, hist in self._load_many_histories(missing, base_period).items():
+            self.cache.set(f"{symbol}_history", (base_period, self._pack_history(hist)))
+            results[symbol] = slice_period(hist, period)
+
+        if include_info:
+            self.get_many_info(symbols)
+        return results
+
+    def get_many_info(self, symbols):
+        """Fetch .info for many symbols on a bounded thread pool"""
+        infos = {}
+        missing = []
+        for symbol in symbols:
+            info = self._cache_get(f"{symbol}_info")
+            if info is not None:
+                infos[symbol] = info
+            elif not self._info_missing(symbol):
+                missing.append(symbol)
+
+        def fetch_info(symbol):
+            try:
+                self._throttle()
+                return symbol, yf.Ticker(symbol).info
+            except Exception:
+                return symbol, None
+
+        if missing:
+            max_workers = min(self.config.fetch_settings['max_workers'], len(missing))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for symbol, info in executor.map(fetch_info, missing):
+                    if info:
+                        self.cache.set(f"{symbol}_info", info)
+                        infos[symbol] = info
+                    else:
+                        self._mark_info_missing(symbol)
+        return infos
+
     def calculate_price_change(self, current_price, previous_price):
         """Calculate price change and percentage"""
         if previous_price == 0:
@@ -58,80 +265,59 @@ class StockAnalyzer:
         pct_change = (change / previous_price) * 100
         return change, pct_change
 
-    def create_price_chart(self, data, symbol, period):
-        """Create interactive price chart"""
-        if data is None or data.empty:
-            return None
-        print(f"Creating price chart for {symbol} with period {period}")
-        print(f"Data: {data}")
-        fig = go.Figure()
-        fig.add_trace(go.Candlestick(
-            x=data.index,
-            open=data['Open'],
-            high=data['High'],
-            low=data['Low'],
-            close=data['Close'],
-            name=symbol,
-            increasing_line_color=self.config.chart_settings['colors']['positive'],
-            decreasing_line_color=self.config.chart_settings['colors']['negative'],
-            increasing_fillcolor="rgba(16, 185, 129, 0.3)",
-            decreasing_fillcolor="rgba(239, 68, 68, 0.3)",
-        ))
-
-        fig.update_layout(
-            title=f'{symbol} Stock Price',
-            yaxis_title='Price (USD)',
-            xaxis_title='Date',
-            template='plotly_white',
-            height=500,
-            showlegend=False,
-            margin=dict(l=50, r=50, t=50, b=50),
-
-        )
-        fig.update_xaxes(
-            rangeslider_visible=False,
-            showgrid=True,
-            gridwidth=1,
-            gridcolor='rgba(128,128,128,0.2)'
-        )
-
-        # Configure y-axis
-        fig.update_yaxes(
-            showgrid=True,
-            gridwidth=1,
-            gridcolor='rgba(128,128,128,0.2)'
-        )
-
-        return fig
-
-    def create_volume_chart(self, data, symbol):
-        """Create volume chart"""
-        if data is None or data.empty:
+    @timed("indicators")
+    def get_indicators(self, symbol, hist_data, interval="1d"):
+        """Get technical indicators aligned to a history slice"""
+        if hist_data is None or hist_data.empty:
             return None
+        if interval == "1d":
+            # Compute over the cached base history so long windows are warmed up
+            cached = self._cache_get(f"{symbol}_history")
+            base = self._unpack_history(cached[1]) if cached is not None else hist_data
+            indicators = self.indicator_engine.get(symbol, base)
+        else:
+            # Over the whole ring buffer, so each new bar is an incremental update
+            buffer = self._cache_get(f"{symbol}_intraday_{interval}")
+            base = buffer.to_frame() if buffer is not None else hist_data
+            indicators = self.indicator_engine.get(f"{symbol}_{interval}", base)
+        indicators = indicators.iloc[indicators.index.searchsorted(hist_data.index[0]):]
+        if len(indicators) != len(hist_data) or not indicators.index.equals(hist_data.index):
+            indicators = indicators.reindex(hist_data.index)
+        return indicators
+
+    def prepare_chart_data(self, hist_data, indicators=None, interval="1d"):
+        """Downsample history to the chart's pixel budget, returning (data, indicators, bar label)"""
+        if interval != "1d":
+            # Intraday windows are bounded by the ring buffer, no resampling needed
+            return hist_data, indicators, interval
+        max_bars = max_bars_for_width(self.config.chart_settings['target_width_px'],
+                                      self.config.chart_settings['min_px_per_bar'])
+        return downsample_chart_data(hist_data, max_bars, indicators)
 
-        fig = go.Figure()
-        colors = [self.config.chart_settings['colors']['positive'] if close >= open_price
-                  else self.config.chart_settings['colors']['negative']
-                  for close, open_price in zip(data['Close'], data['Open'])]
-
-        fig.add_trace(go.Bar(
-            x=data.index,
-            y=data['Volume'],
-            marker_color=colors,
-            name='Volume',
-            opacity=0.7
-        ))
-
-        fig.update_layout(
-            title=f'{symbol} Trading Volume',
-            yaxis_title='Volume',
-            xaxis_title='Date',
-            template=self.config.chart_settings['theme'],
-            height=200,
-            showlegend=False,
-            margin=dict(l=50, r=50, t=30, b=30)
-        )
-        return fig
+    def get_chart_figures(self, symbol, hist_data, period, interval="1d"):
+        """Get (price/volume chart, bar label), reusing the figure while the data is unchanged"""
+        settings = self.config.chart_settings
+        key = ("stock", symbol, period, interval, data_fingerprint(hist_data), settings['theme'],
+               tuple(settings['overlays']), settings['target_width_px'], settings['min_px_per_bar'])
+
+        def build():
+            indicators = self.get_indicators(symbol, hist_data, interval)
+            chart_data, indicators, bar_label = self.prepare_chart_data(
+                hist_data, indicators, interval)
+            return self.create_chart(chart_data, symbol, period, indicators), bar_label
+
+        return self.figure_cache.get_or_build(key, build)
+
+    @timed("figure_build")
+    def create_chart(self, data, symbol, period, indicators=None):
+        """Create a single price and volume chart on a shared x-axis"""
+        return charts.create_price_volume_chart(
+            data, symbol, f'{symbol} Stock Price', self.config.chart_settings['colors'],
+            self.config.chart_settings['theme'], indicators, self._overlays())
+
+    def _overlays(self):
+        """Configured indicator overlays that belong on the price axis"""
+        return [name for name in self.config.chart_settings['overlays'] if name in PRICE_OVERLAYS]
 
     def format_large_number(self, num):
         """Format large numbers"""
@@ -146,24 +332,27 @@ class StockAnalyzer:
         else:
             return f"${num:.2f}"
 
-    def get_financial_metrics(self, stock_info, hist_data):
-        """Get formatted financial metrics"""
-        volume = hist_data['Volume'].iloc[-1] if not hist_data.empty else 0
-        avg_volume = hist_data['Volume'].rolling(
-            window=20).mean().iloc[-1] if len(hist_data) >= 20 else volume
-
-        print(f"stock_info: {stock_info}")
-        print(f"hist_data: {hist_data}")
+    def get_financial_metrics(self, stock_info, hist_data, stats=None):
+        """Get formatted financial metrics (history-derived where possible, .info for fundamentals)"""
+        stock_info = stock_info or {}
+        stats = stats or compute_history_stats(hist_data)
+        beta = stats.get('beta')
+        volatility_30d = stats.get('volatility_30d')
+        volatility_1y = stats.get('volatility_1y')
 
         return {
             "Market Cap": self.format_large_number(stock_info.get('marketCap', 0)) if stock_info.get('marketCap') else "N/A",
             "P/E Ratio": f"{stock_info.get('trailingPE', 0):.2f}" if isinstance(stock_info.get('trailingPE'), (int, float)) else "N/A",
-            "Volume": f"{volume:,.0f}",
-            "Avg Volume (20d)": f"{avg_volume:,.0f}",
-            "52W High": f"${stock_info.get('fiftyTwoWeekHigh', 'N/A')}",
-            "52W Low": f"${stock_info.get('fiftyTwoWeekLow', 'N/A')}",
-            "Beta": f"{stock_info.get('beta', 'N/A')}",
-            "Dividend Yield": f"{stock_info.get('dividendYield', 0):.2f}%" if stock_info.get('dividendYield') else "N/A"}
+            "Volume": f"{stats.get('volume', 0):,.0f}",
+            "Avg Volume (20d)": f"{stats.get('avg_volume_20d', 0):,.0f}",
+            "52W High": f"${stats['high_52w']:,.2f}" if stats else "N/A",
+            "52W Low": f"${stats['low_52w']:,.2f}" if stats else "N/A",
+            "Beta": f"{beta:.2f}" if beta is not None else f"{stock_info.get('beta', 'N/A')}",
+            "Dividend Yield": f"{stock_info.get('dividendYield', 0):.2f}%" if stock_info.get('dividendYield') else "N/A",
+            "Avg Volume (10d)": f"{stats.get('avg_volume_10d', 0):,.0f}",
+            "Avg Volume (3M)": f"{stats.get('avg_volume_3m', 0):,.0f}",
+            "Volatility (30d)": f"{volatility_30d:.1%}" if volatility_30d is not None else "N/A",
+            "Volatility (1Y)": f"{volatility_1y:.1%}" if volatility_1y is not None else "N/A"}
 
     def get_company_info(self, stock_info):
         """Get formatted company information"""
@@ -181,11 +370,9 @@ class StockAnalyzer:
         if len(hist_data) == 0:
             return {}
 
-        perf_periods = {"1 Day": 1, "1 Week": 5,
-                        "1 Month": 20, "3 Months": 60, "1 Year": 252}
         performance = {}
 
-        for period_name, days in perf_periods.items():
+        for period_name, days in PERFORMANCE_PERIODS.items():
             if len(hist_data) > days:
                 start_price = hist_data['Close'].iloc[-days-1]
                 end_price = hist_data['Close'].iloc[-1]
@@ -194,14 +381,251 @@ class StockAnalyzer:
                 performance[f"{color} {period_name}"] = f"{perf_change:+.2f}%"
         return performance
 
-    def _is_cache_valid(self, cache_key):
-        """Check if cached data is valid"""
-        if cache_key not in self.cache or cache_key not in self.cache_expiry:
-            return False
-        return datetime.now() < self.cache_expiry[cache_key]
+    def refresh_quotes(self, symbols):
+        """Fetch the latest bars for many symbols in one download and merge them into the cache"""
+        tails = self._download_many(list(symbols), period="5d", raise_errors=True)
+        for symbol, tail in tails.items():
+            self._merge_tail(symbol, tail)
+        return list(tails)
+
+    def get_close_panel(self, symbols, period="2y"):
+        """Get a wide Close-price panel (dates x symbols) for many symbols"""
+        return build_close_panel(self.get_many(symbols, period))
+
+    def screen(self, symbols, period="2y"):
+        """Compute returns, volatility and drawdown for many symbols at once"""
+        return compute_performance_panel(self.get_close_panel(symbols, period))
+
+    def analyze_portfolio(self, holdings, period="1y"):
+        """Compute value, covariance, beta and rolling Sharpe for a symbol -> shares dict"""
+        settings = self.config.portfolio_settings
+        holdings = {symbol.strip().upper(): shares for symbol, shares in holdings.items()
+                    if symbol and symbol.strip()}
+        if not holdings:
+            return None
+        benchmark = settings['benchmark']
+        panel = self.get_close_panel(list(holdings) + [benchmark], period)
+        return compute_portfolio(panel, holdings, benchmark,
+                                 settings['sharpe_window'], settings['risk_free_rate'])
+
+    @timed("fetch")
+    def _load_history(self, stock, symbol, period, interval="1d"):
+        """Read history from the local store, fetching only the missing tail"""
+        if self.history_store is None:
+            return stock.history(period=period, interval=interval)
+
+        stored = self.history_store.load(symbol, interval)
+        tz = stored.index.tz if stored is not None and not stored.empty else None
+        start = period_start(period, tz=tz)
+
+        if self.history_store.covers(stored, start):
+            age = self.history_store.age_seconds(symbol, interval)
+            max_age = self.config.cache_settings['expiry_minutes'] * 60
+            if age is None or age >= max_age:
+                try:
+                    # Refetch from the last stored bar, it may have been partial
+                    tail = stock.history(start=tail_start(stored), interval=interval, actions=True)
+                    if adjustment_changed(stored, tail):
+                        # Stored bars are on the old split/dividend basis, replace them all
+                        stored = self._refetch_history(stock, symbol, stored, interval)
+                    elif tail is not None and not tail.empty:
+                        stored = self.history_store.append(symbol, interval, tail)
+                except Exception as e:
+                    # Offline or throttled: serve the stored bars, the next miss retries
+                    print(f"Error refreshing history for {symbol}, serving stored bars: {e}")
+                    stored.attrs["stale"] = True
+            return slice_period(stored, period)
+
+        hist = stock.history(period=period, interval=interval)
+        if hist is not None and not hist.empty:
+            self.history_store.append(
+                symbol, interval, hist, full_history=period.lower() == "max")
+        return hist
+
+    def _refetch_history(self, stock, symbol, stored, interval="1d"):
+        """Replace a stored history with a fresh fetch over the same range"""
+        full_history = self.history_store.is_full_history(stored)
+        if full_history:
+            hist = stock.history(period="max", interval=interval, actions=True)
+        else:
+            hist = stock.history(start=stored.index[0].date(), interval=interval, actions=True)
+        if hist is None or hist.empty:
+            return stored
+        self._invalidate_derived(symbol, interval)
+        return self.history_store.save(symbol, interval, hist, full_history)
+
+    def _invalidate_derived(self, symbol, interval="1d"):
+        """Drop indicators and stats computed from a history that was re-adjusted"""
+        self.indicator_engine.invalidate(symbol)
+        self.indicator_engine.invalidate(f"{symbol}_{interval}")
+        self.cache.invalidate(f"{symbol}_stats")
+
+    def _load_many_histories(self, symbols, period, interval="1d"):
+        """Load histories for many symbols, batching all upstream requests"""
+        if not symbols:
+            return {}
+        if self.history_store is None:
+            return self._download_many(symbols, period=period, interval=interval)
+
+        histories = {}
+        stale = {}
+        absent = []
+        max_age = self.config.cache_settings['expiry_minutes'] * 60
+        for symbol in symbols:
+            stored = self.history_store.load(symbol, interval)
+            if stored is None or stored.empty or not self.history_store.covers(
+                    stored, period_start(period, tz=stored.index.tz)):
+                absent.append(symbol)
+                continue
+            age = self.history_store.age_seconds(symbol, interval)
+            if age is not None and age < max_age:
+                histories[symbol] = stored
+            else:
+                stale[symbol] = stored
+
+        if stale:
+            # One download from the oldest last bar refreshes every stale tail
+            start = min(tail_start(stored) for stored in stale.values())
+            tails = self._download_many(list(stale), start=start, interval=interval)
+            readjusted = []
+            for symbol, stored in stale.items():
+                tail = tails.get(symbol)
+                if adjustment_changed(stored, tail):
+                    readjusted.append(symbol)
+                elif tail is not None and not tail.empty:
+                    stored = self.history_store.append(symbol, interval, tail)
+                histories[symbol] = stored
+            if readjusted:
+                histories.update(self._refetch_many(
+                    {symbol: stale[symbol] for symbol in readjusted}, interval))
+
+        if absent:
+            for symbol, hist in self._download_many(absent, period=period, interval=interval).items():
+                histories[symbol] = self.history_store.append(
+                    symbol, interval, hist, full_history=period.lower() == "max")
+
+        return {symbol: slice_period(hist, period) for symbol, hist in histories.items()}
+
+    def _refetch_many(self, stored_histories, interval="1d"):
+        """Replace stored histories after a split or dividend, batching the downloads"""
+        full = [symbol for symbol, stored in stored_histories.items()
+                if self.history_store.is_full_history(stored)]
+        partial = [symbol for symbol in stored_histories if symbol not in full]
+        fresh = {}
+        if full:
+            fresh.update(self._download_many(full, period="max", interval=interval))
+        if partial:
+            start = min(stored_histories[symbol].index[0].date() for symbol in partial)
+            fresh.update(self._download_many(partial, start=start, interval=interval))
+
+        histories = {}
+        for symbol, stored in stored_histories.items():
+            hist = fresh.get(symbol)
+            if hist is None or hist.empty:
+                histories[symbol] = stored
+            else:
+                self._invalidate_derived(symbol, interval)
+                histories[symbol] = self.history_store.save(
+                    symbol, interval, hist, symbol in full)
+        return histories
+
+    @timed("fetch")
+    def _download_many(self, symbols, period=None, start=None, interval="1d", raise_errors=False):
+        """Download histories with yfinance's multi-ticker API, split per symbol"""
+        frames = {}
+        batch_size = self.config.fetch_settings['batch_size']
+        for i in range(0, len(symbols), batch_size):
+            batch = symbols[i:i + batch_size]
+            try:
+                self._throttle()
+                data = yf.download(batch, period=None if start else period, start=start,
+                                   interval=interval, group_by="ticker", actions=True,
+                                   auto_adjust=True, ignore_tz=False, threads=True,
+                                   progress=False)
+            except Exception as e:
+                if raise_errors:
+                    raise
+                print(f"Error downloading batch starting with {batch[0]}: {e}")
+                continue
+            if data is None or data.empty:
+                continue
+            for symbol in batch:
+                if symbol not in data.columns.get_level_values(0):
+                    continue
+                frame = data[symbol].dropna(subset=["Close"])
+                if not frame.empty:
+                    frame.columns.name = None
+                    frames[symbol] = frame
+        return frames
+
+    def _merge_tail(self, symbol, tail):
+        """Merge freshly downloaded bars into the cached history and quote"""
+        key = f"{symbol}_history"
+        cached = self.cache.get(key)
+        if cached is not None:
+            base_period, hist = cached
+            hist = self._unpack_history(hist)
+            if hist.index.tz is not None and tail.index.tz is not None and hist.index.tz != tail.index.tz:
+                tail = tail.tz_convert(hist.index.tz)
+            merged = pd.concat([hist, tail[hist.columns.intersection(tail.columns)]])
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            self.cache.set(key, (base_period, self._pack_history(merged)))
+
+        info = self.cache.get(f"{symbol}_info")
+        if info:
+            # Copy so sessions holding the old dict are not mutated mid-render
+            info = dict(info)
+            info['currentPrice'] = info['regularMarketPrice'] = float(tail['Close'].iloc[-1])
+            self.cache.set(f"{symbol}_info", info)
+
+    @timed("fetch")
+    def _fetch_info(self, symbol):
+        """Fetch .info from yfinance"""
+        return yf.Ticker(symbol).info
+
+    def _info_missing(self, symbol):
+        """Check whether .info recently failed or came back empty for a symbol"""
+        return self._cache_get(f"{symbol}_info_missing") is not None
+
+    def _mark_info_missing(self, symbol):
+        """Remember a failed or empty .info for the cache expiry"""
+        self.cache.set(f"{symbol}_info_missing", True,
+                       expiry_minutes=self.config.cache_settings['expiry_minutes'])
+
+    def _throttle(self):
+        """Wait for the rate limiter, if one is set"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+    @timed("cache_lookup")
+    def _cache_get(self, cache_key):
+        """Look up a cache entry"""
+        return self.cache.get(cache_key)
+
+    def _pack_history(self, hist):
+        """Convert a history frame to the cache's storage format"""
+        if self.config.cache_settings['compact_histories']:
+            return CompactHistory.from_frame(hist)
+        return hist
+
+    def _unpack_history(self, hist):
+        """Convert a cached history back to a pandas frame"""
+        return hist.to_frame() if isinstance(hist, CompactHistory) else hist
+
+    def _slice_history(self, hist, period):
+        """Slice a cached history to a period, converting only those rows"""
+        if isinstance(hist, CompactHistory):
+            return hist.slice_period(period)
+        return slice_period(hist, period)
+
+    def _period_covers(self, base_period, period):
+        """Check whether a base period includes every bar of another period"""
+        base_start = period_start(base_period)
+        if base_start is None:
+            return True
+        start = period_start(period)
+        return start is not None and base_start <= start
 
-    def _cache_data(self, cache_key, data):
-        """Cache data with expiry"""
-        self.cache[cache_key] = data
-        self.cache_expiry[cache_key] = datetime.now(
-        ) + timedelta(minutes=self.config.cache_settings['expiry_minutes'])
+    def get_cache_stats(self):
+        """Get cache hit/miss/eviction counters"""
+        return self.cache.get_stats()
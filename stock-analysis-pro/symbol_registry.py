@@ -0,0 +1,74 @@
+"""
+Symbol registry
+Caches symbol validation results and supports offline validation from a ticker list
+"""
+
+import csv
+import os
+
+from cache import DataCache
+
+
+class SymbolRegistry:
+    """Registry of known valid and invalid symbols with separate TTLs"""
+
+    def __init__(self, valid_ttl_minutes=1440, invalid_ttl_minutes=60,
+                 ticker_list_path=None, offline_only=False):
+        """Initialize registry, optionally preloading a local ticker list"""
+        self.valid_ttl_minutes = valid_ttl_minutes
+        self.invalid_ttl_minutes = invalid_ttl_minutes
+        self.offline_only = offline_only
+        self.known_symbols = set()
+        self._results = DataCache(max_size_mb=1, expiry_minutes=valid_ttl_minutes)
+
+        if ticker_list_path:
+            self.load_ticker_list(ticker_list_path)
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a registry from the application symbol settings"""
+        settings = config.symbol_settings
+        return cls(valid_ttl_minutes=settings['valid_ttl_minutes'],
+                   invalid_ttl_minutes=settings['invalid_ttl_minutes'],
+                   ticker_list_path=settings['ticker_list_path'],
+                   offline_only=settings['offline_only'])
+
+    def load_ticker_list(self, path):
+        """Load symbols from a text/CSV file (first column) and return how many were added"""
+        if not os.path.exists(path):
+            print(f"Ticker list not found: {path}")
+            return 0
+
+        before = len(self.known_symbols)
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.reader(f):
+                if not row:
+                    continue
+                symbol = row[0].strip().upper()
+                if symbol and symbol not in ("SYMBOL", "TICKER") and not symbol.startswith("#"):
+                    self.known_symbols.add(symbol)
+        return len(self.known_symbols) - before
+
+    def lookup(self, symbol):
+        """Return True/False for a known symbol, or None when it must be checked upstream"""
+        symbol = symbol.strip().upper()
+        if symbol in self.known_symbols:
+            return True
+
+        result = self._results.get(symbol)
+        if result is not None:
+            return result
+        if self.offline_only and self.known_symbols:
+            return False
+        return None
+
+    def record(self, symbol, is_valid):
+        """Remember a validation result for its TTL"""
+        ttl = self.valid_ttl_minutes if is_valid else self.invalid_ttl_minutes
+        self._results.set(symbol.strip().upper(), bool(is_valid), expiry_minutes=ttl)
+
+    def get_stats(self):
+        """Get registry counters"""
+        stats = self._results.get_stats()
+        stats["known_symbols"] = len(self.known_symbols)
+        return stats
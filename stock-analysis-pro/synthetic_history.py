@@ -0,0 +1,46 @@
+"""
+Synthetic history
+Seeded, vectorized OHLCV generator for coins without a historical data source
+"""
+
+import zlib
+
+import numpy as np
+import pandas as pd
+
+
+def symbol_seed(symbol):
+    """Stable per-symbol seed (Python's hash() changes on every restart)"""
+    return zlib.crc32(symbol.upper().encode("utf-8"))
+
+
+def generate_ohlcv(symbol, current_price, days, end=None):
+    """Generate `days` daily OHLCV bars ending near current_price in one NumPy pass"""
+    end = pd.Timestamp.now().normalize() if end is None else end
+    dates = pd.date_range(end=end, periods=days, freq='D')
+
+    # Row i always holds the draws for the bar i days back, so a longer
+    # history extends a shorter one instead of replacing it
+    draws = np.random.default_rng(symbol_seed(symbol)).random((days, 6))
+    daily, weekly, intraday, open_noise, close_noise, volume = draws.T
+
+    # Up to 5% daily moves plus a trend that holds for a week (as before)
+    weekly_trend = (weekly[np.arange(days) // 7] - 0.5) / 10
+    steps = 1 + (daily * 2 - 1) * 0.05 + weekly_trend
+    # Walk backwards from the current price, then flip to chronological order
+    base = np.maximum(current_price * np.cumprod(steps), 0.001)[::-1]
+
+    intraday_range = intraday[::-1] * 0.1
+    open_price = base * (1 + (open_noise[::-1] - 0.5) * 0.04)
+    close_price = base * (1 + (close_noise[::-1] - 0.5) * 0.04)
+    high_price = np.maximum(open_price, close_price) * (1 + intraday_range)
+    low_price = np.minimum(open_price, close_price) * (1 - intraday_range)
+
+    return pd.DataFrame({
+        'Open': np.maximum(open_price, 0.001),
+        'High': np.maximum(high_price, 0.001),
+        'Low': np.maximum(low_price, 0.001),
+        'Close': np.maximum(close_price, 0.001),
+        # 1M-11M volume
+        'Volume': 1_000_000 + (volume[::-1] * 10_000_000).astype('int64'),
+    }, index=dates)
@@ -0,0 +1,52 @@
+"""
+Quick test for the batch report runner
+"""
+
+import pandas as pd
+
+import batch_report
+import config
+import stock_analyzer
+from cache import DataCache
+
+
+class OfflineAnalyzer(stock_analyzer.StockAnalyzer):
+    """Analyzer serving canned data instead of calling yfinance"""
+
+    def __init__(self):
+        super().__init__(config.Config(), cache=DataCache(max_size_mb=10))
+        index = pd.date_range("2024-01-01", periods=300, freq="B")
+        close = pd.Series(range(100, 400), index=index, dtype="float64")
+        self.hist = pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1,
+                                  "Close": close, "Volume": 1e6})
+
+    def get_many(self, symbols, period="1y", include_info=False):
+        return {}
+
+    def get_history(self, symbol, period="1y"):
+        return self.hist
+
+    def get_stock_data(self, symbol, period="1y"):
+        if symbol == "BAD":
+            return None, None
+        hist = self.hist.iloc[-63:] if period == "3mo" else self.hist
+        return hist, {"longName": f"{symbol} Inc", "marketCap": 3e12, "sector": "Tech"}
+
+
+def test_build_rows():
+    """Each valid symbol becomes one row with the dashboard's metrics"""
+    rows, failed = batch_report.build_rows(OfflineAnalyzer(), ["AAPL", "BAD", "MSFT"], "3mo")
+    report = pd.DataFrame(rows)
+
+    assert failed == ["BAD"]
+    assert list(report["Symbol"]) == ["AAPL", "MSFT"]
+    assert report.loc[0, "Market Cap"] == "$3.0T"
+    # 52W values come from the one-year history even for a 3mo report
+    assert report.loc[0, "52W Low"] == "$147.00"
+    assert report.loc[0, "1 Day"] == "+0.25%"
+    assert report.loc[0, "Sector"] == "Tech"
+
+
+if __name__ == "__main__":
+    test_build_rows()
+    print("Batch report tests completed!")
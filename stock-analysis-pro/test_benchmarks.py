@@ -0,0 +1,142 @@
+"""
+Benchmarks for the analyzers over replayed fixtures
+
+Compare against the stored baseline in .benchmarks/:
+    python -m pytest test_benchmarks.py --benchmark-only --benchmark-compare=0001 \\
+        --benchmark-compare-fail=median:50%
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import config
+import crypto_analyzer
+import replay
+import stock_analyzer
+from cache import DataCache
+from indicators import compute_indicators
+
+
+STOCKS = ["AAPL", "MSFT", "NVDA", "TSLA", "AMZN", "GOOG", "META", "AMD"]
+CRYPTO = ["BTC", "ETH", "SOL", "XRP", "ADA"]
+
+
+@pytest.fixture(scope="module")
+def fixture_store(tmp_path_factory):
+    """Recorded fixtures when present, otherwise seeded synthetic ones"""
+    store = replay.FixtureStore()
+    if store.has_recordings():
+        return store
+    store = replay.FixtureStore(str(tmp_path_factory.mktemp("fixtures")))
+    replay.generate(store, STOCKS, CRYPTO)
+    return store
+
+
+@pytest.fixture
+def stock(fixture_store):
+    """Stock analyzer with a private cache and no on-disk store"""
+    analyzer = stock_analyzer.StockAnalyzer(config.Config(), cache=DataCache(max_size_mb=500))
+    analyzer.history_store = None
+    with replay.replay(fixture_store):
+        yield analyzer
+
+
+@pytest.fixture
+def crypto(fixture_store):
+    """Crypto analyzer with a private cache serving replayed quotes"""
+    config_manager = config.Config()
+    config_manager.api_keys['coinmarketcap'] = "replay-key"
+    analyzer = crypto_analyzer.CryptoAnalyzer(config_manager, cache=DataCache(max_size_mb=100))
+    with replay.replay(fixture_store, crypto_analyzers=[analyzer]):
+        yield analyzer
+
+
+def test_history_cache_miss(benchmark, stock):
+    """get_history when the cache is cold"""
+    hist = benchmark.pedantic(stock.get_history, args=("AAPL", "1y"),
+                              setup=stock.cache.clear, rounds=20)
+    assert len(hist) > 200
+
+
+def test_history_cache_hit(benchmark, stock):
+    """get_history served from the cached base history"""
+    stock.get_history("AAPL", "1y")
+    assert len(benchmark(stock.get_history, "AAPL", "1y")) > 200
+
+
+def test_get_many_cache_miss(benchmark, stock):
+    """Batched multi-symbol download into a cold cache"""
+    histories = benchmark.pedantic(stock.get_many, args=(STOCKS, "2y"),
+                                   setup=stock.cache.clear, rounds=10)
+    assert len(histories) == len(STOCKS)
+
+
+@pytest.mark.parametrize("period", ["1y", "10y", "max"])
+def test_chart_build(benchmark, stock, period):
+    """Indicators, downsampling and figure construction (figure cache bypassed)"""
+    hist = stock.get_history("AAPL", period)
+
+    def build():
+        indicators = stock.get_indicators("AAPL", hist)
+        chart_data, indicators, _ = stock.prepare_chart_data(hist, indicators)
+        return stock.create_chart(chart_data, "AAPL", period, indicators)
+
+    assert benchmark(build) is not None
+
+
+def test_compute_indicators(benchmark, stock):
+    """Full vectorized indicator pass over a MAX history"""
+    hist = stock.get_history("AAPL", "max")
+    assert len(benchmark(compute_indicators, hist)) == len(hist)
+
+
+def test_stock_metrics(benchmark, stock):
+    """Financial, performance and company metrics for one symbol"""
+    hist, info = stock.get_stock_data("AAPL", "1y")
+
+    def metrics():
+        return (stock.get_financial_metrics(info, hist),
+                stock.calculate_performance_metrics(hist),
+                stock.get_company_info(info))
+
+    financial, performance, company = benchmark(metrics)
+    assert financial["Market Cap"] != "N/A" and performance and company
+
+
+def test_screen(benchmark, stock):
+    """Cross-sectional performance panel for every fixture symbol"""
+    stock.get_many(STOCKS, "2y")
+    assert len(benchmark(stock.screen, STOCKS, "2y")) == len(STOCKS)
+
+
+def test_crypto_quote_cache_miss(benchmark, crypto):
+    """Batched quotes into a cold cache"""
+    quotes = benchmark.pedantic(crypto.get_many_quotes, args=(CRYPTO,),
+                                setup=crypto.cache.clear, rounds=20)
+    assert len(quotes) == len(CRYPTO)
+
+
+def test_crypto_quote_cache_hit(benchmark, crypto):
+    """Quote served from the cache"""
+    crypto.get_crypto_data("BTC")
+    assert benchmark(crypto.get_crypto_data, "BTC") is not None
+
+
+def test_crypto_history(benchmark, crypto):
+    """Synthetic two-year history generation"""
+    crypto.get_crypto_data("BTC")
+
+    def generate():
+        crypto.cache.invalidate("crypto_BTC_history_730")
+        return crypto.get_crypto_historical_data("BTC", days=730)
+
+    assert len(benchmark(generate)) == 730
+
+
+def test_crypto_watchlist(benchmark, crypto):
+    """Watchlist sorted and filtered over the quote snapshot"""
+    crypto.get_many_quotes(CRYPTO)
+    table = benchmark(crypto.get_watchlist, CRYPTO, sort_by="percent_change_24h",
+                      min_market_cap=1e9)
+    assert len(table) == len(CRYPTO)
@@ -0,0 +1,85 @@
+"""
+Quick test for the data cache
+"""
+
+import threading
+import time
+
+import pandas as pd
+
+from cache import DataCache, estimate_size
+
+
+def _frame(rows):
+    """Build a small OHLCV-like frame"""
+    return pd.DataFrame({"Close": range(rows), "Volume": range(rows)}, dtype="float64")
+
+
+def test_lru_eviction_by_size():
+    """Entries beyond the memory budget are evicted least recently used first"""
+    frame_size = estimate_size(_frame(1000))
+    cache = DataCache(max_size_mb=(frame_size * 2.5) / (1024 * 1024))
+
+    cache.set("A", _frame(1000))
+    cache.set("B", _frame(1000))
+    assert cache.get("A") is not None  # A becomes most recently used
+    cache.set("C", _frame(1000))
+
+    assert "A" in cache and "C" in cache
+    assert "B" not in cache
+    assert cache.get_stats()["evictions"] == 1
+    assert cache.current_bytes <= cache.max_bytes
+
+
+def test_expiry_and_counters():
+    """Expired entries count as misses and are dropped"""
+    cache = DataCache(max_size_mb=1, expiry_minutes=0)
+    cache.set("A", _frame(10))
+    assert cache.get("A") is None
+
+    cache.set("B", _frame(10), expiry_minutes=5)
+    assert cache.get("B") is not None
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["expirations"] == 1
+    assert stats["entries"] == 1
+
+
+def test_oversized_entry_is_not_stored():
+    """A single entry larger than the budget is rejected"""
+    cache = DataCache(max_size_mb=0.001)
+    assert cache.set("big", _frame(10000)) is False
+    assert len(cache) == 0
+    assert cache.current_bytes == 0
+
+
+def test_concurrent_misses_are_coalesced():
+    """Many threads missing the same key trigger a single fetch"""
+    cache = DataCache(max_size_mb=1)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return _frame(10)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("A", fetch)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 8 and all(result is results[0] for result in results)
+    assert "A" in cache
+
+
+if __name__ == "__main__":
+    test_lru_eviction_by_size()
+    test_expiry_and_counters()
+    test_oversized_entry_is_not_stored()
+    test_concurrent_misses_are_coalesced()
+    print("Cache tests completed!")
@@ -0,0 +1,56 @@
+"""
+Quick test for compact cached histories
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from compact_history import CompactHistory
+
+
+def _history(rows):
+    """Build a yfinance-like daily history frame"""
+    index = pd.date_range("2020-01-01", periods=rows, freq="B", tz="America/New_York")
+    close = np.linspace(100, 200, rows)
+    return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+                         "Volume": np.arange(rows, dtype="int64") * 1000,
+                         "Dividends": 0.0, "Stock Splits": 0.0}, index=index)
+
+
+def test_round_trip():
+    """Packing drops unused columns and restores the index and values"""
+    hist = _history(500)
+    compact = CompactHistory.from_frame(hist)
+    frame = compact.to_frame()
+
+    assert list(frame.columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert frame.index.equals(hist.index)
+    assert np.allclose(frame["Close"], hist["Close"], rtol=1e-6)
+    assert (frame["Volume"] == hist["Volume"]).all()
+    assert sys.getsizeof(compact) * 2 < hist.memory_usage(deep=True).sum()
+
+
+def test_partial_conversion():
+    """Only the rows from start onward are materialized"""
+    hist = _history(500)
+    compact = CompactHistory.from_frame(hist)
+    frame = compact.to_frame(hist.index[450])
+    assert frame.index.equals(hist.index[450:])
+
+
+def test_large_volume_keeps_precision():
+    """Volumes above the uint32 range fall back to uint64"""
+    hist = _history(10)
+    hist["Volume"] = 5_000_000_000
+    compact = CompactHistory.from_frame(hist)
+    assert compact.columns["Volume"].dtype == np.uint64
+    assert (compact.to_frame()["Volume"] == 5_000_000_000).all()
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_partial_conversion()
+    test_large_volume_keeps_precision()
+    print("Compact history tests completed!")
@@ -2,41 +2,96 @@
 Quick test for the crypto analyzer
 """
 
+import tempfile
+
 import config
 import crypto_analyzer
+import replay
+from cache import DataCache
+from rate_limiter import TokenBucket
 
 
 def test_crypto_analyzer():
-    """Test crypto analyzer functionality"""
+    """Test crypto analyzer functionality against replayed CoinMarketCap responses"""
     # Initialize config and analyzer
     config_manager = config.Config()
-    analyzer = crypto_analyzer.CryptoAnalyzer(config_manager)
-
-    print("Testing Crypto Analyzer...")
-    print(
-        f"API Key loaded: {'✓' if config_manager.api_keys.get('coinmarketcap') else '✗'}")
-
-    # Test symbol validation
-    print("\n=== Testing Symbol Validation ===")
-    test_symbols = ["BTC", "ETH", "INVALID123"]
-    for symbol in test_symbols:
-        is_valid = analyzer.validate_crypto_symbol(symbol)
-        print(f"{symbol}: {'✓ Valid' if is_valid else '✗ Invalid'}")
-
-    # Test data fetching
-    print("\n=== Testing Data Fetching ===")
-    btc_data = analyzer.get_crypto_data("BTC")
-    if btc_data:
-        quote = btc_data["quote"]["USD"]
-        print(f"BTC Price: ${quote['price']:.2f}")
-        print(f"Market Cap: ${quote['market_cap']:,.2f}")
-        print(f"24h Change: {quote['percent_change_24h']:.2f}%")
-        print("✓ Data fetch successful")
-    else:
-        print("✗ Failed to fetch BTC data")
+    config_manager.api_keys['coinmarketcap'] = "replay-key"
+    analyzer = crypto_analyzer.CryptoAnalyzer(config_manager, cache=DataCache(max_size_mb=10))
+
+    with tempfile.TemporaryDirectory() as fixture_dir:
+        store = replay.FixtureStore(fixture_dir)
+        replay.generate(store, crypto=["BTC", "ETH"])
+
+        with replay.replay(store, crypto_analyzers=[analyzer]):
+            print("Testing Crypto Analyzer...")
+
+            # Test symbol validation
+            print("\n=== Testing Symbol Validation ===")
+            results = {symbol: analyzer.validate_crypto_symbol(symbol)
+                       for symbol in ["BTC", "ETH", "INVALID123"]}
+            for symbol, is_valid in results.items():
+                print(f"{symbol}: {'✓ Valid' if is_valid else '✗ Invalid'}")
+            assert results == {"BTC": True, "ETH": True, "INVALID123": False}
+
+            # Test data fetching (served from the quote validation cached)
+            print("\n=== Testing Data Fetching ===")
+            calls = analyzer.session.calls
+            btc_data = analyzer.get_crypto_data("BTC")
+            assert btc_data and analyzer.session.calls == calls
+            quote = btc_data["quote"]["USD"]
+            print(f"BTC Price: ${quote['price']:.2f}")
+            print(f"Market Cap: ${quote['market_cap']:,.2f}")
+            print(f"24h Change: {quote['percent_change_24h']:.2f}%")
 
     print("\nTest completed!")
 
 
+class FakeQuotesSession:
+    """Session stub answering quotes/latest with one entry per requested symbol"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append(params["symbol"].split(","))
+        return FakeQuotesResponse({symbol: {"symbol": symbol} for symbol in self.calls[-1]})
+
+
+class FakeQuotesResponse:
+    """Minimal successful response"""
+
+    status_code = 200
+
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"data": self.data}
+
+
+def test_batched_quotes():
+    """A 200 coin watchlist is fetched in batches and later served from the cache"""
+    config_manager = config.Config()
+    config_manager.api_keys['coinmarketcap'] = "test-key"
+    config_manager.fetch_settings['coinmarketcap_batch_size'] = 100
+    analyzer = crypto_analyzer.CryptoAnalyzer(config_manager, cache=DataCache(max_size_mb=10))
+    analyzer.session = FakeQuotesSession()
+    analyzer.rate_limiter = TokenBucket(rate_per_minute=6000, burst=10)
+
+    watchlist = [f"COIN{i}" for i in range(200)]
+    quotes = analyzer.get_many_quotes(watchlist)
+    assert len(quotes) == 200
+    assert [len(batch) for batch in analyzer.session.calls] == [100, 100]
+
+    assert analyzer.get_many_quotes(watchlist[:10] + ["NEW"]).keys() >= {"COIN0", "NEW"}
+    assert analyzer.session.calls[-1] == ["NEW"]
+    assert analyzer.validate_crypto_symbol("coin5")
+    assert len(analyzer.session.calls) == 3
+
+
 if __name__ == "__main__":
     test_crypto_analyzer()
+    test_batched_quotes()
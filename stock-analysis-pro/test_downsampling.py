@@ -0,0 +1,51 @@
+"""
+Quick test for chart downsampling
+"""
+
+import numpy as np
+import pandas as pd
+
+from downsampling import choose_interval, downsample_chart_data, max_bars_for_width, resample_ohlcv
+
+
+def _history(days):
+    """Business-day OHLCV history with rising closes"""
+    index = pd.bdate_range("2000-01-03", periods=days)
+    close = np.arange(1, days + 1, dtype="float64")
+    return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1,
+                         "Close": close, "Volume": np.ones(days)}, index=index)
+
+
+def test_choose_interval():
+    """The finest interval that fits the bar budget wins"""
+    assert max_bars_for_width(1200, 3) == 400
+    assert choose_interval(_history(300), 400)[1] == "Daily"
+    assert choose_interval(_history(1000), 400)[1] == "Weekly"
+    assert choose_interval(_history(5000), 400)[1] == "Monthly"
+    assert choose_interval(_history(5000), 10)[1] == "Yearly"
+
+
+def test_resample_ohlcv():
+    """Weekly bars take the first open, extreme high/low, last close and summed volume"""
+    weekly = resample_ohlcv(_history(10), "W-FRI")
+    assert len(weekly) == 2
+    first = weekly.iloc[0]
+    assert (first["Open"], first["High"], first["Low"], first["Close"], first["Volume"]) == \
+        (1.0, 6.0, 0.0, 5.0, 5.0)
+
+
+def test_downsample_with_indicators():
+    """Indicators are aligned to the close of each coarser bar"""
+    data = _history(1000)
+    indicators = pd.DataFrame({"SMA": data["Close"]}, index=data.index)
+    chart_data, chart_indicators, label = downsample_chart_data(data, 400, indicators)
+    assert label == "Weekly" and len(chart_data) <= 400
+    assert chart_indicators.index.equals(chart_data.index)
+    assert (chart_indicators["SMA"] == chart_data["Close"]).all()
+
+
+if __name__ == "__main__":
+    test_choose_interval()
+    test_resample_ohlcv()
+    test_downsample_with_indicators()
+    print("Downsampling tests passed!")
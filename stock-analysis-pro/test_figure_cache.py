@@ -0,0 +1,49 @@
+"""
+Quick test for the figure cache
+"""
+
+import numpy as np
+import pandas as pd
+
+from figure_cache import FigureCache, data_fingerprint
+
+
+def _history(closes):
+    """Daily history frame from a list of closes"""
+    index = pd.bdate_range("2024-01-01", periods=len(closes))
+    return pd.DataFrame({"Close": np.asarray(closes, dtype="float64")}, index=index)
+
+
+def test_data_fingerprint():
+    """Fingerprints change with the last bar or length, not with unrelated copies"""
+    hist = _history([1.0, 2.0, 3.0])
+    assert data_fingerprint(hist) == data_fingerprint(hist.copy())
+    revised = hist.copy()
+    revised.iloc[-1, 0] = 3.5
+    assert data_fingerprint(revised) != data_fingerprint(hist)
+    assert data_fingerprint(_history([1.0, 2.0, 3.0, 4.0])) != data_fingerprint(hist)
+    assert data_fingerprint(pd.DataFrame()) is None
+
+
+def test_get_or_build_lru():
+    """Hits skip the build; the least recently used entry is evicted first"""
+    cache = FigureCache(max_entries=2)
+    builds = []
+
+    def build(name):
+        return lambda: builds.append(name) or name
+
+    assert cache.get_or_build("a", build("a")) == "a"
+    assert cache.get_or_build("a", build("a2")) == "a"
+    cache.get_or_build("b", build("b"))
+    cache.get_or_build("a", build("a3"))
+    cache.get_or_build("c", build("c"))
+    cache.get_or_build("b", build("b2"))
+    assert builds == ["a", "b", "c", "b2"]
+    assert cache.get_stats() == {"entries": 2, "hits": 2, "misses": 4}
+
+
+if __name__ == "__main__":
+    test_data_fingerprint()
+    test_get_or_build_lru()
+    print("Figure cache tests passed!")
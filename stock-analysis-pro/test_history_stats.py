@@ -0,0 +1,55 @@
+"""
+Quick test for history-derived statistics
+"""
+
+import numpy as np
+import pandas as pd
+
+from history_stats import compute_history_stats
+
+
+def _history(rows=400, seed=3, scale=1.0):
+    """Build a random-walk daily history"""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2022-01-03", periods=rows)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01 * scale, rows))
+    return pd.DataFrame({"Open": close, "High": close * 1.01, "Low": close * 0.99,
+                         "Close": close, "Volume": rng.integers(1e5, 1e6, rows).astype("float64")},
+                        index=index)
+
+
+def test_matches_pandas_reference():
+    """Range, volume averages and volatility equal straightforward pandas versions"""
+    hist = _history()
+    stats = compute_history_stats(hist)
+    year = hist.iloc[-252:]
+
+    assert stats["last_close"] == hist["Close"].iloc[-1]
+    assert stats["previous_close"] == hist["Close"].iloc[-2]
+    assert np.isclose(stats["high_52w"], year["High"].max())
+    assert np.isclose(stats["low_52w"], year["Low"].min())
+    assert np.isclose(stats["avg_volume_20d"], hist["Volume"].iloc[-20:].mean())
+    log_returns = np.log(hist["Close"]).diff().iloc[-252:]
+    assert np.isclose(stats["volatility_1y"], log_returns.std() * np.sqrt(252))
+    assert stats["beta"] is None
+
+
+def test_beta_against_benchmark():
+    """Beta is computed over the dates both histories share"""
+    benchmark = _history(seed=4)
+    hist = benchmark.copy()
+    hist["Close"] = 100 * np.cumprod(1 + 2 * benchmark["Close"].pct_change().fillna(0))
+    stats = compute_history_stats(hist.iloc[10:], benchmark)
+    assert np.isclose(stats["beta"], 2.0)
+
+
+def test_empty_history():
+    """An empty history yields no statistics"""
+    assert compute_history_stats(pd.DataFrame()) == {}
+
+
+if __name__ == "__main__":
+    test_matches_pandas_reference()
+    test_beta_against_benchmark()
+    test_empty_history()
+    print("History stats tests completed!")
@@ -0,0 +1,90 @@
+"""
+Quick test for the persistent history store
+"""
+
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import config
+import stock_analyzer
+from cache import DataCache
+from history_store import HistoryStore, adjustment_changed
+from indicators import IndicatorEngine
+
+
+def make_history(closes, start="2024-01-01", splits=None):
+    """Daily OHLCV frame with optional per-bar split ratios"""
+    index = pd.bdate_range(start, periods=len(closes), tz="America/New_York")
+    closes = np.asarray(closes, dtype="float64")
+    return pd.DataFrame({"Open": closes, "High": closes, "Low": closes, "Close": closes,
+                         "Volume": 1e6, "Dividends": 0.0,
+                         "Stock Splits": splits if splits is not None else 0.0}, index=index)
+
+
+class SplitTicker:
+    """Ticker whose latest bar is a 2:1 split, so every earlier close halves"""
+
+    def __init__(self, history):
+        self.full = history
+        self.calls = []
+
+    def history(self, period=None, start=None, interval="1d", **kwargs):
+        self.calls.append("max" if period == "max" else str(start))
+        if start is None:
+            return self.full
+        return self.full[self.full.index.date >= start]
+
+
+def test_adjustment_changed():
+    """New split/dividend bars or a moved overlapping close mean a re-adjusted history"""
+    stored = make_history([10.0, 11.0, 12.0])
+    assert not adjustment_changed(stored, make_history([11.0, 12.5, 13.0], "2024-01-02"))
+    assert adjustment_changed(stored, make_history([5.5, 6.0, 6.5], "2024-01-02"))
+    assert adjustment_changed(stored, make_history([11.0, 12.0, 6.5], "2024-01-02",
+                                                   splits=[0.0, 0.0, 2.0]))
+
+
+def test_split_refetches_history():
+    """A split in the fetched tail replaces the stored bars and drops their indicators"""
+    with tempfile.TemporaryDirectory() as store_dir:
+        analyzer = stock_analyzer.StockAnalyzer(config.Config(), cache=DataCache(max_size_mb=10))
+        analyzer.history_store = HistoryStore(store_dir)
+        analyzer.config.cache_settings['expiry_minutes'] = 0
+        analyzer.history_store.save("TEST", "1d", make_history([10.0] * 30), full_history=True)
+        analyzer.indicator_engine = IndicatorEngine()
+        analyzer.indicator_engine.get("TEST", make_history([10.0] * 30))
+
+        ticker = SplitTicker(make_history([5.0] * 30 + [5.1], splits=[0.0] * 30 + [2.0]))
+        hist = analyzer._load_history(ticker, "TEST", "max")
+        assert ticker.calls[-1] == "max"
+        assert (analyzer.history_store.load("TEST")["Close"] <= 5.1).all()
+        assert hist["Close"].iloc[0] == 5.0
+        assert "TEST" not in analyzer.indicator_engine._series
+
+
+class OfflineTicker:
+    """Ticker whose every request fails as if the network were down"""
+
+    def history(self, *args, **kwargs):
+        raise ConnectionError("network is unreachable")
+
+
+def test_failed_tail_serves_stored_history():
+    """A failed tail fetch returns the stored bars marked stale instead of raising"""
+    with tempfile.TemporaryDirectory() as store_dir:
+        analyzer = stock_analyzer.StockAnalyzer(config.Config(), cache=DataCache(max_size_mb=10))
+        analyzer.history_store = HistoryStore(store_dir)
+        analyzer.config.cache_settings['expiry_minutes'] = 0
+        analyzer.history_store.save("TEST", "1d", make_history([10.0] * 30), full_history=True)
+
+        hist = analyzer._load_history(OfflineTicker(), "TEST", "max")
+        assert len(hist) == 30 and hist.attrs["stale"]
+
+
+if __name__ == "__main__":
+    test_adjustment_changed()
+    test_split_refetches_history()
+    test_failed_tail_serves_stored_history()
+    print("History store tests passed!")
@@ -0,0 +1,84 @@
+"""
+Quick test for the indicator engine
+"""
+
+import numpy as np
+import pandas as pd
+
+from indicators import IndicatorEngine, compute_indicators
+
+
+def _history(rows, seed=0):
+    """Build a random-walk OHLCV frame"""
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(rows).cumsum()
+    index = pd.date_range("2024-01-01", periods=rows, freq="B", tz="America/New_York")
+    return pd.DataFrame({
+        "Open": close + rng.standard_normal(rows) * 0.1,
+        "High": close + 1,
+        "Low": close - 1,
+        "Close": close,
+        "Volume": rng.integers(1, 1000, rows).astype("float64"),
+    }, index=index)
+
+
+def test_incremental_matches_vectorized():
+    """Appending bars (and revising the last one) matches a full recompute"""
+    data = _history(300)
+    engine = IndicatorEngine()
+    engine.get("TEST", data.iloc[:250])
+
+    revised = data.copy()
+    revised.iloc[249, revised.columns.get_loc("Close")] += 0.5
+    result = engine.get("TEST", revised)
+    expected = compute_indicators(revised)
+
+    assert engine.full_computes == 1
+    assert engine.incremental_updates == 50
+    assert result.index.equals(expected.index)
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-9, equal_nan=True)
+
+
+def test_unrelated_frame_triggers_full_compute():
+    """A frame that doesn't extend the cached one is recomputed from scratch"""
+    engine = IndicatorEngine()
+    engine.get("TEST", _history(100))
+    engine.get("TEST", _history(100).iloc[10:])
+    assert engine.full_computes == 2
+
+
+def test_readjusted_history_triggers_full_compute():
+    """A split that rewrites earlier closes (same first/last bar) is not extended"""
+    data = _history(100)
+    engine = IndicatorEngine()
+    engine.get("TEST", data.iloc[:99])
+    adjusted = data.copy()
+    adjusted.iloc[:-1, :4] /= 2
+    result = engine.get("TEST", adjusted)
+    assert engine.full_computes == 2
+    np.testing.assert_allclose(result.to_numpy(), compute_indicators(adjusted).to_numpy(),
+                               rtol=1e-9, equal_nan=True)
+
+
+def test_frames_and_memory_budget():
+    """Returned frames are copies; series over the byte budget are dropped oldest first"""
+    data = _history(300)
+    engine = IndicatorEngine(max_size_mb=0.05)
+    first = engine.get("A", data.iloc[:299])
+    before = first.iloc[-1].copy()
+    revised = data.iloc[:299].copy()
+    revised.iloc[-1, revised.columns.get_loc("Close")] += 5
+    engine.get("A", revised)
+    assert first.iloc[-1].equals(before)
+
+    engine.get("B", data)
+    assert list(engine._series) == ["B"]
+    assert engine.nbytes <= 0.05 * 1024 * 1024
+
+
+if __name__ == "__main__":
+    test_incremental_matches_vectorized()
+    test_unrelated_frame_triggers_full_compute()
+    test_readjusted_history_triggers_full_compute()
+    test_frames_and_memory_budget()
+    print("Indicator tests completed!")
@@ -0,0 +1,67 @@
+"""
+Quick test for the intraday ring buffer
+"""
+
+import numpy as np
+import pandas as pd
+
+from intraday import BarRingBuffer
+
+
+def _bars(start, count, base=100.0):
+    """Build 5-minute OHLCV bars"""
+    index = pd.date_range(start, periods=count, freq="5min", tz="America/New_York")
+    close = base + np.arange(count, dtype="float64")
+    return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1,
+                         "Close": close, "Volume": np.full(count, 1000.0)}, index=index)
+
+
+def test_append_and_wraparound():
+    """Appending past capacity drops the oldest bars and keeps order"""
+    bars = _bars("2024-01-02 09:30", 12)
+    buffer = BarRingBuffer(capacity=8)
+    buffer.load(bars.iloc[:5])
+    assert buffer.extend(bars.iloc[5:]) == 7
+
+    frame = buffer.to_frame()
+    assert len(frame) == 8
+    assert frame.index.equals(bars.index[-8:])
+    assert np.array_equal(frame["Close"].to_numpy(), bars["Close"].to_numpy()[-8:])
+    assert buffer.last_timestamp == bars.index[-1]
+
+
+def test_revised_bar_is_replaced_in_place():
+    """Refetching the last bar overwrites it instead of appending a duplicate"""
+    bars = _bars("2024-01-02 09:30", 4)
+    buffer = BarRingBuffer(capacity=8)
+    buffer.load(bars)
+    values = buffer._values
+
+    revised = bars.iloc[-1:].copy()
+    revised["Close"] = 500.0
+    assert buffer.extend(pd.concat([revised, _bars("2024-01-02 09:50", 1)])) == 1
+
+    frame = buffer.to_frame()
+    assert len(frame) == 5
+    assert frame["Close"].iloc[-2] == 500.0
+    assert buffer._values is values  # no reallocation
+
+
+def test_frames_are_not_views():
+    """Frames handed out stay unchanged when the buffer wraps or revises a bar"""
+    bars = _bars("2024-01-02 09:30", 6)
+    buffer = BarRingBuffer(capacity=4)
+    buffer.load(bars.iloc[:4])
+    frame = buffer.to_frame()
+    revised = bars.iloc[3:4].copy()
+    revised["Close"] = 500.0
+    buffer.extend(pd.concat([revised, bars.iloc[4:]]))
+    assert frame.index.equals(bars.index[:4])
+    assert frame["Close"].iloc[-1] == bars["Close"].iloc[3]
+
+
+if __name__ == "__main__":
+    test_append_and_wraparound()
+    test_revised_bar_is_replaced_in_place()
+    test_frames_are_not_views()
+    print("Intraday tests completed!")
@@ -0,0 +1,53 @@
+"""
+Quick test for portfolio analytics
+"""
+
+import numpy as np
+import pandas as pd
+
+from portfolio import compute_portfolio, parse_holdings, rolling_sharpe
+
+
+def _panel(rows=300, symbols=("AAA", "BBB", "CCC", "SPY"), seed=7):
+    """Build a random-walk Close panel"""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0005, 0.01, size=(rows, len(symbols)))
+    prices = 100 * np.cumprod(1 + returns, axis=0)
+    index = pd.date_range("2023-01-02", periods=rows, freq="B")
+    return pd.DataFrame(prices, index=index, columns=list(symbols))
+
+
+def test_parse_holdings():
+    """Separators, missing share counts and repeats are handled"""
+    assert parse_holdings("aapl:10, MSFT 5\nAAPL:2, NVDA") == {"AAPL": 12.0, "MSFT": 5.0, "NVDA": 1.0}
+
+
+def test_matches_pandas_reference():
+    """Vectorized results equal a straightforward pandas computation"""
+    panel = _panel()
+    holdings = {"AAA": 10, "BBB": 5, "CCC": 2, "ZZZ": 1}
+    result = compute_portfolio(panel, holdings, benchmark="SPY", window=20)
+
+    value = (panel[["AAA", "BBB", "CCC"]] * [10, 5, 2]).sum(axis=1)
+    returns = panel.pct_change().dropna()
+    bench = returns["SPY"]
+    assert result["missing"] == ["ZZZ"]
+    assert np.allclose(result["value"], value)
+    assert np.allclose(result["covariance"], returns[["AAA", "BBB", "CCC"]].cov() * 252)
+    assert np.allclose(result["correlation"], returns[["AAA", "BBB", "CCC"]].corr())
+    assert np.isclose(result["betas"]["AAA"], returns["AAA"].cov(bench) / bench.var())
+    assert np.isclose(result["beta"], value.pct_change().dropna().cov(bench) / bench.var())
+
+
+def test_rolling_sharpe():
+    """Cumulative-sum Sharpe equals a rolling-window computation"""
+    returns = pd.Series(np.random.default_rng(1).normal(0.001, 0.02, 200))
+    expected = returns.rolling(30).mean() / returns.rolling(30).std() * np.sqrt(252)
+    assert np.allclose(rolling_sharpe(returns, 30), expected, equal_nan=True)
+
+
+if __name__ == "__main__":
+    test_parse_holdings()
+    test_matches_pandas_reference()
+    test_rolling_sharpe()
+    print("Portfolio tests completed!")
@@ -0,0 +1,59 @@
+"""
+Quick test for the profiler
+"""
+
+import pytest
+
+import config
+from profiling import Profiler, timed
+
+
+class Worker:
+    """Object with a timed method, as the analyzers use them"""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    @timed("fetch")
+    def fetch(self, value):
+        return value * 2
+
+
+def test_spans_are_summarized_per_render():
+    """Spans accumulate counts and totals, and reset at the next render"""
+    profiler = Profiler(level="summary")
+    worker = Worker(profiler)
+    profiler.start_render()
+    assert worker.fetch(2) == 4
+    worker.fetch(3)
+    profiler.record("chart", 0.002)
+
+    summary = profiler.end_render("render test")
+    assert summary["fetch"][0] == 2
+    assert summary["chart"] == (1, 2.0)
+
+    profiler.start_render()
+    assert profiler.get_summary() == {}
+
+
+def test_off_level_records_nothing():
+    """The "off" level makes spans no-ops; unknown levels are rejected"""
+    profiler = Profiler(level="off")
+    assert Worker(profiler).fetch(1) == 2
+    assert profiler.end_render() == {}
+    with pytest.raises(ValueError):
+        Profiler(level="verbose")
+
+
+def test_unknown_config_level_falls_back():
+    """An unknown PROFILING_LEVEL logs a warning and uses the summary level"""
+    config_manager = config.Config()
+    config_manager.profiling_settings['level'] = "verbose"
+    assert Profiler.from_config(config_manager).level == "summary"
+
+
+if __name__ == "__main__":
+    test_spans_are_summarized_per_render()
+    test_off_level_records_nothing()
+    test_unknown_config_level_falls_back()
+    print("Profiling tests passed!")
@@ -0,0 +1,92 @@
+"""
+Quick test for the columnar quote snapshot
+"""
+
+import math
+import tempfile
+
+import config
+import crypto_analyzer
+import replay
+from cache import DataCache
+from quote_snapshot import QuoteSnapshot, flatten_quotes
+
+
+def quote(symbol, price, market_cap, change_24h, **coin):
+    """Minimal CoinMarketCap quote"""
+    return dict({"symbol": symbol, "name": symbol.title(), "tags": ["defi", "layer-1"],
+                 "quote": {"USD": {"price": price, "market_cap": market_cap,
+                                   "volume_24h": market_cap / 10,
+                                   "percent_change_24h": change_24h}}}, **coin)
+
+
+def test_flatten_quotes():
+    """Quotes become one float64 row per coin with missing fields as NaN"""
+    table = flatten_quotes({"btc": quote("BTC", 60000, 1.2e12, 2.5, max_supply=2.1e7),
+                            "ETH": quote("ETH", 3000, 3.6e11, None)})
+    assert list(table.index) == ["BTC", "ETH"]
+    assert table["price"].dtype == "float64" and table["max_supply"].dtype == "float64"
+    assert math.isnan(table.loc["ETH", "percent_change_24h"])
+    assert math.isnan(table.loc["ETH", "max_supply"])
+    assert table.loc["BTC", "tags"] == "defi, layer-1"
+
+
+def test_snapshot_queries():
+    """Bulk updates replace rows; rank, filter and sort work over whole columns"""
+    snapshot = QuoteSnapshot()
+    snapshot.update({"BTC": quote("BTC", 60000, 1.2e12, 2.5),
+                     "ETH": quote("ETH", 3000, 3.6e11, -1.0),
+                     "DOGE": quote("DOGE", 0.1, 1.4e10, 8.0)})
+    snapshot.update({"ETH": quote("ETH", 3300, 4.0e11, 9.0)})
+    assert len(snapshot) == 3 and snapshot.version == 2
+    assert snapshot.row("eth")["price"] == 3300
+    assert snapshot.row("SOL") is None
+
+    assert snapshot.rank("percent_change_24h").to_dict() == {"BTC": 3, "DOGE": 2, "ETH": 1}
+    assert list(snapshot.sort("market_cap", min_market_cap=1e11).index) == ["BTC", "ETH"]
+    assert list(snapshot.sort("percent_change_24h", ascending=True, limit=2).index) == ["BTC", "DOGE"]
+    assert list(snapshot.filter(symbols=["doge", "btc"], max_change_24h=5).index) == ["BTC"]
+    assert snapshot.filter(tag="DEFI").shape[0] == 3
+
+
+def test_analyzer_watchlist():
+    """Watchlist and formatted metrics come from the snapshot the fetch fills"""
+    config_manager = config.Config()
+    config_manager.api_keys['coinmarketcap'] = "replay-key"
+    analyzer = crypto_analyzer.CryptoAnalyzer(config_manager, cache=DataCache(max_size_mb=10))
+    # Private snapshot, so the 2030-dated quote below can't leak into the shared one
+    analyzer.snapshot = QuoteSnapshot()
+
+    with tempfile.TemporaryDirectory() as fixture_dir:
+        store = replay.FixtureStore(fixture_dir)
+        replay.generate(store, crypto=["BTC", "ETH", "SOL"])
+
+        with replay.replay(store, crypto_analyzers=[analyzer]):
+            table = analyzer.get_watchlist(["sol", "btc", "eth"], sort_by="price", ascending=True)
+            assert list(table.index) == ["SOL", "ETH", "BTC"]
+            assert analyzer.session.calls == 1
+
+            # Coins CoinMarketCap skipped are remembered instead of refetched every rerun
+            assert list(analyzer.get_watchlist(["BTC", "NOPE"]).index) == ["BTC"]
+            assert analyzer.get_watchlist(["BTC", "NOPE"]).shape[0] == 1
+            assert analyzer.get_crypto_data("NOPE") is None
+            assert analyzer.session.calls == 2
+
+            btc = analyzer.get_crypto_data("BTC")
+            assert analyzer.get_crypto_metrics(btc)["Market Cap"] == "$100.0B"
+            assert analyzer.get_crypto_info(btc)["Max Supply"] == "N/A"
+            assert analyzer.get_crypto_info(btc)["Date Added"] == "2013-04-28"
+            assert analyzer.calculate_crypto_performance(btc)["🔴 7 Days"] == "-2.00%"
+
+            # A newer quote than the snapshot's is formatted as given and updates the snapshot
+            newer = dict(btc, quote={"USD": dict(btc["quote"]["USD"], market_cap=2e11,
+                                                 last_updated="2030-01-01T00:00:00.000Z")})
+            assert analyzer.get_crypto_metrics(newer)["Market Cap"] == "$200.0B"
+            assert analyzer.snapshot.row("BTC")["market_cap"] == 2e11
+
+
+if __name__ == "__main__":
+    test_flatten_quotes()
+    test_snapshot_queries()
+    test_analyzer_watchlist()
+    print("Quote snapshot tests passed!")
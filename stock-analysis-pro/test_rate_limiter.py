@@ -0,0 +1,64 @@
+"""
+Quick test for the token bucket rate limiter
+"""
+
+from rate_limiter import SharedRateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Manually advanced clock whose sleep moves time forward"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_burst_then_paced():
+    """A full bucket allows a burst, after which calls wait for the refill rate"""
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_minute=30, burst=3, clock=clock, sleep=clock.sleep)
+    for _ in range(3):
+        assert bucket.acquire()
+    assert clock.sleeps == []
+
+    assert bucket.acquire()
+    assert abs(clock.now - 2.0) < 1e-9  # 30/min refills one token every 2s
+    assert bucket.get_stats()["waits"] == 1
+
+
+def test_timeout():
+    """Acquire gives up when the wait would exceed the timeout"""
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_minute=6, burst=1, clock=clock, sleep=clock.sleep)
+    assert bucket.acquire()
+    assert bucket.acquire(timeout=1) is False
+    assert clock.now == 0.0
+
+
+def test_shared_limiter_spacing():
+    """Back-to-back callers get slots one interval apart"""
+    waits = []
+    clock = FakeClock()
+    limiter = SharedRateLimiter(rate_per_minute=60, clock=clock, sleep=waits.append)
+    for _ in range(3):
+        limiter.acquire()
+    assert waits == [1.0, 2.0]
+
+    # After an idle gap the next caller goes straight through
+    clock.now = 10.0
+    limiter.acquire()
+    assert waits == [1.0, 2.0]
+
+
+if __name__ == "__main__":
+    test_burst_then_paced()
+    test_timeout()
+    test_shared_limiter_spacing()
+    print("Rate limiter tests completed!")
@@ -0,0 +1,80 @@
+"""
+Quick test for the background refresh scheduler
+"""
+
+import time
+
+import config
+import refresh_scheduler
+
+
+class FakeAnalyzer:
+    """Refresher that returns a scripted list of refreshed symbols per call"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    def refresh_quotes(self, symbols):
+        self.calls.append(list(symbols))
+        result = self.results.pop(0) if self.results else symbols
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class RateLimitError(Exception):
+    """Stand-in for yfinance's YFRateLimitError"""
+
+
+def make_scheduler(stock, crypto):
+    """Scheduler with fixed intervals whose background thread never starts"""
+    config_manager = config.Config()
+    config_manager.app_settings['default_refresh_interval'] = 10
+    config_manager.app_settings['crypto_refresh_interval'] = 300
+    config_manager.fetch_settings['max_backoff_seconds'] = 300
+    scheduler = refresh_scheduler.RefreshScheduler(config_manager, stock, crypto)
+    scheduler.start = lambda: None
+    return scheduler
+
+
+def test_backoff_on_missing_symbols():
+    """An empty or rate-limited refresh backs off instead of counting as success"""
+    stock = FakeAnalyzer([], RateLimitError(), ["AAPL"])
+    scheduler = make_scheduler(stock, FakeAnalyzer())
+    scheduler.watch_ttl = 3600
+    scheduler.watch("stock", "AAPL")
+    now = time.monotonic()
+
+    scheduler.tick(now)
+    assert scheduler._next_run["stock"] == now + 20
+    scheduler.tick(now + 20)
+    assert scheduler._next_run["stock"] == now + 20 + 40
+    scheduler.tick(now + 60)
+    assert scheduler._next_run["stock"] == now + 70
+    assert stock.calls == [["AAPL"]] * 3
+    assert scheduler.last_refreshed("stock", "aapl") is not None
+
+
+def test_crypto_interval_and_watch_ttl():
+    """Crypto runs on its own interval; only symbols nobody re-watches expire"""
+    crypto = FakeAnalyzer()
+    scheduler = make_scheduler(FakeAnalyzer(), crypto)
+    scheduler.watch("crypto", "BTC")
+    scheduler.watch("crypto", "ETH")
+    now = time.monotonic()
+
+    scheduler.tick(now)
+    assert scheduler._next_run["crypto"] == now + 300
+    assert crypto.calls == [["BTC", "ETH"]]
+
+    # A session still open keeps re-watching its symbol between refreshes
+    scheduler._watched["crypto"]["BTC"] = now + 250
+    scheduler.tick(now + 300)
+    assert crypto.calls[-1] == ["BTC"]
+
+
+if __name__ == "__main__":
+    test_backoff_on_missing_symbols()
+    test_crypto_interval_and_watch_ttl()
+    print("Refresh scheduler tests passed!")
@@ -0,0 +1,43 @@
+"""
+Quick test for the cross-sectional screener
+"""
+
+import numpy as np
+import pandas as pd
+
+from screener import build_close_panel, compute_performance_panel
+
+
+def _history(closes, start="2024-01-01"):
+    """Daily history frame from a list of closes"""
+    index = pd.bdate_range(start, periods=len(closes))
+    return pd.DataFrame({"Close": np.asarray(closes, dtype="float64")}, index=index)
+
+
+def test_build_close_panel():
+    """Histories align on dates; empty or missing ones are skipped"""
+    panel = build_close_panel({"AAA": _history([1.0, 2.0, 3.0]),
+                               "BBB": _history([5.0, 6.0], start="2024-01-02"),
+                               "CCC": pd.DataFrame(), "DDD": None})
+    assert list(panel.columns) == ["AAA", "BBB"]
+    assert np.isnan(panel.loc[panel.index[0], "BBB"])
+    assert build_close_panel({"CCC": pd.DataFrame(), "DDD": None}).empty
+    assert build_close_panel({}).empty
+
+
+def test_compute_performance_panel():
+    """Returns, volatility and drawdown per symbol in one pass"""
+    panel = build_close_panel({"UP": _history([100.0, 110.0, 99.0, 121.0]),
+                               "FLAT": _history([50.0] * 4)})
+    performance = compute_performance_panel(panel)
+    assert round(performance.loc["UP", "1 Day"], 6) == round((121 / 99 - 1) * 100, 6)
+    assert round(performance.loc["UP", "Max Drawdown"], 6) == -10.0
+    assert performance.loc["FLAT", "Volatility"] == 0.0
+    assert np.isnan(performance.loc["UP", "1 Week"])
+    assert compute_performance_panel(pd.DataFrame()).empty
+
+
+if __name__ == "__main__":
+    test_build_close_panel()
+    test_compute_performance_panel()
+    print("Screener tests passed!")
@@ -0,0 +1,116 @@
+"""
+Quick test for the stock analyzer against replayed yfinance responses
+"""
+
+import tempfile
+
+import pandas as pd
+import yfinance as yf
+from yfinance.exceptions import YFRateLimitError
+
+import config
+import replay
+import stock_analyzer
+from cache import DataCache
+
+
+def test_stock_analyzer():
+    """Validation, cached history slices and metrics work offline"""
+    with tempfile.TemporaryDirectory() as fixture_dir:
+        store = replay.FixtureStore(fixture_dir)
+        replay.generate(store, stocks=["AAPL"], days=3000)
+
+        analyzer = stock_analyzer.StockAnalyzer(config.Config(), cache=DataCache(max_size_mb=100))
+        analyzer.history_store = None
+        with replay.replay(store):
+            assert analyzer.validate_stock_symbol("AAPL")
+            hist, info = analyzer.get_stock_data("AAPL", "1y")
+            assert 240 <= len(hist) <= 262
+            assert info["longName"] == "AAPL Holdings"
+
+            # Shorter periods are slices of the cached base history
+            misses = analyzer.get_cache_stats()["misses"]
+            assert len(analyzer.get_history("AAPL", "6mo")) < len(hist)
+            assert analyzer.get_cache_stats()["misses"] == misses
+
+            metrics = analyzer.get_financial_metrics(info, hist)
+            assert metrics["P/E Ratio"] == "25.00"
+            assert "1 Year" in "".join(analyzer.calculate_performance_metrics(hist))
+
+
+def test_get_many_batches_downloads():
+    """Cold symbols share one multi-ticker download; cached ones need none"""
+    with tempfile.TemporaryDirectory() as fixture_dir:
+        store = replay.FixtureStore(fixture_dir)
+        replay.generate(store, stocks=["AAPL", "MSFT", "NVDA"], days=600)
+
+        analyzer = stock_analyzer.StockAnalyzer(config.Config(), cache=DataCache(max_size_mb=100))
+        analyzer.history_store = None
+        with replay.replay(store):
+            downloads = []
+            download = yf.download
+            yf.download = lambda tickers, **kwargs: downloads.append(list(tickers)) or download(
+                tickers, **kwargs)
+
+            histories = analyzer.get_many(["aapl", "MSFT", "AAPL"], "1y")
+            assert list(histories) == ["AAPL", "MSFT"]
+            assert downloads == [["AAPL", "MSFT"]]
+
+            histories = analyzer.get_many(["AAPL", "MSFT", "NVDA", "NOPE"], "6mo")
+            assert downloads[-1] == ["NVDA", "NOPE"]
+            assert set(histories) == {"AAPL", "MSFT", "NVDA"}
+            assert len(histories["AAPL"]) < len(analyzer.get_history("AAPL", "1y"))
+
+
+class ThrottledTicker:
+    """Ticker whose every request is rate limited"""
+
+    def __init__(self, symbol):
+        self.ticker = symbol
+
+    def history(self, *args, **kwargs):
+        raise YFRateLimitError()
+
+
+def test_validation_negatives():
+    """Only a definitive "not found" is remembered as invalid, never throttling"""
+    with tempfile.TemporaryDirectory() as fixture_dir:
+        store = replay.FixtureStore(fixture_dir)
+        replay.generate(store, stocks=["AAPL"], days=300)
+
+        analyzer = stock_analyzer.StockAnalyzer(config.Config(), cache=DataCache(max_size_mb=10))
+        analyzer.history_store = None
+        with replay.replay(store):
+            assert not analyzer.validate_stock_symbol("NOTATICKER")
+            assert analyzer.symbol_registry.lookup("NOTATICKER") is False
+
+            yf.Ticker = ThrottledTicker
+            analyzer.get_history = lambda symbol, period="1y": pd.DataFrame()
+            assert not analyzer.validate_stock_symbol("THROTTLEDCO")
+            assert analyzer.symbol_registry.lookup("THROTTLEDCO") is None
+
+
+def test_failed_info_is_not_retried():
+    """A failed or empty .info is remembered for the cache expiry instead of refetched"""
+    analyzer = stock_analyzer.StockAnalyzer(config.Config(), cache=DataCache(max_size_mb=10))
+    calls = []
+
+    def fetch_info(symbol):
+        calls.append(symbol)
+        if symbol == "DOWN":
+            raise YFRateLimitError()
+        return {}
+
+    analyzer._fetch_info = fetch_info
+    for _ in range(3):
+        assert analyzer.get_stock_info("DOWN") is None
+        assert analyzer.get_stock_info("EMPTY") is None
+    assert calls == ["DOWN", "EMPTY"]
+
+
+if __name__ == "__main__":
+    test_stock_analyzer()
+    test_get_many_batches_downloads()
+    test_validation_negatives()
+    test_failed_info_is_not_retried()
+    print("Stock analyzer tests completed!")
@@ -0,0 +1,45 @@
+"""
+Quick test for the symbol registry
+"""
+
+import os
+import tempfile
+
+from symbol_registry import SymbolRegistry
+
+
+def test_ticker_list_and_results():
+    """Listed symbols are valid; recorded results are returned until their TTL"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tickers.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("Symbol,Name\naapl,Apple\n# comment\nMSFT,Microsoft\n\n")
+
+        registry = SymbolRegistry(ticker_list_path=path)
+        assert registry.known_symbols == {"AAPL", "MSFT"}
+        assert registry.lookup(" aapl ") is True
+        assert registry.lookup("NVDA") is None
+
+        registry.record("nvda", True)
+        registry.record("NOPE", False)
+        assert registry.lookup("NVDA") is True
+        assert registry.lookup("nope") is False
+        assert registry.get_stats()["known_symbols"] == 2
+
+
+def test_negative_ttl_and_offline_mode():
+    """Invalid results expire on their own TTL; offline mode rejects unlisted symbols"""
+    registry = SymbolRegistry(invalid_ttl_minutes=0)
+    registry.record("NOPE", False)
+    assert registry.lookup("NOPE") is None
+
+    offline = SymbolRegistry(offline_only=True)
+    offline.known_symbols.add("AAPL")
+    assert offline.lookup("AAPL") is True
+    assert offline.lookup("NVDA") is False
+
+
+if __name__ == "__main__":
+    test_ticker_list_and_results()
+    test_negative_ttl_and_offline_mode()
+    print("Symbol registry tests passed!")
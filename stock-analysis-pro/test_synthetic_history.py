@@ -0,0 +1,38 @@
+"""
+Quick test for the synthetic crypto history generator
+"""
+
+import numpy as np
+import pandas as pd
+
+from synthetic_history import generate_ohlcv
+
+
+END = pd.Timestamp("2024-06-30")
+
+
+def test_seeded_and_consistent():
+    """Same symbol gives the same bars; longer histories extend shorter ones"""
+    one_year = generate_ohlcv("BTC", 60000.0, 365, end=END)
+    assert one_year.equals(generate_ohlcv("btc", 60000.0, 365, end=END))
+    assert not one_year.equals(generate_ohlcv("ETH", 60000.0, 365, end=END))
+
+    two_years = generate_ohlcv("BTC", 60000.0, 730, end=END)
+    assert two_years.iloc[-365:].equals(one_year)
+
+
+def test_ohlc_relationships():
+    """High/Low bound Open/Close and every value is positive"""
+    data = generate_ohlcv("DOGE", 0.12, 730, end=END)
+    assert len(data) == 730 and data.index[-1] == END
+    assert (data["High"] >= data[["Open", "Close"]].max(axis=1)).all()
+    assert (data["Low"] <= data[["Open", "Close"]].min(axis=1)).all()
+    assert (data[["Open", "High", "Low", "Close"]] > 0).all().all()
+    assert data["Volume"].between(1_000_000, 11_000_000).all()
+    assert np.isclose(data["Close"].iloc[-1], 0.12, rtol=0.15)
+
+
+if __name__ == "__main__":
+    test_seeded_and_consistent()
+    test_ohlc_relationships()
+    print("Synthetic history tests completed!")
@@ -6,6 +6,27 @@ Handles all Streamlit interface components
 import streamlit as st
 from datetime import datetime
 
+from figure_cache import data_fingerprint
+from portfolio import parse_holdings
+
+
+# Watchlist sort choices: label -> (snapshot column, ascending)
+WATCHLIST_SORTS = {
+    "Market Cap": ("market_cap", False),
+    "Volume (24h)": ("volume_24h", False),
+    "Top Gainers (24h)": ("percent_change_24h", False),
+    "Top Losers (24h)": ("percent_change_24h", True),
+    "Change (7d)": ("percent_change_7d", False),
+    "Rank": ("cmc_rank", True),
+}
+
+# Snapshot columns shown in the watchlist table
+WATCHLIST_COLUMNS = {
+    "name": "Name", "cmc_rank": "Rank", "price": "Price", "market_cap": "Market Cap",
+    "volume_24h": "Volume (24h)", "percent_change_1h": "1h %",
+    "percent_change_24h": "24h %", "percent_change_7d": "7d %",
+}
+
 
 class UI:
     """UI class for all interface components"""
@@ -146,21 +167,41 @@ class UI:
 
                 return new_mode
 
-    def display_real_time_indicator(self):
+    def display_real_time_indicator(self, last_updated=None, kind="stock"):
         """Display real-time update indicator"""
-        current_time = datetime.now().strftime("%H:%M:%S")
+        current_time = (last_updated or datetime.now()).strftime("%H:%M:%S")
+        interval = self.config.app_settings[
+            'crypto_refresh_interval' if kind == "crypto" else 'default_refresh_interval']
         st.markdown(f"""
         <div style='text-align: center; color: #4CAF50; font-size: 14px; margin: 10px 0;'>
-            🔴 Live • Last updated: {current_time} • Updates every 10 seconds
+            🔴 Live • Last updated: {current_time} • Updates every {interval} seconds
         </div>
         """, unsafe_allow_html=True)
 
+    def enable_live_updates(self, get_last_refreshed, keep_watching=None):
+        """Rerun the page whenever the background scheduler has pushed newer data"""
+        rendered_at = datetime.now()
+
+        @st.fragment(run_every=self.config.app_settings['default_refresh_interval'])
+        def watch_for_updates():
+            # Keep the symbol watched while this page is open, even if refreshes fail
+            if keep_watching is not None:
+                keep_watching()
+            refreshed = get_last_refreshed()
+            if refreshed is not None and refreshed > rendered_at:
+                st.rerun()
+
+        watch_for_updates()
+
     def display_stock_overview(self, symbol, stock_info, hist_data):
         """Display stock overview section"""
-        if stock_info:
-            current_price = stock_info.get(
+        stock_info = stock_info or {}
+        stats = self.stock_analyzer.get_history_stats(symbol)
+        if stats or stock_info:
+            # Price and change come from the cached history, .info is the fallback
+            current_price = stats.get('last_close') or stock_info.get(
                 'currentPrice') or stock_info.get('regularMarketPrice', 0)
-            prev_close = stock_info.get('previousClose', current_price)
+            prev_close = stats.get('previous_close') or stock_info.get('previousClose', current_price)
             change, pct_change = self.stock_analyzer.calculate_price_change(
                 current_price, prev_close)
 
@@ -192,8 +233,9 @@ class UI:
                 </div>
                 """, unsafe_allow_html=True)
 
+    @st.fragment
     def display_stock_charts(self, symbol, hist_data, period):
-        """Display price and volume charts for stocks"""
+        """Display price and volume charts for stocks (a period change reruns only this fragment)"""
 
         st.markdown("""
             <div style='text-align: center'>
@@ -215,38 +257,55 @@ class UI:
         with col2:
             selected_period = st.selectbox(
                 "Time Period",
-                ["1MO", "3MO", "6MO", "1Y", "2Y", "5Y", "10Y", "YTD", "MAX"],
-                index=3,
+                ["1D", "5D", "1MO", "3MO", "6MO", "1Y", "2Y", "5Y", "10Y", "YTD", "MAX"],
+                index=5,
                 key="chart_period",
                 label_visibility="collapsed"  # Hide the label since we show it above
             )
 
-        # If period changed, fetch new data for the charts
-        if selected_period != period:
+        # Intraday periods read bars from the streaming ring buffer
+        interval = self.config.chart_settings['intraday_intervals'].get(selected_period.lower(), "1d")
+        if interval != "1d":
             with st.spinner(f"📊 Loading {selected_period} data..."):
-                new_hist_data, _ = self.stock_analyzer.get_stock_data(
+                new_hist_data = self.stock_analyzer.get_intraday(
+                    symbol, interval, selected_period.lower())
+                if new_hist_data is not None and not new_hist_data.empty:
+                    hist_data = new_hist_data
+                else:
+                    # Chart the daily history under its own period, not the intraday one
+                    st.warning(f"⚠️ {selected_period} data is unavailable, "
+                               f"showing {period.upper()} daily data instead")
+                    interval = "1d"
+                    selected_period = period.upper()
+
+        # If period changed, slice the cached base history for the charts
+        elif selected_period.lower() != period.lower():
+            with st.spinner(f"📊 Loading {selected_period} data..."):
+                new_hist_data = self.stock_analyzer.get_history(
                     symbol, period=selected_period.lower())
                 if new_hist_data is not None:
                     hist_data = new_hist_data
 
-        # Price chart
-        price_chart = self.stock_analyzer.create_price_chart(
-            hist_data, symbol, selected_period)
-        if price_chart:
-            st.plotly_chart(price_chart, use_container_width=True)
+        # Figure is rebuilt only when the data, period or theme changes
+        chart, bar_label = self.stock_analyzer.get_chart_figures(
+            symbol, hist_data, selected_period, interval)
+        if bar_label != "Daily":
+            st.caption(f"Showing {bar_label.lower()} bars")
 
-        # Volume chart
-        volume_chart = self.stock_analyzer.create_volume_chart(
-            hist_data, symbol)
-        if volume_chart:
-            st.plotly_chart(volume_chart, use_container_width=True)
+        # Price (with indicator overlays) and volume on a shared x-axis
+        if chart:
+            st.plotly_chart(chart, use_container_width=True)
 
-    def display_financial_metrics(self, stock_info, hist_data):
+    def display_financial_metrics(self, stock_info, hist_data, symbol=None):
         """Display financial metrics for stocks"""
         st.markdown("### 💰 Financial Metrics")
 
-        metrics = self.stock_analyzer.get_financial_metrics(
-            stock_info, hist_data)
+        def compute():
+            stats = self.stock_analyzer.get_history_stats(symbol) if symbol else None
+            return self.stock_analyzer.get_financial_metrics(stock_info, hist_data, stats)
+
+        metrics = self._memoized(
+            "financial_metrics", (symbol, data_fingerprint(hist_data), stock_info), compute)
 
         col1, col2, col3, col4 = st.columns(4)
         metric_items = list(metrics.items())
@@ -260,8 +319,9 @@ class UI:
         """Display performance metrics for stocks"""
         st.markdown("### 📈 Performance")
 
-        performance = self.stock_analyzer.calculate_performance_metrics(
-            hist_data)
+        performance = self._memoized(
+            "performance_metrics", data_fingerprint(hist_data),
+            lambda: self.stock_analyzer.calculate_performance_metrics(hist_data))
 
         if performance:
             cols = st.columns(len(performance))
@@ -269,28 +329,38 @@ class UI:
                 with cols[i]:
                     st.metric(period, perf)
 
+    @st.fragment
     def display_company_info(self, stock_info):
-        """Display company information"""
-        st.markdown("### 🏢 Company Information")
+        """Display company information (rendered only while expanded)"""
+        expander = st.expander("**🏢 Company Information**",
+                               key="company_info_expanded", on_change="rerun")
+        if not expander.open:
+            return
 
-        company_info = self.stock_analyzer.get_company_info(stock_info)
+        with expander:
+            company_info = self.stock_analyzer.get_company_info(stock_info)
 
-        col1, col2 = st.columns(2)
+            col1, col2 = st.columns(2)
 
-        with col1:
-            for key, value in list(company_info.items())[:3]:
-                st.write(f"**{key}:** {value}")
+            with col1:
+                for key, value in list(company_info.items())[:3]:
+                    st.write(f"**{key}:** {value}")
 
-        with col2:
-            for key, value in list(company_info.items())[3:]:
-                st.write(f"**{key}:** {value}")
+            with col2:
+                for key, value in list(company_info.items())[3:]:
+                    st.write(f"**{key}:** {value}")
 
+    @st.fragment
     def display_description(self, stock_info):
-        """Display company description"""
+        """Display company description (rendered only while expanded)"""
         description = stock_info.get('longBusinessSummary')
-        if description:
-            st.markdown("### 📋 Business Summary")
-            st.write(description)
+        if not description:
+            return
+        expander = st.expander("**📋 Business Summary**",
+                               key="description_expanded", on_change="rerun")
+        if expander.open:
+            with expander:
+                st.write(description)
 
     def show_stock_search(self):
         """Display stock search interface"""
@@ -438,25 +508,22 @@ class UI:
             "2Y": 730
         }
 
-        # If period changed or hist_data is None, fetch new data
+        # History is cached per (symbol, days), so this only generates on a new period
         selected_days = period_days.get(selected_period, 365)
-        if hist_data is None or len(hist_data) != selected_days:
-            with st.spinner(f"💹 Loading {selected_period} crypto data..."):
-                hist_data = self.crypto_analyzer.get_crypto_historical_data(
-                    symbol, days=selected_days)
+        new_hist_data = self.crypto_analyzer.get_crypto_historical_data(
+            symbol, days=selected_days)
+        if new_hist_data is not None:
+            hist_data = new_hist_data
 
         if hist_data is not None and not hist_data.empty:
-            # Price chart
-            price_chart = self.crypto_analyzer.create_crypto_price_chart(
-                hist_data, symbol)
-            if price_chart:
-                st.plotly_chart(price_chart, use_container_width=True)
-
-            # Volume chart
-            volume_chart = self.crypto_analyzer.create_crypto_volume_chart(
-                hist_data, symbol)
-            if volume_chart:
-                st.plotly_chart(volume_chart, use_container_width=True)
+            chart, bar_label = self.crypto_analyzer.get_chart_figures(
+                symbol, hist_data)
+            if bar_label != "Daily":
+                st.caption(f"Showing {bar_label.lower()} bars")
+
+            # Price and volume on a shared x-axis
+            if chart:
+                st.plotly_chart(chart, use_container_width=True)
         else:
             st.info("📊 Historical crypto data visualization coming soon!")
 
@@ -464,7 +531,9 @@ class UI:
         """Display crypto metrics"""
         st.markdown("### 💰 Crypto Metrics")
 
-        metrics = self.crypto_analyzer.get_crypto_metrics(crypto_data)
+        metrics = self._memoized(
+            "crypto_metrics", self._quote_key(crypto_data),
+            lambda: self.crypto_analyzer.get_crypto_metrics(crypto_data))
 
         col1, col2, col3, col4 = st.columns(4)
         metric_items = list(metrics.items())
@@ -478,8 +547,9 @@ class UI:
         """Display crypto performance metrics"""
         st.markdown("### 📈 Performance")
 
-        performance = self.crypto_analyzer.calculate_crypto_performance(
-            crypto_data)
+        performance = self._memoized(
+            "crypto_performance", self._quote_key(crypto_data),
+            lambda: self.crypto_analyzer.calculate_crypto_performance(crypto_data))
 
         if performance:
             # Limit to 6 columns max
@@ -493,7 +563,9 @@ class UI:
         """Display crypto information"""
         st.markdown("### 🪙 Cryptocurrency Information")
 
-        crypto_info = self.crypto_analyzer.get_crypto_info(crypto_data)
+        crypto_info = self._memoized(
+            "crypto_info", self._quote_key(crypto_data),
+            lambda: self.crypto_analyzer.get_crypto_info(crypto_data))
 
         col1, col2 = st.columns(2)
 
@@ -505,6 +577,109 @@ class UI:
             for key, value in list(crypto_info.items())[4:]:
                 st.write(f"**{key}:** {value}")
 
+    @st.fragment
+    def display_crypto_watchlist(self):
+        """Display a sortable, filterable table of watchlist quotes (only while expanded)"""
+        expander = st.expander("📋 Crypto Watchlist",
+                               key="crypto_watchlist_expanded", on_change="rerun")
+        if not expander.open:
+            return
+
+        with expander:
+            watchlist_text = st.text_input(
+                "Coins",
+                value=self.config.watchlist_settings.get('symbols', ""),
+                key="crypto_watchlist"
+            )
+            col1, col2, col3 = st.columns(3)
+            sort_label = col1.selectbox("Sort by", list(WATCHLIST_SORTS), key="watchlist_sort")
+            min_market_cap = col2.number_input(
+                "Min market cap ($B)", min_value=0.0, value=0.0, step=1.0,
+                key="watchlist_min_market_cap")
+            change_range = col3.slider(
+                "24h change (%)", -50.0, 50.0, (-50.0, 50.0), key="watchlist_change_range")
+
+            symbols = [s for s in watchlist_text.replace(",", " ").split() if s]
+            if not symbols:
+                return
+            # Sorting and filtering run over the snapshot, only unseen coins are fetched
+            sort_by, ascending = WATCHLIST_SORTS[sort_label]
+            table = self.crypto_analyzer.get_watchlist(
+                symbols, sort_by=sort_by, ascending=ascending,
+                min_market_cap=min_market_cap * 1e9 if min_market_cap else None,
+                min_change_24h=change_range[0] if change_range[0] > -50 else None,
+                max_change_24h=change_range[1] if change_range[1] < 50 else None)
+            if table.empty:
+                st.info("No coins match the current filters")
+                return
+            st.dataframe(
+                table[list(WATCHLIST_COLUMNS)].rename(columns=WATCHLIST_COLUMNS),
+                column_config={
+                    "Price": st.column_config.NumberColumn(format="$%.4f"),
+                    "Market Cap": st.column_config.NumberColumn(format="compact"),
+                    "Volume (24h)": st.column_config.NumberColumn(format="compact"),
+                    "1h %": st.column_config.NumberColumn(format="%+.2f%%"),
+                    "24h %": st.column_config.NumberColumn(format="%+.2f%%"),
+                    "7d %": st.column_config.NumberColumn(format="%+.2f%%"),
+                })
+
+    def display_portfolio_analysis(self):
+        """Display portfolio analytics for a list of holdings"""
+        with st.expander("💼 Portfolio Analysis"):
+            holdings_text = st.text_area(
+                "Holdings (symbol and shares)",
+                placeholder="e.g., AAPL:10, MSFT:5, NVDA:8",
+                key="portfolio_holdings"
+            )
+            if st.button("📊 Analyze Portfolio", key="analyze_portfolio"):
+                holdings = parse_holdings(holdings_text)
+                with st.spinner(f"💼 Analyzing {len(holdings)} holdings..."):
+                    st.session_state.portfolio = self.stock_analyzer.analyze_portfolio(holdings)
+
+            analysis = st.session_state.get('portfolio')
+            if not analysis:
+                return
+            if analysis['missing']:
+                st.warning(f"No data for: {', '.join(analysis['missing'])}")
+
+            benchmark = self.config.portfolio_settings['benchmark']
+            beta = analysis['beta']
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Value", f"${analysis['value'].iloc[-1]:,.2f}")
+            col2.metric("Total Return", f"{analysis['total_return']:+.2%}")
+            col3.metric("Volatility", f"{analysis['volatility']:.2%}")
+            col4.metric(f"Beta vs {benchmark}", "N/A" if beta is None else f"{beta:.2f}")
+
+            st.markdown("#### Portfolio Value")
+            st.line_chart(analysis['value'])
+            st.markdown("#### Rolling Sharpe Ratio")
+            st.line_chart(analysis['rolling_sharpe'].dropna())
+
+            # Largest positions first; big portfolios only show the top of the matrix
+            weights = analysis['weights'].sort_values(ascending=False)
+            top = list(weights.index[:25])
+            st.markdown("#### Holdings")
+            holdings_table = weights.to_frame()
+            if analysis['betas'] is not None:
+                holdings_table['Beta'] = analysis['betas']
+            st.dataframe(holdings_table.round(3))
+            st.markdown("#### Correlation")
+            st.dataframe(analysis['correlation'].loc[top, top].round(2))
+
+    def _quote_key(self, crypto_data):
+        """Identity of a quote for memoizing the crypto sections"""
+        quote_data = crypto_data.get("quote", {}).get("USD", {})
+        return (crypto_data.get("symbol"), quote_data.get("last_updated"), quote_data.get("price"))
+
+    def _memoized(self, section, key, compute):
+        """Reuse a section's formatted inputs across reruns while its key is unchanged"""
+        memo = st.session_state.setdefault('section_inputs', {})
+        cached = memo.get(section)
+        if cached is None or cached[0] != key:
+            cached = (key, compute())
+            memo[section] = cached
+        return cached[1]
+
     def show_loading(self, message="Loading..."):
         """Show loading indicator"""
         return st.spinner(message)